@@ -1,5 +1,6 @@
 # controllers/admin_controller.py
 from models.account import Account
+from models.read_models import iter_admin_rows, iter_usernames
 
 try:
     # If you have a dedicated Admin model, prefer that
@@ -21,44 +22,22 @@ class AdminController:
         """
         Return list of admin accounts in a serializable format:
         {"success": True, "admins": [...], "count": N}
-        Falls back gracefully if model lacks helper methods.
         """
         try:
-            # Prefer model-level helper if available
-            if hasattr(Account, "find_all_admins"):
-                admins = Account.find_all_admins()
-            elif hasattr(Account, "find_all_accounts"):
-                # fetch all and filter
-                admins = [
-                    a
-                    for a in Account.find_all_accounts()
-                    if getattr(a, "role", "") == "admin"
-                ]
-            else:
-                # fallback to generic find_all_students style name
-                admins = [
-                    a
-                    for a in Account.find_all_students()
-                    if getattr(a, "role", "") == "admin"
-                ]
-
+            # Only the listed fields are fetched; no Admin objects are built
             admins_data = []
-            for a in admins:
-                created_at = getattr(a, "createAt", None) or getattr(
-                    a, "createdAt", None
-                )
-                created_str = created_at.strftime("%Y-%m-%d") if created_at else "N/A"
+            for a in iter_admin_rows():
+                created_str = a.createAt.strftime("%Y-%m-%d") if a.createAt else "N/A"
 
                 admins_data.append(
                     {
                         "id": str(a._id),
                         "_id": str(a._id),
-                        "username": getattr(a, "username", ""),
-                        "email": getattr(a, "email", ""),
-                        "fullName": getattr(a, "fullName", ""),
-                        "role": getattr(a, "role", "admin"),
-                        "contact": getattr(a, "contact", "")
-                        or getattr(a, "phoneNumber", ""),
+                        "username": a.username,
+                        "email": a.email,
+                        "fullName": a.fullName,
+                        "role": "admin",
+                        "contact": a.contact or a.phoneNumber,
                         "createAt": created_str,
                     }
                 )
@@ -139,16 +118,8 @@ class AdminController:
         Shape: {"success": True, "admins_usernames": [...], "count": N}
         """
         try:
-            res = self.get_all_admins()
-            if not res.get("success"):
-                return {
-                    "success": False,
-                    "message": res.get("message", "Failed to fetch admins"),
-                    "admins_usernames": [],
-                    "count": 0,
-                }
-
-            usernames = [a["username"] for a in res["admins"]]
+            # Only the username field leaves the server
+            usernames = list(iter_usernames("admin"))
             return {
                 "success": True,
                 "admins_usernames": usernames,
@@ -240,11 +211,15 @@ class AdminController:
                     try:
                         from models.database import db
 
-                        ACCOUNTS_COLLECTION = db.get_db()["accounts"]
+                        ACCOUNTS_COLLECTION = db.collection("accounts")
                         result = ACCOUNTS_COLLECTION.delete_one(
                             {"_id": ObjectId(admin_id), "role": "admin"}
                         )
                         deleted = result.deleted_count > 0
+                        if deleted:
+                            from models.account import invalidate_username_cache
+
+                            invalidate_username_cache(account_id=ObjectId(admin_id))
                     except Exception:
                         deleted = False
 
@@ -3,8 +3,10 @@ import json
 import uuid
 import time
 from models.account import Account
+from models import email_job
 
-from utils.email_service import generate_random_password, send_password_reset_email
+from utils.email_service import PASSWORD_RESET_SUBJECT
+from utils.email_outbox import queue_email
 
 TOKEN_FILE = ".token.json"  # file lưu token trên máy
 TOKEN_LIFETIME = 120  # 2 phút = 120 giây
@@ -128,7 +130,11 @@ class AuthController:
         Handle password recovery - Complete flow:
         1) User enters email
         2) Find email in database and get account
-        3) If email exists, generate new password, update DB, and send email
+        3) If email exists, queue a password reset email in the outbox
+           (delivered in the background with retries, so the screen does
+           not wait for the SMTP server). The outbox worker generates the
+           new password and updates the DB when it sends the email, so the
+           password is never stored in the queue.
         """
         if not email:
             return {"success": False, "message": "Email is required"}
@@ -139,27 +145,36 @@ class AuthController:
             return {"success": False, "message": "Email not found in system"}
 
         try:
-            new_password = generate_random_password()
-            account.update_password(new_password)
-
-            email_result = send_password_reset_email(
-                email=account.email,
-                username=account.username,
-                new_password=new_password,
+            job_id = queue_email(
+                account.email,
+                PASSWORD_RESET_SUBJECT,
+                kind="password_reset",
+                account_id=account._id,
             )
 
-            if email_result["success"]:
-                return {
-                    "success": True,
-                    "message": f"New password has been sent to {email}",
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": email_result["message"],
-                    "note": "Password was updated but email failed to send",
-                }
+            return {
+                "success": True,
+                "message": f"New password will be sent to {email} shortly",
+                "job_id": str(job_id),
+            }
 
         except Exception as e:
             print(f"Error in password recovery: {e}")
             return {"success": False, "message": f"Password recovery failed: {str(e)}"}
+
+    def get_recovery_email_status(self, job_id):
+        """
+        Delivery status of a recover_password email.
+
+        Returns:
+            dict: {"success": bool, "status": 'pending' | 'sending' | 'sent'
+                   | 'failed', "attempts": int, "last_error": str | None}
+        """
+        try:
+            job = email_job.get_status(job_id)
+            if job is None:
+                return {"success": False, "message": "Unknown email job"}
+            return {"success": True, **job}
+        except Exception as e:
+            print(f"Error getting email status: {e}")
+            return {"success": False, "message": str(e)}
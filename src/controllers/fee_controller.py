@@ -3,10 +3,7 @@ from models.fee import Fee
 
 from bson.objectid import ObjectId
 
-try:
-    FEES_COLLECTION = db.get_db()["fees"]
-except Exception as e:
-    print(f"Error connecting to 'fees' collection: {e}")
+FEES_COLLECTION = db.collection("fees")
 
 
 class FeeController:
@@ -20,6 +17,61 @@ class FeeController:
             print(f"Error fetching fees: {e}")
             return {"success": False, "fees": []}
 
+    def get_all_fees_with_usernames(self):
+        """
+        Return all fees joined with the owning student's username.
+
+        The join is done server-side with a single `$lookup` aggregation so the
+        fee screen does not need one account lookup per fee.
+        Output: {"success": True, "fees": [fee_dict, ...], "count": N}
+        """
+        pipeline = [
+            {
+                "$lookup": {
+                    "from": "accounts",
+                    "localField": "student_id",
+                    "foreignField": "_id",
+                    "as": "student",
+                }
+            },
+            {
+                "$project": {
+                    "description": 1,
+                    "amount": 1,
+                    "student_id": 1,
+                    "dueDate": 1,
+                    "period": 1,
+                    "status": 1,
+                    "student_username": {
+                        "$ifNull": [{"$arrayElemAt": ["$student.username", 0]}, ""]
+                    },
+                }
+            },
+        ]
+        try:
+            fees = []
+            for doc in FEES_COLLECTION.aggregate(pipeline):
+                fees.append(
+                    {
+                        "_id": str(doc.get("_id")),
+                        "description": doc.get("description"),
+                        "amount": doc.get("amount"),
+                        "student_id": (
+                            str(doc.get("student_id"))
+                            if doc.get("student_id")
+                            else None
+                        ),
+                        "student_username": doc.get("student_username", ""),
+                        "dueDate": doc.get("dueDate"),
+                        "period": doc.get("period"),
+                        "status": doc.get("status"),
+                    }
+                )
+            return {"success": True, "fees": fees, "count": len(fees)}
+        except Exception as e:
+            print(f"Error fetching fees with usernames: {e}")
+            return {"success": False, "fees": [], "count": 0}
+
     def find_by_id(self, fee_id):
         """
         Find a fee by ID
@@ -1,7 +1,8 @@
-from models.fee import Fee
-from models.transaction import Transaction
+from models.database import db
 from bson.objectid import ObjectId
 
+ACCOUNTS_COLLECTION = db.collection("accounts")
+
 
 class FinancialController:
     """Controller for handling financial summary operations"""
@@ -9,10 +10,73 @@ class FinancialController:
     def __init__(self):
         pass
 
+    @staticmethod
+    def _summary_pipeline(student_id):
+        """
+        One aggregation from the student's account: its fees, each joined
+        with the sum of its completed transactions. Only the fields the view
+        needs leave the server.
+        """
+        completed_payments = {
+            "from": "transactions",
+            "let": {"fee_id": "$_id", "student_id": "$student_id"},
+            "pipeline": [
+                {
+                    "$match": {
+                        "$expr": {
+                            "$and": [
+                                {"$eq": ["$student_id", "$$student_id"]},
+                                {"$eq": ["$fee_id", "$$fee_id"]},
+                                {"$eq": ["$status", "completed"]},
+                            ]
+                        }
+                    }
+                },
+                {"$group": {"_id": None, "paid": {"$sum": "$amount"}}},
+            ],
+            "as": "payments",
+        }
+        fees_with_paid = {
+            "from": "fees",
+            "let": {"student_id": "$_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$student_id", "$$student_id"]}}},
+                {"$sort": {"_id": 1}},
+                {"$lookup": completed_payments},
+                {
+                    "$project": {
+                        "_id": 0,
+                        "name": {
+                            "$concat": [
+                                {"$toString": {"$ifNull": ["$description", ""]}},
+                                " - ",
+                                {"$toString": {"$ifNull": ["$period", ""]}},
+                            ]
+                        },
+                        "amount": {"$ifNull": ["$amount", 0]},
+                        "paid": {
+                            "$ifNull": [{"$arrayElemAt": ["$payments.paid", 0]}, 0]
+                        },
+                    }
+                },
+                {"$addFields": {"remain": {"$subtract": ["$amount", "$paid"]}}},
+            ],
+            "as": "fees",
+        }
+        return [
+            {"$match": {"_id": student_id, "role": "student"}},
+            {"$project": {"fullName": 1, "dob": 1, "major": 1}},
+            {"$lookup": fees_with_paid},
+        ]
+
     def get_financial_summary(self, student_id):
         """
         Get financial summary data for financial summary view
 
+        Per-fee paid/remaining totals are computed by MongoDB in a single
+        aggregation, so the page costs one round trip whatever the length
+        of the payment history.
+
         Args:
             student_id: Student's MongoDB ObjectId
 
@@ -20,58 +84,50 @@ class FinancialController:
             dict: {
                 "success": bool,
                 "student_info": dict,
-                "financial_data": list of fee dicts
+                "financial_data": list of fee dicts,
+                "totals": {"fee": str, "remain": str}
             }
         """
         try:
-            from models.account import Account
-
-            student = Account.find_by_id(student_id)
-
-            if not student or student.role != "student":
-                return {"success": False, "message": "Student not found"}
-
-            # Get all fees for student
             if not isinstance(student_id, ObjectId):
                 student_id = ObjectId(student_id)
 
-            all_fees = Fee.find_by_student_id(student_id)
-
-            # Get all transactions
-            all_transactions = Transaction.find_by_student_id(student_id)
-
-            # Calculate paid amount for each fee
-            fee_payments = {}
-            for trans in all_transactions:
-                if trans.status == "completed":
-                    fee_id = str(trans.fee_id)
-                    fee_payments[fee_id] = fee_payments.get(fee_id, 0) + trans.amount
+            docs = list(
+                ACCOUNTS_COLLECTION.aggregate(self._summary_pipeline(student_id))
+            )
+            if not docs:
+                return {"success": False, "message": "Student not found"}
+            student = docs[0]
 
             # Format fees for view
             formatted_data = []
-            for i, fee in enumerate(all_fees, 1):
-                fee_id = str(fee._id)
-                paid_amount = fee_payments.get(fee_id, 0)
-                remain_amount = fee.amount - paid_amount
-
+            total_fee = 0
+            total_remain = 0
+            for i, fee in enumerate(student.get("fees", []), 1):
+                total_fee += fee["amount"]
+                total_remain += fee["remain"]
                 formatted_data.append(
                     {
                         "index": str(i),
-                        "name": f"{fee.description} - {fee.period}",
-                        "fee": self._format_currency(fee.amount),
-                        "remain": self._format_currency(remain_amount),
+                        "name": fee["name"],
+                        "fee": self._format_currency(fee["amount"]),
+                        "remain": self._format_currency(fee["remain"]),
                     }
                 )
 
             return {
                 "success": True,
                 "student_info": {
-                    "id": str(student._id),
-                    "name": getattr(student, "fullName", "N/A"),
-                    "dob": getattr(student, "dob", "N/A"),
-                    "major": getattr(student, "major", "N/A"),
+                    "id": str(student["_id"]),
+                    "name": student.get("fullName", "N/A"),
+                    "dob": student.get("dob", "N/A"),
+                    "major": student.get("major", "N/A"),
                 },
                 "financial_data": formatted_data,
+                "totals": {
+                    "fee": self._format_currency(total_fee),
+                    "remain": self._format_currency(total_remain),
+                },
             }
 
         except Exception as e:
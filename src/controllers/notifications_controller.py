@@ -1,5 +1,10 @@
-from models.announcement import Announcement
+from models.announcement import Announcement, SUMMARY_PROJECTION
+from models.read_models import AnnouncementSummary, row_from_document
 from bson.objectid import ObjectId
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
 
 
 class NotificationsController:
@@ -33,6 +38,92 @@ class NotificationsController:
         """
         return self.announcement_model.find_all()
 
+    def get_announcement_summaries(self, status="published"):
+        """
+        Danh sách thông báo cho màn hình quản lý: chỉ title/preview/...,
+        không tải content đầy đủ.
+
+        Output: [AnnouncementSummary, ...]
+        """
+        return [
+            row_from_document(AnnouncementSummary, doc)
+            for doc in Announcement.iter_all(
+                status=status, projection=SUMMARY_PROJECTION
+            )
+        ]
+
+    def get_announcement(self, ann_id):
+        """
+        Một thông báo đầy đủ (kèm content), dùng khi mở trang chi tiết.
+
+        Output: {"success": True, "announcement": Announcement}
+        """
+        announcement = Announcement.find_by_id(ann_id)
+        if announcement is None:
+            return {"success": False, "message": "Announcement not found"}
+        return {"success": True, "announcement": announcement}
+
+    @staticmethod
+    def encode_cursor(announcement):
+        """Cursor pointing just after `announcement`: "<ISO createAt>|<_id hex>"."""
+        return f"{announcement.createAt.isoformat()}|{announcement._id}"
+
+    @staticmethod
+    def decode_cursor(token):
+        """Inverse of encode_cursor; raises ValueError on a malformed token."""
+        try:
+            created, ann_id = token.split("|", 1)
+            return datetime.fromisoformat(created), ObjectId(ann_id)
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {token!r}") from e
+
+    def get_notifications_page(self, limit=DEFAULT_PAGE_SIZE, before=None):
+        """
+        Sinh viên xem thông báo theo trang (mới nhất trước), dùng cho cuộn vô hạn.
+        Chỉ tải preview (SUMMARY_PROJECTION); content đầy đủ được lấy bằng
+        get_announcement khi mở chi tiết.
+
+        Args:
+            limit (int): Số thông báo mỗi trang (tối đa MAX_PAGE_SIZE)
+            before (str): next_cursor của trang trước, None cho trang đầu
+
+        Output: {"success": True, "notifications": [AnnouncementSummary, ...],
+                 "count": N, "next_cursor": str | None, "has_more": bool}
+        """
+        try:
+            limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+            after = self.decode_cursor(before) if before else None
+
+            # Lấy thêm 1 thông báo để biết còn trang sau hay không
+            docs = Announcement.iter_page(
+                limit + 1, before=after, projection=SUMMARY_PROJECTION
+            )
+            notifications = [
+                row_from_document(AnnouncementSummary, doc) for doc in docs
+            ]
+            has_more = len(notifications) > limit
+            notifications = notifications[:limit]
+
+            return {
+                "success": True,
+                "notifications": notifications,
+                "count": len(notifications),
+                "next_cursor": (
+                    self.encode_cursor(notifications[-1]) if has_more else None
+                ),
+                "has_more": has_more,
+            }
+        except Exception as e:
+            print(e)
+            return {
+                "success": False,
+                "message": f"Failed to fetch announcements: {e}",
+                "notifications": [],
+                "count": 0,
+                "next_cursor": None,
+                "has_more": False,
+            }
+
 
 # a = NotificationsController()
 # print(a.admin_post_announcement("test", "I just want to test the controller", "01"))
@@ -1,7 +1,15 @@
+from models.database import db
 from models.fee import Fee
-from models.transaction import Transaction
 from bson.objectid import ObjectId
 from datetime import datetime
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+import uuid
+
+FEES_COLLECTION = db.collection("fees")
+TRANSACTIONS_COLLECTION = db.collection("transactions")
+
+# Server error code when transactions are not supported (standalone mongod)
+_ILLEGAL_OPERATION = 20
 
 
 class PaymentController:
@@ -68,16 +76,40 @@ class PaymentController:
             print(f"Error getting payment data: {e}")
             return {"success": False, "message": str(e)}
 
-    def process_payment(self, student_id, selected_fee_ids):
+    def process_payment(
+        self,
+        student_id,
+        selected_fee_ids,
+        idempotency_key=None,
+        method="student_portal",
+    ):
         """
         Process payment for selected fees
 
+        Inside a multi-document transaction the whole payment is a handful
+        of round trips instead of 3 per fee: one `$in` fetch of the unpaid
+        fees, one update_many flipping exactly those to 'paid' and one
+        insert_many for their transactions. A concurrent payer makes the
+        transaction hit a write conflict and retry, so fees and transactions
+        never get out of step. A fee that is already paid (e.g. by someone
+        else meanwhile) is returned in skipped_fee_ids; the other fees are
+        still paid.
+
+        Each transaction stores "<idempotency_key>:<fee_id>" under a unique
+        index, so retrying with the same key never charges a fee twice: fees
+        already paid under that key are reported back instead.
+
         Args:
             student_id: Student's MongoDB ObjectId
             selected_fee_ids: List of fee IDs to pay
+            idempotency_key (str): Reuse the same key when retrying a
+                payment; generated when omitted
+            method (str): Payment method stored on the transactions
 
         Returns:
-            dict: {"success": bool, "message": str, "total_paid": float}
+            dict: {"success": bool, "message": str, "total_paid": float,
+                   "paid_fee_ids": [str], "skipped_fee_ids": [str],
+                   "idempotency_key": str, "replayed": bool}
         """
         try:
             if not selected_fee_ids:
@@ -86,48 +118,178 @@ class PaymentController:
             if not isinstance(student_id, ObjectId):
                 student_id = ObjectId(student_id)
 
-            total_paid = 0
-            fees_paid = 0
-
-            for fee_id in selected_fee_ids:
-                fee = Fee.find_by_id(fee_id)
+            fee_ids = list(dict.fromkeys(ObjectId(f) for f in selected_fee_ids))
+            idempotency_key = idempotency_key or uuid.uuid4().hex
 
-                if not fee or fee.student_id != student_id:
-                    continue
-
-                if fee.status == "paid":
-                    continue
-
-                # Create transaction
-                transaction = Transaction(
-                    amount=fee.amount,
-                    method="student_portal",
-                    student_id=student_id,
-                    fee_id=fee._id,
-                    status="completed",
-                    date=datetime.utcnow(),
+            try:
+                result = self._run_in_transaction(
+                    lambda session: self._pay_fees(
+                        session, student_id, fee_ids, idempotency_key, method
+                    )
+                )
+            except (DuplicateKeyError, BulkWriteError):
+                # A concurrent retry with the same key won the race: report
+                # what is stored now
+                result = self._pay_fees(
+                    None, student_id, fee_ids, idempotency_key, method, dry_run=True
                 )
-                transaction.save()
-
-                # Mark fee as paid
-                fee.markPaid()
-
-                total_paid += fee.amount
-                fees_paid += 1
 
-            if fees_paid == 0:
-                return {"success": False, "message": "No fees were paid"}
+            if not result["paid_fee_ids"]:
+                return {
+                    "success": False,
+                    "message": "No fees were paid",
+                    "total_paid": 0,
+                    "paid_fee_ids": [],
+                    "skipped_fee_ids": result["skipped_fee_ids"],
+                    "idempotency_key": idempotency_key,
+                    "replayed": False,
+                }
 
             return {
                 "success": True,
-                "message": f"Successfully paid {fees_paid} fee(s)",
-                "total_paid": total_paid,
+                "message": f"Successfully paid {len(result['paid_fee_ids'])} fee(s)",
+                "total_paid": result["total_paid"],
+                "paid_fee_ids": result["paid_fee_ids"],
+                "skipped_fee_ids": result["skipped_fee_ids"],
+                "idempotency_key": idempotency_key,
+                "replayed": result["replayed"],
             }
 
         except Exception as e:
             print(f"Error processing payment: {e}")
             return {"success": False, "message": str(e)}
 
+    @staticmethod
+    def _run_in_transaction(callback):
+        """
+        Run callback(session) in a multi-document transaction. Standalone
+        servers (local development) do not support transactions; there the
+        callback runs without one (session None) and has to undo its own
+        writes when it fails.
+        """
+        with db.start_session() as session:
+            try:
+                return session.with_transaction(callback)
+            except OperationFailure as e:
+                if e.code != _ILLEGAL_OPERATION:
+                    raise
+        print("⚠️ Transactions not supported by this server, paying without one")
+        return callback(None)
+
+    def _pay_fees(
+        self, session, student_id, fee_ids, idempotency_key, method, dry_run=False
+    ):
+        """
+        Body of process_payment. With dry_run nothing is written and only
+        the fees already paid under idempotency_key are reported.
+        """
+        keys = {fee_id: f"{idempotency_key}:{fee_id}" for fee_id in fee_ids}
+
+        # Fees already paid by an earlier attempt with the same key
+        replayed = {
+            tx["fee_id"]: tx["amount"]
+            for tx in TRANSACTIONS_COLLECTION.find(
+                {"idempotency_key": {"$in": list(keys.values())}},
+                {"fee_id": 1, "amount": 1},
+                session=session,
+            )
+        }
+
+        unpaid = [f for f in fee_ids if f not in replayed]
+        fees = []
+        if unpaid and not dry_run:
+            if session is not None:
+                fees = self._flip_fees(session, student_id, unpaid)
+            else:
+                fees = self._flip_fees_one_by_one(student_id, unpaid)
+
+        if fees:
+            now = datetime.utcnow()
+            try:
+                TRANSACTIONS_COLLECTION.insert_many(
+                    [
+                        {
+                            "amount": fee["amount"],
+                            "method": method,
+                            "student_id": student_id,
+                            "fee_id": fee["_id"],
+                            "status": "completed",
+                            "date": now,
+                            "idempotency_key": keys[fee["_id"]],
+                        }
+                        for fee in fees
+                    ],
+                    session=session,
+                )
+            except Exception:
+                if session is None:
+                    # No transaction to abort: put back the fees left unrecorded
+                    self._restore_fees(fees, keys)
+                raise
+
+        paid = {fee["_id"]: fee["amount"] for fee in fees}
+        paid.update(replayed)
+        return {
+            "paid_fee_ids": [str(f) for f in fee_ids if f in paid],
+            "skipped_fee_ids": [str(f) for f in fee_ids if f not in paid],
+            "total_paid": sum(paid.values()),
+            "replayed": bool(replayed) and not fees,
+        }
+
+    @staticmethod
+    def _flip_fees(session, student_id, fee_ids):
+        """
+        Mark the unpaid ones of fee_ids as paid inside the transaction;
+        returns their documents (_id, amount)
+        """
+        unpaid = {
+            "_id": {"$in": fee_ids},
+            "student_id": student_id,
+            "status": {"$ne": "paid"},
+        }
+        fees = list(FEES_COLLECTION.find(unpaid, {"amount": 1}, session=session))
+        if fees:
+            # Same snapshot as the find; a concurrent payer touching one of
+            # these fees makes the write conflict and the transaction retry
+            FEES_COLLECTION.update_many(
+                unpaid, {"$set": {"status": "paid"}}, session=session
+            )
+        return fees
+
+    @staticmethod
+    def _flip_fees_one_by_one(student_id, fee_ids):
+        """
+        Standalone server (no transaction): flip each fee with a conditional
+        update, so only a fee whose status this call changed is charged
+        """
+        fees = []
+        for fee_id in fee_ids:
+            fee = FEES_COLLECTION.find_one_and_update(
+                {"_id": fee_id, "student_id": student_id, "status": {"$ne": "paid"}},
+                {"$set": {"status": "paid"}},
+                projection={"amount": 1, "status": 1},
+            )
+            if fee is not None:
+                fees.append(fee)
+        return fees
+
+    @staticmethod
+    def _restore_fees(fees, keys):
+        """Undo the status flip of fees that got no transaction"""
+        recorded = {
+            tx["fee_id"]
+            for tx in TRANSACTIONS_COLLECTION.find(
+                {"idempotency_key": {"$in": [keys[fee["_id"]] for fee in fees]}},
+                {"fee_id": 1},
+            )
+        }
+        for fee in fees:
+            if fee["_id"] not in recorded:
+                FEES_COLLECTION.update_one(
+                    {"_id": fee["_id"], "status": "paid"},
+                    {"$set": {"status": fee["status"]}},
+                )
+
     @staticmethod
     def _format_currency(amount):
         """Format amount to Vietnamese format (1.000.000)"""
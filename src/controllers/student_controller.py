@@ -1,8 +1,14 @@
 from models.student import Student
 from models.account import Account
+from models.read_models import (
+    StudentRow,
+    iter_student_rows,
+    iter_usernames,
+    projection_for,
+    row_from_document,
+)
 import re
 from datetime import datetime
-from bson.objectid import ObjectId
 
 
 class StudentController:
@@ -18,39 +24,9 @@ class StudentController:
             if not isinstance(student, Student):
                 return {"success": False, "message": "Invalid student object"}
 
-            # # Validate email if provided
-            # if "email" in updated_data and updated_data["email"]:
-            #     email = updated_data["email"].strip()
-            #     if not StudentController._validate_email(email):
-            #         return {"success": False, "message": "Invalid email format"}
-            #     updated_data["email"] = email
-
-            # Validate contact if provided
-            if "contact" in updated_data and updated_data["contact"]:
-                contact = updated_data["contact"].strip()
-                if not StudentController._validate_phone(contact):
-                    return {
-                        "success": False,
-                        "message": "Contact number must be 10 digits starting with 0",
-                    }
-                updated_data["contact"] = contact
-
-            # Validate date of birth if provided
-            if "dob" in updated_data and updated_data["dob"]:
-                dob = updated_data["dob"].strip()
-                if not StudentController._validate_date(dob):
-                    return {
-                        "success": False,
-                        "message": "Date of Birth must be in DD/MM/YYYY format",
-                    }
-                updated_data["dob"] = dob
-
-            # Clean up empty values
-            cleaned_data = {
-                key: value
-                for key, value in updated_data.items()
-                if value is not None and str(value).strip() != ""
-            }
+            cleaned_data, error = StudentController._clean_profile_data(updated_data)
+            if error:
+                return {"success": False, "message": error}
 
             if not cleaned_data:
                 return {"success": False, "message": "No valid fields to update"}
@@ -79,6 +55,115 @@ class StudentController:
         except Exception as e:
             return {"success": False, "message": f"Error updating profile: {str(e)}"}
 
+    # Profile fields an admin or the student may edit
+    PROFILE_FIELDS = (
+        "email",
+        "fullName",
+        "dob",
+        "gender",
+        "address",
+        "contact",
+        "major",
+        "imageURL",
+    )
+
+    @staticmethod
+    def _clean_profile_data(updated_data):
+        """
+        Validate and normalise profile fields.
+
+        Returns:
+            tuple: (cleaned_data, error_message or None)
+        """
+        updated_data = dict(updated_data)
+
+        # # Validate email if provided
+        # if "email" in updated_data and updated_data["email"]:
+        #     email = updated_data["email"].strip()
+        #     if not StudentController._validate_email(email):
+        #         return {}, "Invalid email format"
+        #     updated_data["email"] = email
+
+        # Validate contact if provided
+        if "contact" in updated_data and updated_data["contact"]:
+            contact = str(updated_data["contact"]).strip()
+            if not StudentController._validate_phone(contact):
+                return {}, "Contact number must be 10 digits starting with 0"
+            updated_data["contact"] = contact
+
+        # Validate date of birth if provided
+        if "dob" in updated_data and updated_data["dob"]:
+            dob = updated_data["dob"].strip()
+            if not StudentController._validate_date(dob):
+                return {}, "Date of Birth must be in DD/MM/YYYY format"
+            updated_data["dob"] = dob
+
+        # Clean up empty values
+        cleaned_data = {
+            key: value
+            for key, value in updated_data.items()
+            if value is not None and str(value).strip() != ""
+        }
+        return cleaned_data, None
+
+    def bulk_update_students(self, changes):
+        """
+        Save edits to many students with a single bulk_write.
+
+        Only the given (changed) fields are sent; rows that fail validation
+        are reported without being written.
+
+        Args:
+            changes (dict): student id -> {field: new value}
+
+        Returns:
+            dict: {
+                "success": bool (every row saved),
+                "message": str,
+                "results": [{"id": str, "success": bool, "message": str}],
+                "updated": int,
+                "failed": int
+            }
+        """
+        results = {}
+        updates = {}
+        for student_id, fields in changes.items():
+            student_id = str(student_id)
+            fields = {k: v for k, v in fields.items() if k in self.PROFILE_FIELDS}
+            cleaned_data, error = self._clean_profile_data(fields)
+            if error is None and not cleaned_data:
+                error = "No valid fields to update"
+            if error:
+                results[student_id] = error
+            else:
+                updates[student_id] = cleaned_data
+
+        try:
+            if updates:
+                results.update(Account.bulk_update_fields(updates, role="student"))
+        except Exception as e:
+            print(f"Error bulk updating students: {e}")
+            for student_id in updates:
+                results[student_id] = f"Error updating profile: {str(e)}"
+
+        rows = [
+            {
+                "id": str(student_id),
+                "success": results[str(student_id)] is None,
+                "message": results[str(student_id)] or "Profile updated successfully",
+            }
+            for student_id in changes
+        ]
+        updated = sum(1 for row in rows if row["success"])
+        failed = len(rows) - updated
+        return {
+            "success": failed == 0,
+            "message": f"Updated {updated} student(s), {failed} failed",
+            "results": rows,
+            "updated": updated,
+            "failed": failed,
+        }
+
     @staticmethod
     def register_student_by_admin(admin, username, password):
         """
@@ -252,6 +337,28 @@ class StudentController:
         except Exception:
             return False
 
+    def get_student_rows(self):
+        """
+        Get every student as a compact StudentRow (list screens).
+
+        Only the displayed fields are fetched and no Student object is
+        built, so a 100k-student table stays small in memory.
+
+        Returns:
+            dict: {"success": bool, "rows": list of StudentRow, "count": int}
+        """
+        try:
+            rows = list(iter_student_rows())
+            return {"success": True, "rows": rows, "count": len(rows)}
+        except Exception as e:
+            print(f"Error getting student rows: {e}")
+            return {
+                "success": False,
+                "message": f"Failed to fetch students: {str(e)}",
+                "rows": [],
+                "count": 0,
+            }
+
     def get_all_students(self):
         """
         Get all student accounts from database.
@@ -263,45 +370,27 @@ class StudentController:
                 "count": int
             }
         """
-        try:
-            students = Account.find_all_students()
-
-            # Convert to serializable format
-            students_data = []
-            for student in students:
-                students_data.append(
-                    {
-                        "id": str(student._id),
-                        "username": student.username,
-                        "email": student.email,
-                        "fullName": getattr(student, "fullName", "N/A"),
-                        "dob": getattr(student, "dob", "N/A"),
-                        "address": getattr(student, "address", "N/A"),
-                        "contact": student.contact,
-                        "createAt": (
-                            student.createAt.strftime("%Y-%m-%d")
-                            if student.createAt
-                            else "N/A"
-                        ),
-                        "imageURL": student.imageURL,
-                        "gender": student.gender,
-                        "major": student.major,
-                    }
-                )
-
-            return {
-                "success": True,
-                "students": students_data,
-                "count": len(students_data),
-            }
-        except Exception as e:
-            print(f"Error getting all students: {e}")
-            return {
-                "success": False,
-                "message": f"Failed to fetch students: {str(e)}",
-                "students": [],
-                "count": 0,
+        result = self.get_student_rows()
+        students_data = [
+            {
+                "id": str(row._id),
+                "username": row.username,
+                "email": row.email,
+                "fullName": row.fullName,
+                "dob": row.dob,
+                "address": row.address,
+                "contact": row.contact,
+                "createAt": (
+                    row.createAt.strftime("%Y-%m-%d") if row.createAt else "N/A"
+                ),
+                "imageURL": row.imageURL,
+                "gender": row.gender,
+                "major": row.major,
             }
+            for row in result.pop("rows")
+        ]
+        result["students"] = students_data
+        return result
 
     def get_all_usernames(self):
         """
@@ -315,12 +404,8 @@ class StudentController:
             }
         """
         try:
-            students = Account.find_all_students()
-
-            # Convert to serializable format
-            students_usernames = []
-            for student in students:
-                students_usernames.append(student.username)
+            # Only the username field leaves the server
+            students_usernames = list(iter_usernames("student"))
 
             return {
                 "success": True,
@@ -373,6 +458,26 @@ class StudentController:
             print(f"Error getting student: {e}")
             return {"success": False, "message": str(e)}
 
+    def get_usernames_by_ids(self, student_ids):
+        """
+        Resolve many student IDs to usernames in one query.
+
+        Args:
+            student_ids (iterable): Student ObjectIds (or their string form)
+
+        Returns:
+            dict: {"success": bool, "usernames": {str(id): username}}
+        """
+        try:
+            accounts = Account.find_many_by_ids(student_ids, projection={"username": 1})
+            usernames = {
+                str(_id): doc.get("username", "") for _id, doc in accounts.items()
+            }
+            return {"success": True, "usernames": usernames}
+        except Exception as e:
+            print(f"Error getting usernames by ids: {e}")
+            return {"success": False, "message": str(e), "usernames": {}}
+
     def delete_student(self, student_id):
         """
         Delete student account.
@@ -397,56 +502,68 @@ class StudentController:
             print(f"Error deleting student: {e}")
             return {"success": False, "message": f"Failed to delete student: {str(e)}"}
 
-    def search_students(self, search_term):
+    def search_students(self, search_term, page=1, page_size=50, use_text=False):
         """
         Search students by username, email, or fullName.
 
+        The filter runs in MongoDB (case-insensitive prefix match, or the
+        fullName text index when use_text=True) and only the StudentRow
+        fields are fetched.
+
         Args:
             search_term (str): Search query
+            page (int): 1-based page number
+            page_size (int): Maximum number of students per page
+            use_text (bool): Match fullName tokens with the $text index
 
         Returns:
-            dict: {"success": bool, "students": list, "count": int}
+            dict: {"success": bool, "rows": list of StudentRow, "count": int,
+                   "page": int, "has_more": bool}
         """
         try:
-            all_students = Account.find_all_students()
-
-            # Filter students
-            filtered_students = []
-            for student in all_students:
-                if (
-                    search_term.lower() in student.username.lower()
-                    or search_term.lower() in student.email.lower()
-                    or search_term.lower() in getattr(student, "fullName", "").lower()
-                ):
-                    filtered_students.append(
-                        {
-                            "id": str(student._id),
-                            "username": student.username,
-                            "email": student.email,
-                            "fullName": getattr(student, "fullName", "N/A"),
-                            "dob": getattr(student, "dob", "N/A"),
-                            "address": getattr(student, "address", "N/A"),
-                            "phoneNumber": getattr(student, "phoneNumber", "N/A"),
-                        }
-                    )
+            page = max(int(page), 1)
+            page_size = max(int(page_size), 1)
+
+            # Fetch one extra document to know whether another page exists
+            docs = Account.search_by_role(
+                "student",
+                search_term,
+                projection=projection_for(StudentRow),
+                limit=page_size + 1,
+                skip=(page - 1) * page_size,
+                use_text=use_text,
+            )
+            has_more = len(docs) > page_size
+            rows = [row_from_document(StudentRow, doc) for doc in docs[:page_size]]
 
             return {
                 "success": True,
-                "students": filtered_students,
-                "count": len(filtered_students),
+                "rows": rows,
+                "count": len(rows),
+                "page": page,
+                "has_more": has_more,
             }
         except Exception as e:
             print(f"Error searching students: {e}")
-            return {"success": False, "message": str(e), "students": [], "count": 0}
-
-    def get_student_by_username(self, username):
-        """Return student dict by username, including _id"""
-        students = self.search_students(username)
-        if students["success"] and students["count"] > 0:
             return {
-                "success": True,
-                "student": {"_id": ObjectId(students["students"][0]["id"])},
+                "success": False,
+                "message": str(e),
+                "rows": [],
+                "count": 0,
+                "page": page,
+                "has_more": False,
             }
+
+    def get_student_by_username(self, username):
+        """Return student dict by exact username, including _id"""
+        try:
+            student_id = Account.find_id_by_username(username, role="student")
+        except Exception as e:
+            print(f"Error getting student by username: {e}")
+            student_id = None
+
+        if student_id is not None:
+            return {"success": True, "student": {"_id": student_id}}
         return {"success": False, "student": None}
 
     def get_student_id_by_username(self, username):
@@ -2,10 +2,28 @@
 from models.transaction import Transaction
 from models.database import db
 from bson.objectid import ObjectId
+from datetime import datetime, timedelta
 
 
 # Helper: raw collection for operations not provided by the model
-TRANSACTIONS_COLLECTION = db.get_db()["transactions"]
+TRANSACTIONS_COLLECTION = db.collection("transactions")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Newest first; _id breaks ties between transactions with the same date.
+# Served by the "date_id" index (see models.transaction.TRANSACTION_INDEXES).
+PAGE_SORT = [("date", -1), ("_id", -1)]
+
+# Fields shown in the transaction list
+LIST_PROJECTION = {
+    "amount": 1,
+    "method": 1,
+    "student_id": 1,
+    "fee_id": 1,
+    "status": 1,
+    "date": 1,
+}
 
 
 class TransactionController:
@@ -44,28 +62,161 @@ class TransactionController:
                 "date": getattr(tx, "date", None),
             }
 
+    @staticmethod
+    def _doc_to_dict(doc):
+        """Convert a raw transaction document to a serializable dict."""
+        return {
+            "_id": str(doc.get("_id")),
+            "amount": doc.get("amount"),
+            "method": doc.get("method"),
+            "student_id": (
+                str(doc.get("student_id")) if doc.get("student_id") else None
+            ),
+            "fee_id": str(doc.get("fee_id")) if doc.get("fee_id") else None,
+            "status": doc.get("status"),
+            "date": doc.get("date"),
+        }
+
+    @staticmethod
+    def encode_cursor(doc):
+        """Cursor token pointing just after `doc`: "<ISO date>|<_id hex>"."""
+        date = doc.get("date")
+        date_str = date.isoformat() if isinstance(date, datetime) else ""
+        return f"{date_str}|{doc.get('_id')}"
+
+    @staticmethod
+    def decode_cursor(token):
+        """Inverse of encode_cursor; raises ValueError on a malformed token."""
+        try:
+            date_str, tx_id = token.split("|", 1)
+            date = datetime.fromisoformat(date_str) if date_str else None
+            return date, ObjectId(tx_id)
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {token!r}") from e
+
+    @staticmethod
+    def _parse_date(value, end_of_day=False):
+        """Accept a datetime or a "YYYY-MM-DD" string."""
+        if value is None or value == "":
+            return None
+        if isinstance(value, datetime):
+            return value
+        parsed = datetime.strptime(str(value).strip(), "%Y-%m-%d")
+        # a bare end date includes the whole day
+        return parsed + timedelta(days=1) if end_of_day else parsed
+
+    def build_filter(
+        self,
+        student_id=None,
+        fee_id=None,
+        method=None,
+        status=None,
+        date_from=None,
+        date_to=None,
+    ):
+        """
+        Build the MongoDB filter for the transaction list.
+        date_from is inclusive, date_to is exclusive (a "YYYY-MM-DD" date_to
+        includes that whole day).
+        """
+        query = {}
+        if student_id:
+            query["student_id"] = ObjectId(student_id)
+        if fee_id:
+            query["fee_id"] = ObjectId(fee_id)
+        if method:
+            query["method"] = method
+        if status:
+            query["status"] = status
+
+        start = self._parse_date(date_from)
+        end = self._parse_date(date_to, end_of_day=True)
+        if start or end:
+            query["date"] = {}
+            if start:
+                query["date"]["$gte"] = start
+            if end:
+                query["date"]["$lt"] = end
+        return query
+
+    def get_transactions_page(
+        self, page_size=DEFAULT_PAGE_SIZE, cursor=None, with_total=False, **filters
+    ):
+        """
+        Return one page of transactions, newest first, using keyset
+        pagination on (date, _id) so every page costs the same index scan
+        no matter how deep the user scrolls.
+
+        Args:
+            page_size (int): Rows per page (capped at MAX_PAGE_SIZE)
+            cursor (str): next_cursor from the previous page, None for the first
+            with_total (bool): Also return a total-count estimate
+            **filters: student_id, fee_id, method, status, date_from, date_to
+
+        Output: {"success": True, "transactions": [...], "count": N,
+                 "next_cursor": str | None, "has_more": bool,
+                 "total": int | None}
+        """
+        try:
+            page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+            query = self.build_filter(**filters)
+            total = self.count_transactions(query) if with_total else None
+
+            if cursor:
+                date, last_id = self.decode_cursor(cursor)
+                keyset = {
+                    "$or": [
+                        {"date": {"$lt": date}},
+                        {"date": date, "_id": {"$lt": last_id}},
+                    ]
+                }
+                query = {"$and": [query, keyset]} if query else keyset
+
+            # Fetch one extra row to know whether another page exists
+            docs = list(
+                TRANSACTIONS_COLLECTION.find(query, LIST_PROJECTION)
+                .sort(PAGE_SORT)
+                .limit(page_size + 1)
+            )
+            has_more = len(docs) > page_size
+            docs = docs[:page_size]
+
+            return {
+                "success": True,
+                "transactions": [self._doc_to_dict(doc) for doc in docs],
+                "count": len(docs),
+                "next_cursor": self.encode_cursor(docs[-1]) if has_more else None,
+                "has_more": has_more,
+                "total": total,
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Failed to fetch transactions: {e}",
+                "transactions": [],
+                "count": 0,
+                "next_cursor": None,
+                "has_more": False,
+                "total": None,
+            }
+
+    def count_transactions(self, query=None):
+        """
+        Number of transactions matching `query`. Without a filter the
+        collection metadata estimate is used (no scan).
+        """
+        if not query:
+            return TRANSACTIONS_COLLECTION.estimated_document_count()
+        return TRANSACTIONS_COLLECTION.count_documents(query)
+
     def get_all_transactions(self):
-        """Return all transactions as a list of dicts."""
+        """
+        Return all transactions as a list of dicts.
+        Loads the whole collection; list screens use get_transactions_page.
+        """
         try:
             cursor = TRANSACTIONS_COLLECTION.find().sort("date", -1)
-            txs = []
-            for doc in cursor:
-                # doc is a raw dict from Mongo; convert to nice dict
-                txs.append(
-                    {
-                        "_id": str(doc.get("_id")),
-                        "amount": doc.get("amount"),
-                        "method": doc.get("method"),
-                        "student_id": (
-                            str(doc.get("student_id"))
-                            if doc.get("student_id")
-                            else None
-                        ),
-                        "fee_id": str(doc.get("fee_id")) if doc.get("fee_id") else None,
-                        "status": doc.get("status"),
-                        "date": doc.get("date"),
-                    }
-                )
+            txs = [self._doc_to_dict(doc) for doc in cursor]
             return {"success": True, "transactions": txs, "count": len(txs)}
         except Exception as e:
             return {
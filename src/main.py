@@ -1,38 +1,31 @@
 # main.py
+import time
+
 import customtkinter as ctk
 from controllers.auth_controller import AuthController
 from controllers.notifications_controller import NotificationsController
 from controllers.student_controller import StudentController
 from controllers.fee_controller import FeeController
+from controllers.financial_controller import FinancialController
+from controllers.payment_controller import PaymentController
 from controllers.admin_controller import AdminController
 from controllers.transaction_controller import TransactionController
 
-from views.forgot_password import ForgotPasswordApp
-from views.notification_detail import NotificationDetailApp
-from views.login import LoginNotificationApp
-
-from views.student.student_dashboard import StudentDashboard
-from views.student.student_profile import StudentProfile
-from views.student.update_student_profile import UpdateStudentProfile
-from views.student.student_dashboard_view_notifications import (
-    StudentDashboardViewNotification,
-)
-from views.student.financial_summary import FinancialSummaryApp
-from views.student.payment import PaymentApp
-
-from views.admin.admin_dashboard import AdminDashboard
-from views.admin.student_management import StudentManagement
-from views.admin.make_anoucements import MakeAnnouncement
-from views.admin.fee_management import FeeManagement
-from views.admin.admin_management import AdminManagement
-from views.admin.transaction_management import TransactionManagement
-from views.admin.notification_management import NotificationManagement
+# Screens are imported on first use (see views.registry)
+from views.registry import get_view
+from views.view_cache import DEFAULT_MAX_AGE, ViewCache
 
 from models.database import db
+from models.indexes import bootstrap_indexes
+from utils.startup import StartupPipeline
+from utils.task_executor import TaskExecutor
+from utils.email_service import close_smtp_session
+from utils.email_outbox import get_outbox_worker, stop_outbox_worker
 
 
 class MainApp:
     def __init__(self, root):
+        self._started_at = time.perf_counter()
         self.root = root
         self.root.title("Group 1 Application")
         self.root.geometry("1400x800")
@@ -42,6 +35,8 @@ class MainApp:
         self.notifications_controller = NotificationsController()
         self.student_controller = StudentController()
         self.fee_controller = FeeController()
+        self.financial_controller = FinancialController()
+        self.payment_controller = PaymentController()
         self.admin_controller = AdminController()
         self.transaction_controller = TransactionController()
 
@@ -49,29 +44,132 @@ class MainApp:
         self.container = ctk.CTkFrame(root)
         self.container.pack(fill="both", expand=True)
 
+        # Busy indicator shown while background tasks are running
+        self.busy_label = ctk.CTkLabel(
+            root,
+            text="⏳ Loading...",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            text_color="#22C55E",
+        )
+
+        # Controller calls from views run here, off the Tk main loop
+        self.task_executor = TaskExecutor(root, on_busy_change=self._set_busy)
+
         self.current_frame = None
 
-        # Show login screen
+        # Built screens are kept (hidden) and reused when navigating back
+        self.views = ViewCache(self._make_view_host)
+
+        # Announcements prefetched by the startup pipeline for the login screen
+        self._prefetched_announcements = None
+        self._startup_started = False
+
+        # Show login screen (notifications panel starts in loading state)
         self.show_login()
 
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+        self.root.after_idle(self._log_first_window)
+        self.root.after(0, self.start_background_startup)
+
+    def _log_first_window(self):
+        elapsed_ms = (time.perf_counter() - self._started_at) * 1000
+        print(f"⏱ [startup] first window ready after {elapsed_ms:.0f} ms")
+
+    def start_background_startup(self):
+        """
+        Connect to MongoDB, prefetch the first page of announcements and bootstrap
+        indexes on a worker thread; the login panel is filled in when the
+        announcements arrive.
+        """
+        self._startup_started = True
+        login_frame = self.current_frame
+        pipeline = StartupPipeline(self.root)
+        pipeline.add_phase("connect", db.get_db)
+        pipeline.add_phase(
+            "prefetch announcements",
+            self.notifications_controller.get_notifications_page,
+            on_done=lambda data: self._on_login_notifications(login_frame, data),
+            on_error=lambda e: self._on_login_notifications_failed(login_frame, e),
+        )
+        pipeline.add_phase("indexes", bootstrap_indexes)
+        # Deliver emails queued (or left unsent) by earlier sessions
+        pipeline.add_phase("email outbox", get_outbox_worker)
+        pipeline.start()
+
+    def _load_login_notifications(self, login_frame):
+        """Fetch the first page of announcements for a login view"""
+        self.task_executor.submit(
+            self.notifications_controller.get_notifications_page,
+            on_success=lambda data: self._on_login_notifications(login_frame, data),
+            on_error=lambda e: self._on_login_notifications_failed(login_frame, e),
+        )
+
+    def _on_login_notifications(self, login_frame, page):
+        if self.current_frame is login_frame:
+            login_frame.set_first_page(page)
+        else:
+            # Login view already left; keep the data for the next visit
+            self._prefetched_announcements = page
+
+    def _on_login_notifications_failed(self, login_frame, error):
+        if self.current_frame is login_frame:
+            login_frame.show_notifications_status("Could not load notifications.")
+
+    def _set_busy(self, busy):
+        """Show or hide the busy indicator"""
+        if busy:
+            self.busy_label.place(relx=1.0, rely=0.0, x=-20, y=10, anchor="ne")
+            self.busy_label.lift()
+        else:
+            self.busy_label.place_forget()
+
+    def _make_view_host(self):
+        """Empty frame in the container that holds one screen"""
+        return ctk.CTkFrame(self.container, fg_color="transparent", corner_radius=0)
+
+    def _show_view(self, key, build, refresh=None, max_age=DEFAULT_MAX_AGE, cache=True):
+        """
+        Leave the current view (its pending tasks are cancelled) and show
+        `key` through the view cache.
+        """
+        if self.task_executor.busy:
+            # The leaving view's data may never arrive: reload it next time
+            self.views.invalidate(self.views.current_key)
+        self.task_executor.cancel_all()
+        self.current_frame = self.views.show(
+            key, build, refresh=refresh, max_age=max_age, cache=cache
+        )
+        return self.current_frame
+
     def show_login(self):
         """Show login view"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = LoginNotificationApp(
-            self.container,
-            self.show_forgot_password,
-            self.show_notification_detail_onLogin,
-            self.show_student_dashboard,
-            self.handle_login,
-            self.show_admin_dashboard,
-            notifications_controller=self.notifications_controller,
+        # Cached screens belong to the account that is logging out
+        self.views.clear()
+
+        self._show_view(
+            "login",
+            lambda parent: get_view("LoginNotificationApp")(
+                parent,
+                self.show_forgot_password,
+                self.show_notification_detail_onLogin,
+                self.show_student_dashboard,
+                self.handle_login,
+                self.show_admin_dashboard,
+                notifications_controller=self.notifications_controller,
+                first_page=self._prefetched_announcements,
+                task_executor=self.task_executor,
+            ),
+            cache=False,
         )
 
+        # Prefetched data is used once; later visits fetch fresh data
+        if self._prefetched_announcements is not None:
+            self._prefetched_announcements = None
+        elif self._startup_started:
+            self._load_login_notifications(self.current_frame)
+
     def handle_login(self, username, password):
         """Handle login through controller"""
         result = self.auth_controller.login(username, password)
@@ -79,15 +177,16 @@ class MainApp:
 
     def show_forgot_password(self):
         """Show forgot password view"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = ForgotPasswordApp(
-            self.container,
-            back_callback=self.show_login,
-            # self.handle_password_recovery
-            # email_sent_callback=self.show_email_sent,
-            auth_controller=self.auth_controller,
+        self._show_view(
+            "forgot_password",
+            lambda parent: get_view("ForgotPasswordApp")(
+                parent,
+                back_callback=self.show_login,
+                # self.handle_password_recovery
+                # email_sent_callback=self.show_email_sent,
+                auth_controller=self.auth_controller,
+            ),
+            cache=False,
         )
 
     def handle_password_recovery(self, email):
@@ -98,208 +197,252 @@ class MainApp:
     def show_notification_detail_onLogin(self, notification_data):
         """Show notification detail view"""
         if notification_data:
-            for widget in self.container.winfo_children():
-                widget.destroy()
-
-            self.current_frame = NotificationDetailApp(
-                self.container, self.show_login, notification_data
+            self._show_view(
+                "notification_detail",
+                lambda parent: get_view("NotificationDetailApp")(
+                    parent,
+                    self.show_login,
+                    notification_data,
+                    notifications_controller=self.notifications_controller,
+                    task_executor=self.task_executor,
+                ),
+                cache=False,
             )
 
     # =======================================================
     def show_admin_dashboard(self):
         """Show admin dashboard view"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = AdminDashboard(
-            self.container,
-            back_callback=self.show_login,
-            student_management_callback=self.show_student_management,
-            admin_management_callback=self.show_admin_management,
-            make_announcement_callback=self.show_make_announcement,
-            fee_management_callback=self.show_fee_management,
-            transaction_callback=self.show_transaction_management,
-            notification_callback=self.show_notification_management,
+        self._show_view(
+            "admin_dashboard",
+            lambda parent: get_view("AdminDashboard")(
+                parent,
+                back_callback=self.show_login,
+                student_management_callback=self.show_student_management,
+                admin_management_callback=self.show_admin_management,
+                make_announcement_callback=self.show_make_announcement,
+                fee_management_callback=self.show_fee_management,
+                transaction_callback=self.show_transaction_management,
+                notification_callback=self.show_notification_management,
+            ),
         )
 
     def show_admin_management(self):
         """Show admin management view"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = AdminManagement(
-            parent=self.container,
-            back_callback=self.show_admin_dashboard,
-            admin_controller=self.admin_controller,
-            auth_controller=self.auth_controller,
+        self._show_view(
+            "admin_management",
+            lambda parent: get_view("AdminManagement")(
+                parent=parent,
+                back_callback=self.show_admin_dashboard,
+                admin_controller=self.admin_controller,
+                auth_controller=self.auth_controller,
+                task_executor=self.task_executor,
+            ),
+            refresh=lambda view: view.load_admins_from_controller(),
         )
 
     def show_student_management(self):
         """Show student management view"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = StudentManagement(
-            self.container,
-            back_callback=self.show_admin_dashboard,
-            student_controller=self.student_controller,
-            auth_controller=self.auth_controller,
+        self._show_view(
+            "student_management",
+            lambda parent: get_view("StudentManagement")(
+                parent,
+                back_callback=self.show_admin_dashboard,
+                student_controller=self.student_controller,
+                auth_controller=self.auth_controller,
+                task_executor=self.task_executor,
+            ),
+            refresh=self._refresh_student_management,
         )
 
+    def _refresh_student_management(self, view):
+        # Reloading would drop edits that were not saved yet
+        if not view.table.dirty_rows():
+            view.load_students_from_controller()
+
     def show_fee_management(self):
         """Show student management view"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = FeeManagement(
-            self.container,
-            back_callback=self.show_admin_dashboard,
-            student_controller=self.student_controller,
-            auth_controller=self.auth_controller,
-            fee_controller=self.fee_controller,
+        self._show_view(
+            "fee_management",
+            lambda parent: get_view("FeeManagement")(
+                parent,
+                back_callback=self.show_admin_dashboard,
+                student_controller=self.student_controller,
+                auth_controller=self.auth_controller,
+                fee_controller=self.fee_controller,
+                task_executor=self.task_executor,
+            ),
+            refresh=lambda view: view.load_fees(),
         )
 
     def show_transaction_management(self):
         """Show transactions management view"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = TransactionManagement(
-            parent=self.container,
-            back_callback=self.show_admin_dashboard,
-            transaction_controller=self.transaction_controller,
+        self._show_view(
+            "transaction_management",
+            lambda parent: get_view("TransactionManagement")(
+                parent=parent,
+                back_callback=self.show_admin_dashboard,
+                transaction_controller=self.transaction_controller,
+                task_executor=self.task_executor,
+            ),
+            refresh=lambda view: view.load_transactions(),
         )
 
     def show_make_announcement(self):
         """Show make announcement view"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = MakeAnnouncement(
-            self.container,
-            self.show_admin_dashboard,
-            self.notifications_controller,
-            self.auth_controller,
+        # A new announcement may be posted from here
+        self.views.invalidate("notification_management")
+
+        self._show_view(
+            "make_announcement",
+            lambda parent: get_view("MakeAnnouncement")(
+                parent,
+                self.show_admin_dashboard,
+                self.notifications_controller,
+                self.auth_controller,
+            ),
+            cache=False,
         )
 
     def show_notification_management(self):
         """Show notification/announcement view"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = NotificationManagement(
-            parent=self.container,
-            back_callback=self.show_admin_dashboard,
-            notifications_controller=self.notifications_controller,
-            auth_controller=self.auth_controller,
+        self._show_view(
+            "notification_management",
+            lambda parent: get_view("NotificationManagement")(
+                parent=parent,
+                back_callback=self.show_admin_dashboard,
+                notifications_controller=self.notifications_controller,
+                auth_controller=self.auth_controller,
+                task_executor=self.task_executor,
+            ),
+            refresh=lambda view: view.load_notifications(),
         )
 
     # =============================================
     def show_student_dashboard(self):
         """Show student dashboard view"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = StudentDashboard(
-            parent=self.container,
-            auth_controller=self.auth_controller,
-            student_dashboard_view_notifications_callback=self.show_student_dashboard_view_notifications,
-            show_financial_summary_callback=self.show_financial_summary,
-            show_payment_callback=self.show_payment,
-            show_more_info_callback=self.show_student_profile,
-            show_update_info_callback=self.show_update_student_profile_on_studentDashboard,
-            logout_callback=self.show_login,
+        self._show_view(
+            "student_dashboard",
+            lambda parent: get_view("StudentDashboard")(
+                parent=parent,
+                auth_controller=self.auth_controller,
+                student_dashboard_view_notifications_callback=self.show_student_dashboard_view_notifications,
+                show_financial_summary_callback=self.show_financial_summary,
+                show_payment_callback=self.show_payment,
+                show_more_info_callback=self.show_student_profile,
+                show_update_info_callback=self.show_update_student_profile_on_studentDashboard,
+                logout_callback=self.show_login,
+                task_executor=self.task_executor,
+            ),
         )
 
     def show_notification_detail_onDashBoard(self, notification_data):
         """Show notification detail view"""
         if notification_data:
-            for widget in self.container.winfo_children():
-                widget.destroy()
-
-            self.current_frame = NotificationDetailApp(
-                self.container,
-                self.show_student_dashboard_view_notifications,
-                notification_data,
+            self._show_view(
+                "notification_detail",
+                lambda parent: get_view("NotificationDetailApp")(
+                    parent,
+                    self.show_student_dashboard_view_notifications,
+                    notification_data,
+                    notifications_controller=self.notifications_controller,
+                    task_executor=self.task_executor,
+                ),
+                cache=False,
             )
 
     def show_student_profile(self):
         """Show student profile via more-information"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = StudentProfile(
-            self.container,
-            auth_controller=self.auth_controller,
-            back_callback=self.show_student_dashboard,
-            edit_callback=self.show_update_student_profile_on_moreInfo,
+        self._show_view(
+            "student_profile",
+            lambda parent: get_view("StudentProfile")(
+                parent,
+                auth_controller=self.auth_controller,
+                back_callback=self.show_student_dashboard,
+                edit_callback=self.show_update_student_profile_on_moreInfo,
+                task_executor=self.task_executor,
+            ),
+        )
+
+    def _show_update_student_profile(self, back_callback):
+        # The dashboard and profile show the data edited here; they only
+        # read it when built, so they are rebuilt on the next visit
+        self.views.evict("student_dashboard", "student_profile")
+
+        self._show_view(
+            "update_student_profile",
+            lambda parent: get_view("UpdateStudentProfile")(
+                parent,
+                back_callback=back_callback,
+                auth_controller=self.auth_controller,
+                student_controller=self.student_controller,
+                task_executor=self.task_executor,
+            ),
+            cache=False,
         )
 
     def show_update_student_profile_on_moreInfo(self):
         """Show update student profile via more-information"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = UpdateStudentProfile(
-            self.container,
-            back_callback=self.show_student_profile,
-            auth_controller=self.auth_controller,
-            student_controller=self.student_controller,
-        )
+        self._show_update_student_profile(self.show_student_profile)
 
     def show_update_student_profile_on_studentDashboard(self):  # BUGS
         """Show update student profile via student dashboard"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = UpdateStudentProfile(
-            self.container,
-            back_callback=self.show_student_dashboard,
-            auth_controller=self.auth_controller,
-            student_controller=self.student_controller,
-        )
+        self._show_update_student_profile(self.show_student_dashboard)
 
     def show_student_dashboard_view_notifications(self):
         """Show the option of view notification for student dashboard"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = StudentDashboardViewNotification(
-            self.container,
-            self.show_student_dashboard,
-            self.show_notification_detail_onDashBoard,
-            self.notifications_controller,
+        self._show_view(
+            "student_notifications",
+            lambda parent: get_view("StudentDashboardViewNotification")(
+                parent,
+                self.show_student_dashboard,
+                self.show_notification_detail_onDashBoard,
+                self.notifications_controller,
+                task_executor=self.task_executor,
+            ),
+            refresh=lambda view: view.load_notifications(),
         )
 
     def show_financial_summary(self):
         """Show student dashboard's financial summary view"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = FinancialSummaryApp(
-            self.container,
-            student_id=self.auth_controller.current_account._id,
-            student_controller=self.student_controller,
-            fee_controller=self.fee_controller,
-            back_callback=self.show_student_dashboard,
+        self._show_view(
+            "financial_summary",
+            lambda parent: get_view("FinancialSummaryApp")(
+                parent,
+                student_id=self.auth_controller.current_account._id,
+                student_controller=self.student_controller,
+                fee_controller=self.fee_controller,
+                back_callback=self.show_student_dashboard,
+                task_executor=self.task_executor,
+                financial_controller=self.financial_controller,
+            ),
+            # Balances change with every payment: always reload the data
+            refresh=lambda view: view.load_financial_summary(),
+            max_age=0,
         )
 
     def show_payment(self):
         """Show student payment view"""
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        self.current_frame = PaymentApp(
-            parent=self.container,
-            student_id=self.auth_controller.current_account._id,
-            student_controller=self.student_controller,
-            fee_controller=self.fee_controller,
-            back_callback=self.show_student_dashboard,
+        self._show_view(
+            "payment",
+            lambda parent: get_view("PaymentApp")(
+                parent=parent,
+                student_id=self.auth_controller.current_account._id,
+                student_controller=self.student_controller,
+                fee_controller=self.fee_controller,
+                payment_controller=self.payment_controller,
+                back_callback=self.show_student_dashboard,
+                task_executor=self.task_executor,
+            ),
+            refresh=lambda view: view.refresh(),
+            max_age=0,
         )
 
     # ======================================================
     def on_closing(self):
         """Handle application close"""
+        self.task_executor.shutdown()
+        stop_outbox_worker()
+        close_smtp_session()
         db.close()
         self.root.destroy()
 
@@ -1,15 +1,85 @@
 from models.database import db
+from models.tracking import DEFAULT_BATCH_SIZE, TrackedModel
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
+from pymongo import ASCENDING, TEXT, IndexModel, UpdateOne
+from pymongo.collation import Collation, CollationStrength
+from pymongo.errors import BulkWriteError
 import datetime
 import hashlib
 import os
-
-# Load collection once
-try:
-    ACCOUNTS_COLLECTION = db.get_db()["accounts"]
-except Exception as e:
-    print(f"Error connecting to 'accounts' collection: {e}")
-    exit(1)
+import threading
+
+# Collection handle, resolved on first use
+ACCOUNTS_COLLECTION = db.collection("accounts")
+
+# Fields matched by the server-side account search
+SEARCH_FIELDS = ("username", "email", "fullName")
+
+# Case-insensitive comparison used by the search queries and their indexes
+SEARCH_COLLATION = Collation(locale="en", strength=CollationStrength.SECONDARY)
+
+# Sorts after every character under SEARCH_COLLATION: "abc" <= v < "abc\uffff"
+# holds for exactly the values starting with "abc"
+PREFIX_UPPER_BOUND = "\uffff"
+
+# Indexes for the 'accounts' collection (created by models.indexes)
+ACCOUNT_INDEXES = [
+    # find_by_username / find_id_by_username / authenticate
+    IndexModel([("username", ASCENDING)], unique=True, name="username_unique"),
+    # find_by_email / recover_password
+    IndexModel([("email", ASCENDING)], name="email"),
+    # find_all_by_role / count_by_role / iter_usernames
+    IndexModel([("role", ASCENDING), ("username", ASCENDING)], name="role_username"),
+    # search_by_role: case-insensitive prefix range on each field
+    *(
+        IndexModel(
+            [("role", ASCENDING), (field, ASCENDING)],
+            collation=SEARCH_COLLATION,
+            name=f"role_{field}_ci",
+        )
+        for field in SEARCH_FIELDS
+    ),
+    # search_by_role(use_text=True)
+    IndexModel([("fullName", TEXT)], default_language="none", name="fullName_text"),
+]
+
+# Listing screens never need password hashes (see Account.__getattr__)
+LIST_PROJECTION = {"password_hash": 0}
+
+# Fields a projected document may lack; hydrated as None
+_PARTIAL_DEFAULTS = {"username": None, "email": None}
+_STUDENT_PARTIAL_DEFAULTS = {
+    "fullName": None,
+    "dob": None,
+    "gender": None,
+    "address": None,
+    "contact": None,
+    "major": None,
+}
+
+# In-process username -> (ObjectId, role) cache, see Account.find_id_by_username
+_USERNAME_ID_CACHE = {}
+_USERNAME_ID_CACHE_LOCK = threading.Lock()
+
+
+def invalidate_username_cache(account_id=None, username=None):
+    """
+    Drop cached username -> id entries.
+
+    Called whenever an account is created, renamed or deleted. With no
+    arguments the whole cache is cleared.
+    """
+    with _USERNAME_ID_CACHE_LOCK:
+        if account_id is None and username is None:
+            _USERNAME_ID_CACHE.clear()
+            return
+        if username is not None:
+            _USERNAME_ID_CACHE.pop(username, None)
+        if account_id is not None:
+            for key, (cached_id, _role) in list(_USERNAME_ID_CACHE.items()):
+                if cached_id == account_id:
+                    del _USERNAME_ID_CACHE[key]
 
 
 def hash_password(password):
@@ -47,7 +117,7 @@ def check_password(password, stored_hash):
         return False
 
 
-class Account:
+class Account(TrackedModel):
     """Base class for all account types (Admin, Student)"""
 
     def __init__(
@@ -58,38 +128,64 @@ class Account:
         self.email = email
         self.role = role
 
-        # Assign other attributes from child classes
+        # Assign other attributes from child classes (and password_hash when
+        # the document has it)
         for key, value in kwargs.items():
-            if key not in ("password_hash"):
-                setattr(self, key, value)
+            setattr(self, key, value)
 
         # Handle password
         if password:
             self.password_hash = hash_password(password)
         elif _id is None:
             raise ValueError("Password is required when creating new account.")
-        else:
-            if not hasattr(self, "password_hash"):
-                account_data = ACCOUNTS_COLLECTION.find_one({"_id": self._id})
-                self.password_hash = account_data.get("password_hash")
+        # Otherwise a document loaded without password_hash (listing
+        # projections leave it out) fetches it on first access, see __getattr__
 
         self.createAt = createAt or datetime.datetime.utcnow()
 
-    def save(self):
-        """Save or update account data to 'accounts' collection"""
-        account_data = vars(self).copy()
-
-        if self._id is None:
-            account_data.pop("_id", None)
+    def __getattr__(self, name):
+        """
+        Lazily load password_hash: only authenticate/password checks need
+        it, so list screens never fetch it (and never pay a find_one per
+        account).
+        """
+        if name != "password_hash" or self.__dict__.get("_id") is None:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        account_data = ACCOUNTS_COLLECTION.find_one(
+            {"_id": self._id}, {"password_hash": 1}
+        )
+        password_hash = (account_data or {}).get("password_hash")
+        self.__dict__["password_hash"] = password_hash
+        # Loaded from the database, so it is not a change to save
+        snapshot = self.__dict__.get("_loaded_state")
+        if snapshot is not None:
+            snapshot["password_hash"] = password_hash
+        return password_hash
 
+    def save(self):
+        """
+        Save or update account data to 'accounts' collection. Updates only
+        `$set` the fields changed since the account was loaded (so a profile
+        edit no longer rewrites password_hash and createAt).
+        """
         if self._id:
             # Update
-            ACCOUNTS_COLLECTION.update_one({"_id": self._id}, {"$set": account_data})
+            changes = self.changed_fields()
+            if changes:
+                ACCOUNTS_COLLECTION.update_one({"_id": self._id}, {"$set": changes})
+            if "username" in changes:
+                invalidate_username_cache(account_id=self._id)
         else:
             # Insert new
+            account_data = self.to_document()
+            account_data.pop("_id", None)
             account_data.pop("password", None)
             result = ACCOUNTS_COLLECTION.insert_one(account_data)
             self._id = result.inserted_id
+            invalidate_username_cache(username=self.username)
+        self.mark_clean()
         return self._id
 
     @classmethod
@@ -112,6 +208,129 @@ class Account:
             print(f"Error finding by ID: {e}")
             return None
 
+    @classmethod
+    def find_id_by_username(cls, username, role=None):
+        """
+        Exact-match lookup of an account's ObjectId by username.
+
+        Served from an in-process cache after the first hit; misses fall
+        through to a single `find_one` on the unique username index.
+
+        Args:
+            username (str): Exact username (case-sensitive)
+            role (str): Optional role the account must have
+
+        Returns:
+            ObjectId or None
+        """
+        if not username:
+            return None
+
+        with _USERNAME_ID_CACHE_LOCK:
+            cached = _USERNAME_ID_CACHE.get(username)
+
+        if cached is None:
+            account_data = ACCOUNTS_COLLECTION.find_one(
+                {"username": username}, {"_id": 1, "role": 1}
+            )
+            if not account_data:
+                return None
+            cached = (account_data["_id"], account_data.get("role"))
+            with _USERNAME_ID_CACHE_LOCK:
+                _USERNAME_ID_CACHE[username] = cached
+
+        account_id, account_role = cached
+        if role is not None and account_role != role:
+            return None
+        return account_id
+
+    @classmethod
+    def find_many_by_ids(cls, account_ids, projection=None):
+        """
+        Find many accounts by ID with a single `$in` query.
+
+        Args:
+            account_ids (iterable): ObjectIds (or their string form)
+            projection (dict): Optional MongoDB projection, e.g. {"username": 1}
+
+        Returns:
+            dict: {ObjectId: raw account document}. Documents are returned
+            as-is (not hydrated into Student/Admin) since a projected
+            document is usually missing required constructor fields.
+        """
+        try:
+            ids = {
+                _id if isinstance(_id, ObjectId) else ObjectId(_id)
+                for _id in account_ids
+                if _id
+            }
+            if not ids:
+                return {}
+
+            cursor = ACCOUNTS_COLLECTION.find({"_id": {"$in": list(ids)}}, projection)
+            return {doc["_id"]: doc for doc in cursor}
+        except Exception as e:
+            print(f"Error finding accounts by IDs: {e}")
+            return {}
+
+    @classmethod
+    def bulk_update_fields(cls, updates, role=None):
+        """
+        `$set` different fields on many accounts with one unordered
+        bulk_write (one UpdateOne per account).
+
+        Args:
+            updates (dict): account id -> {field: value}
+            role (str): Only update accounts with this role
+
+        Returns:
+            dict: {str(id): None if updated, else an error message}; an id
+                that is not a valid ObjectId fails only its own row
+        """
+        results = {}
+        rows = {}
+        ops = []
+        for key, fields in updates.items():
+            try:
+                _id = key if isinstance(key, ObjectId) else ObjectId(key)
+            except (InvalidId, TypeError):
+                # e.g. a placeholder StudentID: fail this row only
+                results[str(key)] = "Invalid account id"
+                continue
+            query = {"_id": _id}
+            if role is not None:
+                query["role"] = role
+            rows[_id] = (str(key), fields)
+            ops.append(UpdateOne(query, {"$set": fields}))
+        if not ops:
+            return results
+        ids = list(rows)
+
+        errors = {}
+        try:
+            result = ACCOUNTS_COLLECTION.bulk_write(ops, ordered=False)
+            matched = result.matched_count
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                errors[ids[error["index"]]] = error.get("errmsg", "Write failed")
+            matched = e.details.get("nMatched", 0)
+
+        if matched + len(errors) < len(ids):
+            # Some filters matched nothing: find out which with one query
+            query = {"_id": {"$in": ids}}
+            if role is not None:
+                query["role"] = role
+            found = {doc["_id"] for doc in ACCOUNTS_COLLECTION.find(query, {"_id": 1})}
+            for _id in ids:
+                if _id not in found and _id not in errors:
+                    errors[_id] = "Account not found"
+
+        for _id, (key, fields) in rows.items():
+            if "username" in fields:
+                invalidate_username_cache(account_id=_id)
+            results[key] = errors.get(_id)
+        return results
+
     @classmethod
     def find_by_email(cls, email):
         """Find account by email - MODEL ONLY FINDS DATA"""
@@ -121,27 +340,120 @@ class Account:
         return None
 
     @classmethod
-    def find_all_by_role(cls, role):
+    def find_all_by_role(cls, role, projection=LIST_PROJECTION):
         """
         Find all accounts by role (e.g., 'student', 'admin')
 
         Args:
             role (str): The role to filter by ('student' or 'admin')
+            projection (dict): MongoDB projection; by default everything but
+                password_hash (loaded lazily if ever needed)
 
         Returns:
             list: List of Account objects (Student or Admin instances)
         """
         try:
-            accounts_data = ACCOUNTS_COLLECTION.find({"role": role})
-            accounts = []
+            return list(cls.iter_all_by_role(role, projection=projection))
+        except Exception as e:
+            print(f"Error finding accounts by role: {e}")
+            return []
 
-            for account_data in accounts_data:
-                account = cls._instantiate_correct_class(account_data)
-                accounts.append(account)
+    @classmethod
+    def iter_all_by_role(
+        cls,
+        role,
+        projection=LIST_PROJECTION,
+        batch_size=DEFAULT_BATCH_SIZE,
+        limit=0,
+        skip=0,
+    ):
+        """
+        Stream accounts by role in batches instead of building a list.
+
+        Unlike the other iter_* finders, projected documents are still
+        hydrated (missing constructor fields become None).
 
-            return accounts
+        Args:
+            role (str): The role to filter by ('student' or 'admin')
+            projection (dict): MongoDB projection (default: no password_hash)
+            batch_size (int): Documents per round trip
+            limit (int): Maximum number of accounts (0 = no limit)
+            skip (int): Number of accounts to skip
+
+        Yields:
+            Account objects (Student or Admin instances)
+        """
+
+        def hydrate(account_data):
+            account_data.setdefault("role", role)
+            return cls._instantiate_correct_class(account_data)
+
+        return cls._stream(
+            ACCOUNTS_COLLECTION,
+            {"role": role},
+            projection,
+            batch_size=batch_size,
+            limit=limit,
+            skip=skip,
+            hydrate=hydrate,
+        )
+
+    @classmethod
+    def search_by_role(
+        cls,
+        role,
+        search_term,
+        fields=SEARCH_FIELDS,
+        projection=None,
+        limit=50,
+        skip=0,
+        use_text=False,
+    ):
+        """
+        Search accounts of a role on the server instead of in Python.
+
+        By default each field is matched as a case-insensitive prefix: the
+        query is a `$gte`/`$lt` range evaluated under SEARCH_COLLATION, so each
+        `$or` branch is answered from the matching role_<field>_ci index with
+        tight bounds. (A case-insensitive `$regex` cannot bound an index scan.)
+        With use_text=True the `$text` index on fullName is used instead and
+        results are ordered by relevance.
+
+        Args:
+            role (str): The role to filter by ('student' or 'admin')
+            search_term (str): Text typed by the user
+            fields (tuple): Fields matched by the prefix search
+            projection (dict): MongoDB projection of the returned fields
+            limit (int): Maximum number of documents to return
+            skip (int): Number of documents to skip (for paging)
+            use_text (bool): Use the full-text index on fullName
+
+        Returns:
+            list: Raw account documents (only the projected fields)
+        """
+        query = {"role": role}
+        search_term = (search_term or "").strip()
+        sort = [("username", 1)]
+        collation = SEARCH_COLLATION
+
+        if search_term and use_text:
+            query["$text"] = {"$search": search_term}
+            projection = dict(projection or {})
+            projection["score"] = {"$meta": "textScore"}
+            sort = [("score", {"$meta": "textScore"})]
+            collation = None
+        elif search_term:
+            prefix = {
+                "$gte": search_term,
+                "$lt": search_term + PREFIX_UPPER_BOUND,
+            }
+            query["$or"] = [{field: prefix} for field in fields]
+
+        try:
+            cursor = ACCOUNTS_COLLECTION.find(query, projection, collation=collation)
+            return list(cursor.sort(sort).skip(skip).limit(limit))
         except Exception as e:
-            print(f"Error finding accounts by role: {e}")
+            print(f"Error searching accounts: {e}")
             return []
 
     @classmethod
@@ -191,6 +503,7 @@ class Account:
         try:
             if self._id:
                 result = ACCOUNTS_COLLECTION.delete_one({"_id": self._id})
+                invalidate_username_cache(account_id=self._id)
                 return result.deleted_count > 0
             return False
         except Exception as e:
@@ -213,6 +526,11 @@ class Account:
         ACCOUNTS_COLLECTION.update_one(
             {"_id": self._id}, {"$set": {"password_hash": self.password_hash}}
         )
+        # Stored now, so the next save() must not send it again. Only this
+        # field is marked clean: other unsaved edits still have to be saved.
+        snapshot = self.__dict__.get("_loaded_state")
+        if snapshot is not None:
+            snapshot["password_hash"] = self.password_hash
         print(f"Password updated for {self.username}")
         return True
 
@@ -227,12 +545,18 @@ class Account:
         from models.student import Student
         from models.admin import Admin
 
+        # Projected documents may lack constructor fields
+        defaults = dict(_PARTIAL_DEFAULTS)
+        if role == "student":
+            defaults.update(_STUDENT_PARTIAL_DEFAULTS)
+        account_data = {**defaults, **account_data}
+
         if role == "student":
-            return Student(**account_data)
+            return Student.from_document(account_data)
         elif role == "admin":
-            return Admin(**account_data)
+            return Admin.from_document(account_data)
         else:
-            return Account(**account_data)
+            return Account.from_document(account_data)
 
     def __repr__(self):
         return f"<{self.role.capitalize()} {self.username} ({self._id})>"
@@ -1,4 +1,4 @@
-from models.account import Account, ACCOUNTS_COLLECTION
+from models.account import Account, ACCOUNTS_COLLECTION, invalidate_username_cache
 from models.student import Student
 from models.database import db
 from bson.objectid import ObjectId
@@ -6,8 +6,8 @@ from models.announcement import Announcement
 from models.fee import Fee
 from models.transaction import Transaction
 
-FEES_COLLECTION = db.get_db()["fees"]
-TRANSACTIONS_COLLECTION = db.get_db()["transactions"]
+FEES_COLLECTION = db.collection("fees")
+TRANSACTIONS_COLLECTION = db.collection("transactions")
 
 
 class Admin(Account):
@@ -87,6 +87,7 @@ class Admin(Account):
             if delete_result.deleted_count == 0:
                 print(f"Không tìm thấy sinh viên (ID: {student_id}) để xóa.")
                 return False
+            invalidate_username_cache(account_id=student_id)
 
             # 3. Xóa dữ liệu liên quan (Cascading Delete)
             fees_result = FEES_COLLECTION.delete_many({"student_id": student_id})
@@ -1,17 +1,60 @@
 from models.database import db
+from models.tracking import DEFAULT_BATCH_SIZE, TrackedModel
 from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
 import datetime
 
-# Lấy collection một lần để tái sử dụng
-try:
-    ANNOUNCEMENTS_COLLECTION = db.get_db()["announcements"]
-except Exception as e:
-    print(f"Lỗi khi kết nối collection 'announcements': {e}")
+# Lấy collection một lần để tái sử dụng (chỉ kết nối khi dùng lần đầu)
+ANNOUNCEMENTS_COLLECTION = db.collection("announcements")
 
+# Độ dài đoạn xem trước (preview) lưu kèm mỗi thông báo
+PREVIEW_LENGTH = 140
 
-class Announcement:
+# Projection cho các màn hình danh sách: không lấy content (có thể rất dài),
+# chỉ lấy preview. Thông báo cũ chưa có preview (trước backfill_previews)
+# thì server tự cắt content.
+SUMMARY_PROJECTION = {
+    "title": 1,
+    "createBy": 1,
+    "createAt": 1,
+    "status": 1,
+    "preview": {
+        "$ifNull": [
+            "$preview",
+            {"$substrCP": [{"$ifNull": ["$content", ""]}, 0, PREVIEW_LENGTH]},
+        ]
+    },
+}
+
+# Mới nhất trước; _id phân định các thông báo có cùng createAt
+PAGE_SORT = [("createAt", DESCENDING), ("_id", DESCENDING)]
+
+# Index cho collection 'announcements' (được tạo bởi models.indexes)
+ANNOUNCEMENT_INDEXES = [
+    # find_all / iter_page(status=...) sắp xếp theo PAGE_SORT
+    IndexModel(
+        [("status", ASCENDING), ("createAt", DESCENDING), ("_id", DESCENDING)],
+        name="status_createAt_id",
+    ),
+]
+
+
+def make_preview(content, length=PREVIEW_LENGTH):
+    """Đoạn đầu của content trên một dòng, cắt bớt kèm '...' nếu quá dài"""
+    text = " ".join(str(content or "").split())
+    return text if len(text) <= length else text[: length - 3] + "..."
+
+
+class Announcement(TrackedModel):
     def __init__(
-        self, title, content, createBy, createAt=None, _id=None, status="published"
+        self,
+        title,
+        content,
+        createBy,
+        createAt=None,
+        _id=None,
+        status="published",
+        preview=None,
     ):
         """
         Khởi tạo một Thông báo.
@@ -23,20 +66,38 @@ class Announcement:
         self.createBy = createBy  # Đây là ObjectId của Admin
         self.createAt = createAt or datetime.datetime.now(datetime.UTC)
         self.status = status
+        self.preview = make_preview(content) if preview is None else preview
         # Trạng thái: 'published' (đã đăng), \'draft' (nháp), 'archived' (lưu trữ)
 
+    @classmethod
+    def from_document(cls, data):
+        obj = super().from_document(data)
+        if "preview" not in data:
+            # Thông báo cũ: preview tính trong __init__ chưa có trong DB,
+            # bỏ khỏi snapshot để save() kế tiếp ghi nó xuống
+            obj._loaded_state.pop("preview", None)
+        return obj
+
     def save(self):
         """Lưu (hoặc cập nhật) thông báo vào DB"""
-        data = vars(self)
-
+        # Chỉ tính lại preview khi content đổi
+        snapshot = vars(self).get("_loaded_state")
+        if snapshot is None or snapshot.get("content") != self.content:
+            self.preview = make_preview(self.content)
         if self._id:
-            # Cập nhật
-            ANNOUNCEMENTS_COLLECTION.update_one({"_id": self._id}, {"$set": data})
+            # Chỉ $set các field đã thay đổi; không đổi gì thì không ghi
+            changes = self.changed_fields()
+            if changes:
+                ANNOUNCEMENTS_COLLECTION.update_one(
+                    {"_id": self._id}, {"$set": changes}
+                )
         else:
             # Thêm mới
+            data = self.to_document()
             data.pop("_id", None)  # Xóa _id None để MongoDB tự tạo
             result = ANNOUNCEMENTS_COLLECTION.insert_one(data)
             self._id = result.inserted_id
+        self.mark_clean()
         return self._id
 
     def delete(self):
@@ -71,7 +132,7 @@ class Announcement:
         """Tìm thông báo bằng ID"""
         try:
             data = ANNOUNCEMENTS_COLLECTION.find_one({"_id": ObjectId(ann_id)})
-            return cls(**data) if data else None
+            return cls.from_document(data) if data else None
         except Exception as e:
             print(f"Lỗi tìm thông báo: {e}")
             return None
@@ -82,14 +143,87 @@ class Announcement:
         Lấy tất cả thông báo (mặc định là đã publish).
         Đây là phương thức mà Student.viewNotification() sẽ dùng.
         """
-        cursor = ANNOUNCEMENTS_COLLECTION.find({"status": status}).sort("createAt", -1)
         # Trả về một danh sách các đối tượng Announcement
-        return [cls(**data) for data in cursor]
+        return list(cls.iter_all(status=status))
+
+    @classmethod
+    def iter_all(
+        cls,
+        status="published",
+        projection=None,
+        batch_size=DEFAULT_BATCH_SIZE,
+        limit=0,
+        skip=0,
+    ):
+        """
+        Như find_all nhưng duyệt theo batch (mới nhất trước).
+        Có projection thì trả về document thô thay vì Announcement.
+        """
+        return cls._stream(
+            ANNOUNCEMENTS_COLLECTION,
+            {"status": status},
+            projection=projection,
+            batch_size=batch_size,
+            limit=limit,
+            skip=skip,
+            sort=PAGE_SORT,
+        )
+
+    @classmethod
+    def iter_page(cls, limit, before=None, status="published", projection=None):
+        """
+        Một trang thông báo (mới nhất trước) theo keyset: bắt đầu ngay sau
+        `before` = (createAt, _id) của thông báo cuối trang trước, nên trang
+        nào cũng chỉ quét `limit` entry của index dù cuộn sâu đến đâu.
+        """
+        query = {"status": status}
+        if before is not None:
+            created, last_id = before
+            query["$or"] = [
+                {"createAt": {"$lt": created}},
+                {"createAt": created, "_id": {"$lt": last_id}},
+            ]
+        return cls._stream(
+            ANNOUNCEMENTS_COLLECTION,
+            query,
+            projection=projection,
+            batch_size=limit,
+            limit=limit,
+            sort=PAGE_SORT,
+        )
 
     def __repr__(self):
         """Hiển thị dạng chuỗi (để debug)"""
         return f"<Announcement '{self.title}' by {self.createBy}>"
 
 
+def backfill_previews(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Ghi preview cho các thông báo cũ chưa có (idempotent), để danh sách
+    không phải dùng bản cắt thô $substrCP của SUMMARY_PROJECTION.
+
+    Returns:
+        int: số thông báo được cập nhật
+    """
+    missing = {"preview": {"$exists": False}}
+    cursor = ANNOUNCEMENTS_COLLECTION.find(
+        missing, {"content": 1}, batch_size=batch_size
+    )
+    updated, ops = 0, []
+    for doc in cursor:
+        ops.append(
+            UpdateOne(
+                {"_id": doc["_id"], **missing},
+                {"$set": {"preview": make_preview(doc.get("content"))}},
+            )
+        )
+        if len(ops) >= batch_size:
+            updated += ANNOUNCEMENTS_COLLECTION.bulk_write(ops).modified_count
+            ops = []
+    if ops:
+        updated += ANNOUNCEMENTS_COLLECTION.bulk_write(ops).modified_count
+    return updated
+
+
 # a = Announcement("Hello world", "The first succsessful notification", "Vuong")
 # a.save()
@@ -1,15 +1,158 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, monitoring
 from pymongo.errors import ConnectionFailure
-import os
-from dotenv import load_dotenv
+import threading
+import time
 
-load_dotenv()
+from utils.config import get_mongo_client_options, get_mongo_settings
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Collect connection pool counters from pymongo CMAP events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connections_open = 0
+            self.checked_out = 0
+            self.max_checked_out = 0
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def _wait_time(self, event):
+        # pymongo >= 4.7 reports the duration itself
+        duration = getattr(event, "duration", None)
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        if duration is not None:
+            return duration
+        return time.perf_counter() - started if started is not None else 0.0
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait = self._wait_time(event)
+        with self._lock:
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def connection_check_out_failed(self, event):
+        wait = self._wait_time(event)
+        with self._lock:
+            self.checkout_failures += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_open += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_open = max(self.connections_open - 1, 0)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def snapshot(self):
+        with self._lock:
+            attempts = self.checkouts + self.checkout_failures
+            return {
+                "connections_open": self.connections_open,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_wait_ms": (self.total_wait / attempts * 1000) if attempts else 0.0,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+
+class LazyCollection:
+    """
+    Collection handle that is resolved on first use (thread-safe).
+
+    Looking up a method only returns a thin wrapper, so importing a model or
+    patching one of its collection methods in a test never opens a
+    connection; the real pymongo Collection is resolved on the first call.
+    """
+
+    # Non-method Collection attributes, resolved eagerly on access
+    _PROPERTIES = frozenset(
+        {
+            "database",
+            "full_name",
+            "codec_options",
+            "read_preference",
+            "write_concern",
+            "read_concern",
+        }
+    )
+
+    def __init__(self, database, name):
+        self._database = database
+        self._lock = threading.Lock()
+        self._collection = None
+        self.name = name
+
+    def resolve(self):
+        """Return the underlying pymongo Collection, connecting if needed."""
+        if self._collection is None:
+            with self._lock:
+                if self._collection is None:
+                    self._collection = self._database.get_db()[self.name]
+        return self._collection
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr in self._PROPERTIES:
+            return getattr(self.resolve(), attr)
+
+        def method(*args, **kwargs):
+            return getattr(self.resolve(), attr)(*args, **kwargs)
+
+        method.__name__ = attr
+        return method
+
+    def __repr__(self):
+        state = "resolved" if self._collection is not None else "lazy"
+        return f"<LazyCollection {self.name} ({state})>"
 
 
 class Database:
     _instance = None
     _client = None
     _db = None
+    _pool_listener = None
+    _client_options = None
+    _lock = threading.RLock()
+    _collections = {}
 
     def __new__(cls):
         """Singleton pattern - only one database connection"""
@@ -18,34 +161,78 @@ class Database:
         return cls._instance
 
     def __init__(self):
-        if self._client is None:
-            self.connect()
+        # The connection is opened lazily by get_db()
+        pass
 
     def connect(self):
         """Connect to MongoDB"""
-        try:
-            # MongoDB Atlas (Cloud)
-            MONGO_URL = os.getenv("MONGO_URL")
-            MONGO_DB = os.getenv("MONGO_DB")
-            self._client = MongoClient(MONGO_URL)
+        with self._lock:
+            client = None
+            try:
+                # MongoDB Atlas (Cloud)
+                settings = get_mongo_settings()
+                self._client_options = get_mongo_client_options()
+                self._pool_listener = PoolStatsListener()
+                client = MongoClient(
+                    settings["url"],
+                    event_listeners=[self._pool_listener],
+                    **self._client_options,
+                )
 
-            # Test connection
-            self._client.admin.command("ping")
-            print("✅ Connected to MongoDB successfully!")
+                # Test connection
+                client.admin.command("ping")
+                print("✅ Connected to MongoDB successfully!")
 
-            # Select database
-            self._db = self._client[MONGO_DB]  # Database name
+                # Select database
+                self._client = client
+                self._db = client[settings["db"]]  # Database name
 
-        except ConnectionFailure as e:
-            print(f"❌ Failed to connect to MongoDB: {e}")
-            raise
+            except ConnectionFailure as e:
+                print(f"❌ Failed to connect to MongoDB: {e}")
+                if client is not None:
+                    client.close()
+                raise
 
     def get_db(self):
-        """Get database instance"""
+        """Get database instance (connects on first use)"""
         if self._db is None:
-            self.connect()
+            with self._lock:
+                if self._db is None:
+                    self.connect()
         return self._db
 
+    def start_session(self):
+        """Start a client session (for multi-document transactions)"""
+        self.get_db()
+        return self._client.start_session()
+
+    def collection(self, name):
+        """Return a lazily-resolved handle for a collection"""
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = LazyCollection(self, name)
+            return self._collections[name]
+
+    def get_pool_stats(self):
+        """
+        Connection pool statistics, useful to spot pool saturation.
+
+        Returns:
+            dict: {
+                "max_pool_size": int,
+                "connections_open": int,
+                "checked_out": int,        # connections in use right now
+                "max_checked_out": int,    # high-water mark
+                "checkouts": int,
+                "checkout_failures": int,  # e.g. waitQueueTimeoutMS exceeded
+                "avg_wait_ms": float,      # time spent waiting for a connection
+                "max_wait_ms": float,
+            }
+        """
+        stats = self._pool_listener.snapshot() if self._pool_listener else {}
+        stats["max_pool_size"] = (self._client_options or {}).get("maxPoolSize")
+        return stats
+
     def close(self):
         """Close MongoDB connection"""
         if self._client:
@@ -53,5 +240,5 @@ class Database:
             print("MongoDB connection closed")
 
 
-# Create global database instance
+# Create global database instance (does not connect until first use)
 db = Database()
@@ -0,0 +1,124 @@
+from models.database import db
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+import datetime
+
+# Collection 'email_outbox': hàng đợi email chờ gửi (xem utils.email_outbox)
+OUTBOX_COLLECTION = db.collection("email_outbox")
+
+# Index cho collection 'email_outbox' (được tạo bởi models.indexes)
+EMAIL_JOB_INDEXES = [
+    # claim_next: job đến hạn gửi sớm nhất theo trạng thái
+    IndexModel(
+        [("status", ASCENDING), ("next_attempt_at", ASCENDING)],
+        name="status_next_attempt",
+    ),
+]
+
+# Trạng thái: 'pending' (chờ gửi), 'sending' (worker đang gửi),
+# 'sent' (đã gửi), 'failed' (hết số lần thử)
+PENDING, SENDING, SENT, FAILED = "pending", "sending", "sent", "failed"
+
+
+def _now():
+    return datetime.datetime.now(datetime.UTC)
+
+
+def enqueue(to, subject, body=None, kind="email", account_id=None):
+    """
+    Persist an email job; the outbox worker delivers it.
+
+    Emails carrying a secret (a new password) are queued without a body,
+    only with the account_id they are about: the worker renders the body
+    when it sends (see utils.email_outbox.BODY_RENDERERS), so the secret is
+    never stored in the outbox.
+
+    Returns:
+        ObjectId: id of the job (for get_status)
+    """
+    now = _now()
+    job = {
+        "kind": kind,
+        "to": to,
+        "subject": subject,
+        "status": PENDING,
+        "attempts": 0,
+        "last_error": None,
+        "created_at": now,
+        "next_attempt_at": now,
+    }
+    if body is not None:
+        job["body"] = body
+    if account_id is not None:
+        job["account_id"] = account_id
+    result = OUTBOX_COLLECTION.insert_one(job)
+    return result.inserted_id
+
+
+def claim_next():
+    """
+    Atomically take the oldest due pending job (status -> 'sending',
+    attempts + 1), or None when nothing is due.
+    """
+    now = _now()
+    return OUTBOX_COLLECTION.find_one_and_update(
+        {"status": PENDING, "next_attempt_at": {"$lte": now}},
+        {"$set": {"status": SENDING, "claimed_at": now}, "$inc": {"attempts": 1}},
+        sort=[("next_attempt_at", ASCENDING)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def mark_sent(job_id):
+    """Job delivered; the body is no longer needed and is dropped."""
+    OUTBOX_COLLECTION.update_one(
+        {"_id": job_id},
+        {"$set": {"status": SENT, "sent_at": _now()}, "$unset": {"body": ""}},
+    )
+
+
+def mark_failed(job_id, error, retry_at=None):
+    """
+    Record a failed attempt: back to 'pending' until retry_at, or 'failed'
+    for good when retry_at is None (the body is then dropped).
+    """
+    if retry_at is not None:
+        update = {
+            "$set": {
+                "status": PENDING,
+                "last_error": error,
+                "next_attempt_at": retry_at,
+            }
+        }
+    else:
+        update = {
+            "$set": {"status": FAILED, "last_error": error, "failed_at": _now()},
+            "$unset": {"body": ""},
+        }
+    OUTBOX_COLLECTION.update_one({"_id": job_id}, update)
+
+
+def release_stale(older_than):
+    """
+    Put jobs left in 'sending' (the app exited mid-send) back in the queue.
+
+    Returns:
+        int: number of jobs released
+    """
+    result = OUTBOX_COLLECTION.update_many(
+        {"status": SENDING, "claimed_at": {"$lt": older_than}},
+        {"$set": {"status": PENDING, "next_attempt_at": _now()}},
+    )
+    return result.modified_count
+
+
+def get_status(job_id):
+    """
+    Returns:
+        dict: {"status", "attempts", "last_error"} or None if unknown
+    """
+    if not isinstance(job_id, ObjectId):
+        job_id = ObjectId(job_id)
+    return OUTBOX_COLLECTION.find_one(
+        {"_id": job_id}, {"_id": 0, "status": 1, "attempts": 1, "last_error": 1}
+    )
@@ -1,13 +1,19 @@
 from models.database import db
+from models.tracking import DEFAULT_BATCH_SIZE, TrackedModel
 from bson.objectid import ObjectId
+from pymongo import ASCENDING, IndexModel
 
-try:
-    FEES_COLLECTION = db.get_db()["fees"]
-except Exception as e:
-    print(f"Lỗi khi kết nối collection 'fees': {e}")
+# Collection 'fees', chỉ kết nối khi dùng lần đầu
+FEES_COLLECTION = db.collection("fees")
 
+# Index cho collection 'fees' (được tạo bởi models.indexes)
+FEE_INDEXES = [
+    # find_by_student_id / Admin.hardDeleteStudent
+    IndexModel([("student_id", ASCENDING)], name="student_id"),
+]
 
-class Fee:
+
+class Fee(TrackedModel):
     def __init__(
         self,
         description,
@@ -32,22 +38,39 @@ class Fee:
 
     def save(self):
         """Lưu (hoặc cập nhật) khoản phí vào DB"""
-        data = vars(self)
-
         if self._id:
-            FEES_COLLECTION.update_one({"_id": self._id}, {"$set": data})
+            # Chỉ $set các field đã thay đổi; không đổi gì thì không ghi
+            changes = self.changed_fields()
+            if changes:
+                FEES_COLLECTION.update_one({"_id": self._id}, {"$set": changes})
         else:
+            data = self.to_document()
             data.pop("_id", None)
             result = FEES_COLLECTION.insert_one(data)
             self._id = result.inserted_id
+        self.mark_clean()
         return self._id
 
+    @classmethod
+    def iter_all(cls, projection=None, batch_size=DEFAULT_BATCH_SIZE, limit=0, skip=0):
+        """
+        Duyệt tất cả học phí theo batch (không tạo list trong bộ nhớ).
+        Có projection thì trả về document thô thay vì Fee.
+        """
+        return cls._stream(
+            FEES_COLLECTION,
+            {},
+            projection=projection,
+            batch_size=batch_size,
+            limit=limit,
+            skip=skip,
+        )
+
     @classmethod
     def find_all(cls):
         """Return all fees in the collection"""
         try:
-            cursor = FEES_COLLECTION.find()
-            return [cls(**data) for data in cursor]
+            return list(cls.iter_all())
         except Exception as e:
             print(f"Error fetching all fees: {e}")
             return []
@@ -74,7 +97,7 @@ class Fee:
         """Tìm học phí bằng ID"""
         try:
             data = FEES_COLLECTION.find_one({"_id": ObjectId(fee_id)})
-            return cls(**data) if data else None
+            return cls.from_document(data) if data else None
         except Exception as e:
             print(f"Lỗi tìm học phí: {e}")
             return None
@@ -85,12 +108,33 @@ class Fee:
         Lấy tất cả học phí của một sinh viên.
         Đây là phương thức mà Student.viewFinancial() sẽ dùng.
         """
+        return list(cls.iter_by_student_id(student_id))
+
+    @classmethod
+    def iter_by_student_id(
+        cls,
+        student_id,
+        projection=None,
+        batch_size=DEFAULT_BATCH_SIZE,
+        limit=0,
+        skip=0,
+    ):
+        """
+        Như find_by_student_id nhưng duyệt theo batch.
+        Có projection thì trả về document thô thay vì Fee.
+        """
         # Đảm bảo student_id là ObjectId
         if not isinstance(student_id, ObjectId):
             student_id = ObjectId(student_id)
 
-        cursor = FEES_COLLECTION.find({"student_id": student_id})
-        return [cls(**data) for data in cursor]
+        return cls._stream(
+            FEES_COLLECTION,
+            {"student_id": student_id},
+            projection=projection,
+            batch_size=batch_size,
+            limit=limit,
+            skip=skip,
+        )
 
     def __repr__(self):
         """Hiển thị dạng chuỗi (để debug)"""
@@ -0,0 +1,263 @@
+"""
+Index registry and bootstrap for every collection used by the models.
+
+Each model module declares its own indexes next to the collection handle
+(ACCOUNT_INDEXES, FEE_INDEXES, ...). This module collects them and creates or
+validates them idempotently.
+
+Usage (from src/):
+    python -m models.indexes            # create missing indexes, backfill
+    python -m models.indexes --check    # verify only, exit 1 on any problem
+    python -m models.indexes --stats    # also list unused indexes ($indexStats)
+"""
+
+import argparse
+import sys
+
+from models.database import db
+from models.account import ACCOUNT_INDEXES
+from models.announcement import ANNOUNCEMENT_INDEXES, backfill_previews
+from models.email_job import EMAIL_JOB_INDEXES
+from models.fee import FEE_INDEXES
+from models.transaction import TRANSACTION_INDEXES
+
+INDEX_REGISTRY = {
+    "accounts": ACCOUNT_INDEXES,
+    "fees": FEE_INDEXES,
+    "transactions": TRANSACTION_INDEXES,
+    "announcements": ANNOUNCEMENT_INDEXES,
+    "email_outbox": EMAIL_JOB_INDEXES,
+}
+
+
+class IndexCheckError(RuntimeError):
+    """Raised in check mode when declared indexes are missing or conflicting."""
+
+
+def _normalize_direction(direction):
+    if isinstance(direction, (int, float)):
+        return int(direction)
+    return direction
+
+
+def _collation_signature(collation):
+    """(locale, strength) of an index collation, None for binary comparison."""
+    if not collation or collation.get("locale", "simple") == "simple":
+        return None
+    # The server reports every option; strength 3 is the default
+    return collation["locale"], int(collation.get("strength", 3))
+
+
+def _declared_signature(index_model):
+    """Comparable (keys, unique, collation) signature of a declared IndexModel."""
+    document = index_model.document
+    keys = list(document["key"].items())
+    if any(direction == "text" for _field, direction in keys):
+        signature = ("text", tuple(sorted(f for f, d in keys if d == "text")))
+    else:
+        signature = tuple((f, _normalize_direction(d)) for f, d in keys)
+    return (
+        signature,
+        bool(document.get("unique", False)),
+        _collation_signature(document.get("collation")),
+    )
+
+
+def _existing_signature(info):
+    """Comparable (keys, unique, collation) signature of an index_information() entry."""
+    if "weights" in info:
+        signature = ("text", tuple(sorted(info["weights"])))
+    else:
+        signature = tuple((f, _normalize_direction(d)) for f, d in info["key"])
+    return (
+        signature,
+        bool(info.get("unique", False)),
+        _collation_signature(info.get("collation")),
+    )
+
+
+def check_indexes(database=None):
+    """
+    Compare declared indexes with the ones that exist on the server.
+
+    Returns:
+        dict: {collection: {"missing": [IndexModel], "conflicting": [str],
+                            "undeclared": [str]}}
+    """
+    database = database if database is not None else db.get_db()
+    report = {}
+
+    for collection_name, declared in INDEX_REGISTRY.items():
+        existing = database[collection_name].index_information()
+        existing_signatures = {
+            _existing_signature(info): name for name, info in existing.items()
+        }
+        declared_signatures = set()
+        missing, conflicting = [], []
+
+        for index_model in declared:
+            signature = _declared_signature(index_model)
+            declared_signatures.add(signature)
+            name = index_model.document["name"]
+
+            if signature in existing_signatures:
+                continue
+            if name in existing:
+                # Same name but different keys/options: cannot be fixed in place
+                conflicting.append(name)
+            else:
+                missing.append(index_model)
+
+        undeclared = [
+            name
+            for name, info in existing.items()
+            if name != "_id_" and _existing_signature(info) not in declared_signatures
+        ]
+        report[collection_name] = {
+            "missing": missing,
+            "conflicting": conflicting,
+            "undeclared": undeclared,
+        }
+
+    return report
+
+
+def ensure_indexes(database=None, check_only=False):
+    """
+    Create every missing declared index (idempotent).
+
+    Args:
+        database: pymongo Database (defaults to the app database)
+        check_only (bool): Do not create anything; raise IndexCheckError
+            if any index is missing or conflicting
+
+    Returns:
+        dict: The report from check_indexes (before creation)
+    """
+    database = database if database is not None else db.get_db()
+    report = check_indexes(database)
+
+    problems = []
+    for collection_name, result in report.items():
+        for index_model in result["missing"]:
+            problems.append(
+                f"{collection_name}: missing {index_model.document['name']}"
+            )
+        for name in result["conflicting"]:
+            problems.append(f"{collection_name}: conflicting definition for {name}")
+
+    if check_only:
+        if problems:
+            raise IndexCheckError("Index check failed:\n  " + "\n  ".join(problems))
+        return report
+
+    for collection_name, result in report.items():
+        if result["missing"]:
+            created = database[collection_name].create_indexes(result["missing"])
+            print(f"✅ Created indexes on '{collection_name}': {', '.join(created)}")
+        for name in result["conflicting"]:
+            print(
+                f"⚠️ Index '{name}' on '{collection_name}' differs from its "
+                "declaration; drop it and re-run to rebuild."
+            )
+
+    return report
+
+
+def index_usage(database=None):
+    """
+    Read per-index usage counters with the `$indexStats` aggregation stage.
+
+    Counters reset when the server restarts.
+
+    Returns:
+        dict: {collection: {index_name: ops}}
+    """
+    database = database if database is not None else db.get_db()
+    usage = {}
+    for collection_name in INDEX_REGISTRY:
+        stats = database[collection_name].aggregate([{"$indexStats": {}}])
+        usage[collection_name] = {
+            stat["name"]: int(stat.get("accesses", {}).get("ops", 0)) for stat in stats
+        }
+    return usage
+
+
+def unused_indexes(database=None):
+    """Return {collection: [index_name, ...]} for indexes never used since restart."""
+    return {
+        collection_name: [
+            name for name, ops in counters.items() if ops == 0 and name != "_id_"
+        ]
+        for collection_name, counters in index_usage(database).items()
+    }
+
+
+def backfill_documents():
+    """
+    Fill in derived fields that older documents lack (idempotent).
+
+    Returns:
+        dict: {what: number of documents updated}
+    """
+    return {"announcement previews": backfill_previews()}
+
+
+def bootstrap_indexes():
+    """
+    Best-effort ensure_indexes (and backfill_documents) for application
+    startup (never raises).
+    """
+    try:
+        report = ensure_indexes()
+    except Exception as e:
+        print(f"❌ Failed to bootstrap indexes: {e}")
+        return None
+    try:
+        for what, count in backfill_documents().items():
+            if count:
+                print(f"✅ Backfilled {count} {what}")
+    except Exception as e:
+        print(f"❌ Failed to backfill documents: {e}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create or verify MongoDB indexes.")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only verify; exit with status 1 if an index is missing",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="report indexes that $indexStats shows as unused",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        report = ensure_indexes(check_only=args.check)
+    except IndexCheckError as e:
+        print(f"❌ {e}")
+        return 1
+
+    for collection_name, result in report.items():
+        for name in result["undeclared"]:
+            print(f"ℹ️ '{collection_name}' has undeclared index '{name}'")
+
+    if not args.check:
+        for what, count in backfill_documents().items():
+            print(f"✅ Backfilled {count} {what}")
+
+    if args.stats:
+        for collection_name, names in unused_indexes().items():
+            for name in names:
+                print(f"ℹ️ '{collection_name}' index '{name}' has not been used")
+
+    print("✅ Index check passed" if args.check else "✅ Indexes are up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
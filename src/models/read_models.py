@@ -0,0 +1,119 @@
+"""
+Lightweight read models for list screens.
+
+Listing pages only show a few fields, so instead of hydrating full
+Student/Admin objects (every field, dirty-tracking snapshot, constructor
+logic) these helpers query with an explicit projection and yield small
+`__slots__` rows straight from the cursor. AnnouncementSummary does the same
+for announcement lists, which only show a preview of the content.
+"""
+
+from dataclasses import MISSING, dataclass, fields
+from functools import cache
+
+from models.database import db
+from models.tracking import DEFAULT_BATCH_SIZE
+
+# Collection handle, resolved on first use
+ACCOUNTS_COLLECTION = db.collection("accounts")
+
+
+@dataclass(frozen=True, slots=True)
+class StudentRow:
+    """One line of the student management table"""
+
+    _id: object
+    username: str = ""
+    email: str = ""
+    fullName: str = ""
+    dob: str = ""
+    gender: str = ""
+    address: str = ""
+    contact: str = ""
+    major: str = ""
+    imageURL: str = ""
+    createAt: object = None
+
+
+@dataclass(frozen=True, slots=True)
+class AdminRow:
+    """One line of the admin management table"""
+
+    _id: object
+    username: str = ""
+    email: str = ""
+    fullName: str = ""
+    contact: str = ""
+    phoneNumber: str = ""
+    createAt: object = None
+
+
+@dataclass(frozen=True, slots=True)
+class AnnouncementSummary:
+    """
+    One announcement in a list: a short preview instead of the full content
+    (see models.announcement.SUMMARY_PROJECTION)
+    """
+
+    _id: object
+    title: str = ""
+    preview: str = ""
+    createBy: object = None
+    status: str = ""
+    createAt: object = None
+
+
+def projection_for(row_cls):
+    """MongoDB projection with exactly the fields of a row class"""
+    return {field.name: 1 for field in fields(row_cls)}
+
+
+@cache
+def _columns(row_cls):
+    """(field name, default) pairs of a row class"""
+    return tuple(
+        (field.name, None if field.default is MISSING else field.default)
+        for field in fields(row_cls)
+    )
+
+
+def row_from_document(row_cls, doc):
+    """Build a row from a (projected) document; missing fields get defaults"""
+    return row_cls(*(doc.get(name, default) for name, default in _columns(row_cls)))
+
+
+def iter_rows(row_cls, role, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Stream accounts of one role as `row_cls` instances.
+
+    Args:
+        row_cls: StudentRow, AdminRow or another slots dataclass whose
+            field names are account fields
+        role (str): 'student' or 'admin'
+        batch_size (int): Documents per round trip
+    """
+    cursor = ACCOUNTS_COLLECTION.find(
+        {"role": role}, projection_for(row_cls), batch_size=batch_size
+    )
+    for doc in cursor:
+        yield row_from_document(row_cls, doc)
+
+
+def iter_student_rows(batch_size=DEFAULT_BATCH_SIZE):
+    return iter_rows(StudentRow, "student", batch_size=batch_size)
+
+
+def iter_admin_rows(batch_size=DEFAULT_BATCH_SIZE):
+    return iter_rows(AdminRow, "admin", batch_size=batch_size)
+
+
+def iter_usernames(role, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Stream the usernames of one role. Only `username` is fetched (a covered
+    query on the role_username index).
+    """
+    cursor = ACCOUNTS_COLLECTION.find(
+        {"role": role}, {"username": 1, "_id": 0}, batch_size=batch_size
+    )
+    for doc in cursor:
+        yield doc.get("username", "")
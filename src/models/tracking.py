@@ -0,0 +1,87 @@
+"""
+Dirty-field tracking shared by the model classes.
+
+A model remembers the document it was loaded (or last saved) with, so save()
+only `$set`s the attributes that changed and skips the write entirely when
+nothing did. Objects built in code without a snapshot (e.g. Fee(..., _id=x))
+still write every field, as before.
+"""
+
+import copy
+
+# Documents fetched per round trip by the iter_* finders
+DEFAULT_BATCH_SIZE = 1000
+
+
+class TrackedModel:
+    """Base class for Account, Fee, Transaction and Announcement"""
+
+    @classmethod
+    def from_document(cls, data):
+        """Build the model from a MongoDB document and snapshot it"""
+        obj = cls(**data)
+        obj.mark_clean()
+        return obj
+
+    @classmethod
+    def _stream(
+        cls,
+        collection,
+        query,
+        projection=None,
+        batch_size=DEFAULT_BATCH_SIZE,
+        limit=0,
+        skip=0,
+        sort=None,
+        hydrate=None,
+    ):
+        """
+        Shared body of the iter_* finders: stream `query` from `collection`
+        in batches of `batch_size` instead of building a list.
+
+        Without a projection every document is hydrated into the model;
+        with one the raw documents are yielded, since a projected document
+        usually lacks required constructor fields. A finder that can build
+        objects from projected documents passes its own `hydrate(document)`.
+        """
+        if hydrate is None and projection is None:
+            hydrate = cls.from_document
+        cursor = collection.find(query, projection, batch_size=batch_size)
+        if sort:
+            cursor = cursor.sort(sort)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        for data in cursor:
+            yield hydrate(data) if hydrate is not None else data
+
+    def to_document(self):
+        """The attributes stored in MongoDB"""
+        data = dict(vars(self))
+        data.pop("_loaded_state", None)
+        return data
+
+    def mark_clean(self):
+        """Remember the current state as the one stored in the database"""
+        self._loaded_state = copy.deepcopy(self.to_document())
+
+    def changed_fields(self):
+        """
+        Fields to `$set` on the next save: only those that differ from the
+        snapshot, or every field when there is none.
+        """
+        data = self.to_document()
+        data.pop("_id", None)
+        snapshot = vars(self).get("_loaded_state")
+        if snapshot is None:
+            return data
+        return {
+            key: value
+            for key, value in data.items()
+            if key not in snapshot or snapshot[key] != value
+        }
+
+    @property
+    def is_dirty(self):
+        return bool(self.changed_fields())
@@ -1,14 +1,34 @@
 from models.database import db
+from models.tracking import DEFAULT_BATCH_SIZE, TrackedModel
 from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
 import datetime
 
-try:
-    TRANSACTIONS_COLLECTION = db.get_db()["transactions"]
-except Exception as e:
-    print(f"Lỗi khi kết nối collection 'transactions': {e}")
+# Collection 'transactions', chỉ kết nối khi dùng lần đầu
+TRANSACTIONS_COLLECTION = db.collection("transactions")
 
+# Index cho collection 'transactions' (được tạo bởi models.indexes)
+TRANSACTION_INDEXES = [
+    # find_by_student_id / Admin.hardDeleteStudent
+    IndexModel(
+        [("student_id", ASCENDING), ("date", DESCENDING)], name="student_id_date"
+    ),
+    # find_by_fee_id
+    IndexModel([("fee_id", ASCENDING)], name="fee_id"),
+    # TransactionController.get_transactions_page (keyset theo date, _id)
+    IndexModel([("date", DESCENDING), ("_id", DESCENDING)], name="date_id"),
+    # PaymentController.process_payment: một khoản phí chỉ được thanh toán
+    # một lần cho mỗi idempotency key (retry không bị trừ tiền hai lần)
+    IndexModel(
+        [("idempotency_key", ASCENDING)],
+        name="idempotency_key_unique",
+        unique=True,
+        partialFilterExpression={"idempotency_key": {"$exists": True}},
+    ),
+]
 
-class Transaction:
+
+class Transaction(TrackedModel):
     def __init__(
         self,
         amount,
@@ -34,14 +54,17 @@ class Transaction:
 
     def save(self):
         """Lưu (hoặc cập nhật) giao dịch vào DB"""
-        data = vars(self)
-
         if self._id:
-            TRANSACTIONS_COLLECTION.update_one({"_id": self._id}, {"$set": data})
+            # Chỉ $set các field đã thay đổi; không đổi gì thì không ghi
+            changes = self.changed_fields()
+            if changes:
+                TRANSACTIONS_COLLECTION.update_one({"_id": self._id}, {"$set": changes})
         else:
+            data = self.to_document()
             data.pop("_id", None)
             result = TRANSACTIONS_COLLECTION.insert_one(data)
             self._id = result.inserted_id
+        self.mark_clean()
         return self._id
 
     @classmethod
@@ -49,7 +72,7 @@ class Transaction:
         """Tìm giao dịch bằng ID"""
         try:
             data = TRANSACTIONS_COLLECTION.find_one({"_id": ObjectId(trans_id)})
-            return cls(**data) if data else None
+            return cls.from_document(data) if data else None
         except Exception as e:
             print(f"Lỗi tìm giao dịch: {e}")
             return None
@@ -60,21 +83,63 @@ class Transaction:
         Lấy tất cả giao dịch của một sinh viên.
         Student.viewFinancial() sẽ dùng phương thức này.
         """
+        return list(cls.iter_by_student_id(student_id))
+
+    @classmethod
+    def iter_by_student_id(
+        cls,
+        student_id,
+        projection=None,
+        batch_size=DEFAULT_BATCH_SIZE,
+        limit=0,
+        skip=0,
+    ):
+        """
+        Như find_by_student_id nhưng duyệt theo batch.
+        Có projection thì trả về document thô thay vì Transaction.
+        """
         # Đảm bảo student_id là ObjectId
         if not isinstance(student_id, ObjectId):
             student_id = ObjectId(student_id)
 
-        cursor = TRANSACTIONS_COLLECTION.find({"student_id": student_id})
-        return [cls(**data) for data in cursor]
+        return cls._stream(
+            TRANSACTIONS_COLLECTION,
+            {"student_id": student_id},
+            projection=projection,
+            batch_size=batch_size,
+            limit=limit,
+            skip=skip,
+        )
 
     @classmethod
     def find_by_fee_id(cls, fee_id):
         """Lấy các giao dịch liên quan đến một khoản phí"""
+        return list(cls.iter_by_fee_id(fee_id))
+
+    @classmethod
+    def iter_by_fee_id(
+        cls,
+        fee_id,
+        projection=None,
+        batch_size=DEFAULT_BATCH_SIZE,
+        limit=0,
+        skip=0,
+    ):
+        """
+        Như find_by_fee_id nhưng duyệt theo batch.
+        Có projection thì trả về document thô thay vì Transaction.
+        """
         if not isinstance(fee_id, ObjectId):
             fee_id = ObjectId(fee_id)
 
-        cursor = TRANSACTIONS_COLLECTION.find({"fee_id": fee_id})
-        return [cls(**data) for data in cursor]
+        return cls._stream(
+            TRANSACTIONS_COLLECTION,
+            {"fee_id": fee_id},
+            projection=projection,
+            batch_size=batch_size,
+            limit=limit,
+            skip=skip,
+        )
 
     def __repr__(self):
         """Hiển thị dạng chuỗi (để debug)"""
@@ -0,0 +1,152 @@
+"""
+Avatar thumbnail cache.
+
+The student screens show the avatar at a few fixed sizes, but decoding a
+phone photo and LANCZOS-resizing it takes hundreds of milliseconds. The
+thumbnails are therefore cached, keyed by the avatar's path, its mtime and
+the target size (so a replaced file is picked up):
+    - in memory, in a bounded LRU shared by the screens
+    - on disk (PNG files in AVATAR_CACHE_DIR), so later runs skip the decode
+
+JPEG originals are decoded with Image.draft, which lets the decoder
+downscale by 1/2, 1/4 or 1/8 while reading instead of decoding every pixel.
+Views call get_avatar() through their task executor, off the Tk thread.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageOps
+
+from utils.config import get_avatar_settings
+
+# Target sizes used by the views
+DASHBOARD_SIZE = (250, 320)  # StudentDashboard
+PROFILE_SIZE = (274, 354)  # StudentProfile (square crop) and UpdateStudentProfile
+
+
+class AvatarCache:
+    """
+    Args:
+        cache_dir (str): Directory of the on-disk thumbnails (None = memory only)
+        memory_items (int): Thumbnails kept in memory
+    """
+
+    def __init__(self, cache_dir=None, memory_items=32):
+        self.cache_dir = cache_dir
+        self.memory_items = memory_items
+        self._memory = OrderedDict()  # key -> Image, least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, path, size, crop_square=False):
+        """
+        The avatar at `path` scaled to `size` (RGBA), or None when the file
+        does not exist.
+
+        Args:
+            crop_square (bool): Center-crop to a square before scaling
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except (OSError, TypeError):
+            return None
+        key = (os.path.abspath(path), mtime, tuple(size), crop_square)
+
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                return image
+
+        image = self._load_from_disk(key)
+        if image is None:
+            image = render_thumbnail(path, size, crop_square)
+            self._save_to_disk(key, image)
+
+        with self._lock:
+            self._memory[key] = image
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+        return image
+
+    def clear(self):
+        """Forget the in-memory thumbnails"""
+        with self._lock:
+            self._memory.clear()
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.png")
+
+    def _load_from_disk(self, key):
+        if not self.cache_dir:
+            return None
+        disk_path = self._disk_path(key)
+        if not os.path.exists(disk_path):
+            return None
+        try:
+            with Image.open(disk_path) as image:
+                image.load()
+                return image.convert("RGBA")
+        except Exception as e:
+            print(f"⚠️ [avatars] unreadable cached thumbnail {disk_path}: {e}")
+            return None
+
+    def _save_to_disk(self, key, image):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            disk_path = self._disk_path(key)
+            # Write then rename so a crash never leaves a half-written file
+            tmp_path = f"{disk_path}.{threading.get_ident()}.tmp"
+            image.save(tmp_path, format="PNG")
+            os.replace(tmp_path, disk_path)
+        except Exception as e:
+            print(f"⚠️ [avatars] could not cache thumbnail: {e}")
+
+
+def render_thumbnail(path, size, crop_square=False):
+    """Decode `path` and scale it to `size` (RGBA), as the views used to"""
+    width, height = size
+    with Image.open(path) as image:
+        # JPEG only (no-op otherwise): decode at the smallest 1/2^n scale
+        # that still covers the target, even after a square crop
+        side = max(width, height)
+        image.draft(image.mode, (side, side))
+        image = image.convert("RGBA")
+
+    if crop_square:
+        side = min(image.size)
+        image = ImageOps.fit(
+            image,
+            (side, side),
+            method=Image.Resampling.LANCZOS,
+            centering=(0.5, 0.5),
+        )
+    return image.resize((width, height), Image.Resampling.LANCZOS)
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_avatar_cache():
+    """The process-wide AvatarCache"""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            settings = get_avatar_settings()
+            _CACHE = AvatarCache(
+                cache_dir=settings["cache_dir"],
+                memory_items=settings["memory_items"],
+            )
+        return _CACHE
+
+
+def get_avatar(path, size, crop_square=False):
+    """Cached thumbnail of `path` (see AvatarCache.get)"""
+    return get_avatar_cache().get(path, size, crop_square=crop_square)
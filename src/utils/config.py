@@ -0,0 +1,133 @@
+"""
+Application settings read from environment variables (or the .env file).
+
+MongoDB connection pool / timeout settings:
+    MONGO_MAX_POOL_SIZE                 (default 50)
+    MONGO_MIN_POOL_SIZE                 (default 0)
+    MONGO_MAX_IDLE_TIME_MS              (default 300000)
+    MONGO_WAIT_QUEUE_TIMEOUT_MS         (default 10000)
+    MONGO_SERVER_SELECTION_TIMEOUT_MS   (default 5000)
+    MONGO_CONNECT_TIMEOUT_MS            (default 5000)
+    MONGO_SOCKET_TIMEOUT_MS             (default 20000)
+    MONGO_COMPRESSORS                   (default "zstd,snappy,zlib")
+    MONGO_RETRY_READS / MONGO_RETRY_WRITES (default true)
+    MONGO_READ_PREFERENCE               (default "primary")
+    MONGO_APP_NAME                      (default "StudentManagementSystem")
+
+Outgoing email (utils.email_service):
+    EMAIL_SMTP_HOST                     (default "smtp.gmail.com")
+    EMAIL_SMTP_PORT                     (default 465)
+    EMAIL_SMTP_SSL                      (default true)
+    EMAIL_SMTP_LOGIN                    (default true)
+    EMAIL_SMTP_TIMEOUT_S                (default 20)
+    EMAIL_SMTP_IDLE_S                   (default 60, reconnect after this idle time)
+    EMAIL_CONFIG_TTL_S                  (default 300, cache of the 'config' account)
+
+    For local testing point it at a debugging SMTP server, e.g.
+    `python -m aiosmtpd -n -l localhost:1025` with EMAIL_SMTP_HOST=localhost,
+    EMAIL_SMTP_PORT=1025, EMAIL_SMTP_SSL=false and EMAIL_SMTP_LOGIN=false.
+
+Avatar thumbnails (utils.avatar_cache):
+    AVATAR_CACHE_DIR                    (default ~/.cache/student_management_system/avatars)
+    AVATAR_CACHE_ITEMS                  (default 32, thumbnails kept in memory)
+"""
+
+import importlib.util
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Python module each wire compressor needs (zlib is in the standard library)
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def get_int(name, default):
+    """Read an integer environment variable, falling back to default."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"⚠️ Invalid integer for {name}: {value!r}, using {default}")
+        return default
+
+
+def get_bool(name, default):
+    """Read a boolean environment variable (1/true/yes/on)."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def available_compressors(requested):
+    """
+    Keep only the compressors whose Python package is installed,
+    preserving the preference order.
+    """
+    compressors = []
+    for name in requested.split(","):
+        name = name.strip().lower()
+        module = _COMPRESSOR_MODULES.get(name)
+        if module and importlib.util.find_spec(module) is not None:
+            compressors.append(name)
+    return compressors
+
+
+def get_mongo_settings():
+    """Return the MongoDB URL and database name."""
+    return {"url": os.getenv("MONGO_URL"), "db": os.getenv("MONGO_DB")}
+
+
+def get_mongo_client_options():
+    """
+    Keyword arguments for pymongo.MongoClient built from the environment.
+    """
+    options = {
+        "maxPoolSize": get_int("MONGO_MAX_POOL_SIZE", 50),
+        "minPoolSize": get_int("MONGO_MIN_POOL_SIZE", 0),
+        "maxIdleTimeMS": get_int("MONGO_MAX_IDLE_TIME_MS", 300000),
+        "waitQueueTimeoutMS": get_int("MONGO_WAIT_QUEUE_TIMEOUT_MS", 10000),
+        "serverSelectionTimeoutMS": get_int("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000),
+        "connectTimeoutMS": get_int("MONGO_CONNECT_TIMEOUT_MS", 5000),
+        "socketTimeoutMS": get_int("MONGO_SOCKET_TIMEOUT_MS", 20000),
+        "retryReads": get_bool("MONGO_RETRY_READS", True),
+        "retryWrites": get_bool("MONGO_RETRY_WRITES", True),
+        "readPreference": os.getenv("MONGO_READ_PREFERENCE", "primary"),
+        "appname": os.getenv("MONGO_APP_NAME", "StudentManagementSystem"),
+    }
+
+    compressors = available_compressors(
+        os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+    )
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+
+    return options
+
+
+def get_email_settings():
+    """SMTP server and caching settings for utils.email_service."""
+    return {
+        "host": os.getenv("EMAIL_SMTP_HOST", "smtp.gmail.com"),
+        "port": get_int("EMAIL_SMTP_PORT", 465),
+        "ssl": get_bool("EMAIL_SMTP_SSL", True),
+        "login": get_bool("EMAIL_SMTP_LOGIN", True),
+        "timeout": get_int("EMAIL_SMTP_TIMEOUT_S", 20),
+        "idle": get_int("EMAIL_SMTP_IDLE_S", 60),
+        "config_ttl": get_int("EMAIL_CONFIG_TTL_S", 300),
+    }
+
+
+def get_avatar_settings():
+    """Thumbnail cache settings for utils.avatar_cache."""
+    default_dir = os.path.join(
+        os.path.expanduser("~"), ".cache", "student_management_system", "avatars"
+    )
+    return {
+        "cache_dir": os.getenv("AVATAR_CACHE_DIR") or default_dir,
+        "memory_items": get_int("AVATAR_CACHE_ITEMS", 32),
+    }
@@ -0,0 +1,201 @@
+"""
+Asynchronous outbound email.
+
+Callers persist an email job in the 'email_outbox' collection
+(models.email_job) and return immediately; a background worker thread
+delivers the jobs through utils.email_service, retrying failures with
+exponential backoff. Because the queue is in MongoDB, jobs survive an app
+restart and are picked up again by the next worker.
+
+Jobs of a kind listed in BODY_RENDERERS are queued without a body and
+rendered at send time, so secrets such as a new password are never stored in
+the queue.
+"""
+
+import datetime
+import threading
+
+from models import email_job
+from models.account import Account
+from utils.email_service import (
+    generate_random_password,
+    password_reset_body,
+    send_email,
+)
+
+
+def render_password_reset(job):
+    """
+    Body of a 'password_reset' job. The new password is generated and
+    stored only now, right before it is sent; a retry sets (and sends) a
+    fresh one.
+    """
+    account = Account.find_by_id(job["account_id"])
+    if account is None:
+        raise LookupError("Account no longer exists")
+    new_password = generate_random_password()
+    account.update_password(new_password)
+    return password_reset_body(account.username, new_password)
+
+
+# Job kind -> render(job) returning the body, for jobs queued without one
+BODY_RENDERERS = {"password_reset": render_password_reset}
+
+
+class EmailOutboxWorker:
+    """
+    Delivers queued email jobs on a daemon thread.
+
+    Args:
+        send (callable): send(to, subject, body) -> {"success", "message"}
+        renderers (dict): Job kind -> render(job) -> body
+            (default BODY_RENDERERS)
+        poll_interval (float): Seconds between queue checks when idle
+        max_attempts (int): Attempts before a job is marked 'failed'
+        base_delay (float): Backoff of the first retry in seconds, doubled
+            on each further attempt
+        max_delay (float): Upper bound of the backoff in seconds
+        stale_after (float): Jobs stuck in 'sending' this long (the app
+            exited mid-send) are queued again when the worker starts
+    """
+
+    def __init__(
+        self,
+        send=send_email,
+        renderers=None,
+        poll_interval=5.0,
+        max_attempts=5,
+        base_delay=10.0,
+        max_delay=600.0,
+        stale_after=300.0,
+    ):
+        self.send = send
+        self.renderers = BODY_RENDERERS if renderers is None else renderers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stale_after = stale_after
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the worker thread (no-op if it is running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="email-outbox", daemon=True
+        )
+        self._thread.start()
+
+    def notify(self):
+        """Wake the worker up (a job was just queued)."""
+        self._wake.set()
+
+    def stop(self, timeout=2.0):
+        """Stop the worker; a send in progress is allowed to finish."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def backoff(self, attempts):
+        """Seconds to wait before the next attempt after `attempts` tries"""
+        return min(self.base_delay * 2 ** (attempts - 1), self.max_delay)
+
+    def run_once(self):
+        """
+        Deliver every job that is due now.
+
+        Returns:
+            int: number of jobs processed
+        """
+        processed = 0
+        while not self._stop.is_set():
+            job = email_job.claim_next()
+            if job is None:
+                break
+            processed += 1
+            self._deliver(job)
+        return processed
+
+    def _deliver(self, job):
+        try:
+            render = self.renderers.get(job["kind"])
+            body = render(job) if render is not None else job.get("body", "")
+            result = self.send(job["to"], job["subject"], body)
+        except Exception as e:
+            result = {"success": False, "message": str(e)}
+
+        if result.get("success"):
+            email_job.mark_sent(job["_id"])
+            print(f"✉️ [outbox] {job['kind']} email sent to {job['to']}")
+            return
+
+        error = result.get("message", "Unknown error")
+        if job["attempts"] >= self.max_attempts:
+            email_job.mark_failed(job["_id"], error)
+            print(f"✗ [outbox] giving up on email to {job['to']}: {error}")
+        else:
+            retry_at = datetime.datetime.now(datetime.UTC) + datetime.timedelta(
+                seconds=self.backoff(job["attempts"])
+            )
+            email_job.mark_failed(job["_id"], error, retry_at=retry_at)
+            print(f"⚠️ [outbox] email to {job['to']} failed, retrying: {error}")
+
+    def _run(self):
+        try:
+            email_job.release_stale(
+                datetime.datetime.now(datetime.UTC)
+                - datetime.timedelta(seconds=self.stale_after)
+            )
+        except Exception as e:
+            print(f"⚠️ [outbox] could not release stale jobs: {e}")
+
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                # Database unreachable: try again on the next poll
+                print(f"⚠️ [outbox] queue check failed: {e}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+
+_WORKER = None
+_WORKER_LOCK = threading.Lock()
+
+
+def get_outbox_worker():
+    """The process-wide EmailOutboxWorker (started on first use)"""
+    global _WORKER
+    with _WORKER_LOCK:
+        if _WORKER is None:
+            _WORKER = EmailOutboxWorker()
+        _WORKER.start()
+        return _WORKER
+
+
+def stop_outbox_worker():
+    """Stop the worker thread (called on application exit)."""
+    global _WORKER
+    with _WORKER_LOCK:
+        if _WORKER is not None:
+            _WORKER.stop()
+            _WORKER = None
+
+
+def queue_email(to, subject, body=None, kind="email", account_id=None):
+    """
+    Queue an email for background delivery and return at once. Kinds in
+    BODY_RENDERERS take an account_id instead of a body.
+
+    Returns:
+        ObjectId: job id, see models.email_job.get_status
+    """
+    job_id = email_job.enqueue(to, subject, body, kind=kind, account_id=account_id)
+    get_outbox_worker().notify()
+    return job_id
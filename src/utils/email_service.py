@@ -1,18 +1,38 @@
+"""
+Outgoing email.
+
+The sender account is read from the 'config' collection and cached for
+EMAIL_CONFIG_TTL_S seconds, and every email goes through one persistent SMTP
+session (connect + TLS handshake + login once, reopened when it drops or
+sits idle), so sending many emails costs one handshake instead of one per
+email. Server settings come from utils.config.get_email_settings (a local
+debugging SMTP server can be used for testing).
+"""
+
 import ssl
 import smtplib
+import threading
+import time
 from email.message import EmailMessage
 import secrets
 import string
 from bson.objectid import ObjectId
 
 from models.database import db
+from utils.config import get_email_settings
+
+# Collection handle, resolved on first use
+CONFIG_COLLECTION = db.collection("config")
 
-# Load collection once
-try:
-    CONFIG_COLLECTION = db.get_db()["config"]
-except Exception as e:
-    print(f"Error connecting to 'config' collection: {e}")
-    exit(1)
+# Document of the 'config' collection holding the sender account
+EMAIL_CONFIG_ID = "691128287956cc411169ab56"
+
+# Sender used when the SMTP server needs no login (local debugging server)
+DEBUG_SENDER = "noreply@localhost"
+
+# Cached sender account, see get_email_account
+_EMAIL_CONFIG_CACHE = {"account": None, "expires": 0.0}
+_EMAIL_CONFIG_LOCK = threading.Lock()
 
 
 def generate_random_password(length=6):
@@ -21,33 +41,155 @@ def generate_random_password(length=6):
     return "".join(secrets.choice(alphabet) for i in range(length))
 
 
-def send_password_reset_email(email, username, new_password):
+def get_email_account(ttl=None):
     """
-    Send email containing new password to user.
+    Sender (email, password) from the 'config' collection, cached for
+    `ttl` seconds (EMAIL_CONFIG_TTL_S by default).
+    """
+    if ttl is None:
+        ttl = get_email_settings()["config_ttl"]
+    with _EMAIL_CONFIG_LOCK:
+        now = time.monotonic()
+        expired = now >= _EMAIL_CONFIG_CACHE["expires"]
+        if _EMAIL_CONFIG_CACHE["account"] is None or expired:
+            data = CONFIG_COLLECTION.find_one({"_id": ObjectId(EMAIL_CONFIG_ID)}) or {}
+            _EMAIL_CONFIG_CACHE["account"] = (data.get("email"), data.get("password"))
+            _EMAIL_CONFIG_CACHE["expires"] = now + ttl
+        return _EMAIL_CONFIG_CACHE["account"]
+
+
+def invalidate_email_config():
+    """Forget the cached sender account (e.g. after changing it)."""
+    with _EMAIL_CONFIG_LOCK:
+        _EMAIL_CONFIG_CACHE["account"] = None
+        _EMAIL_CONFIG_CACHE["expires"] = 0.0
+
+
+class SMTPSession:
+    """
+    A persistent SMTP connection shared by every send (guarded by a lock).
+
+    The connection is opened on first use and kept; it is reopened when it
+    has been idle longer than settings["idle"] seconds (servers drop idle
+    clients) and, if the server disconnected, the message is retried once
+    on a fresh connection.
+    """
+
+    # Errors after which the connection is reopened and the send retried
+    RECONNECT_ERRORS = (
+        smtplib.SMTPServerDisconnected,
+        ConnectionError,
+        TimeoutError,
+    )
+
+    def __init__(self, settings=None):
+        self.settings = settings or get_email_settings()
+        self._server = None
+        self._credentials = None
+        self._last_used = 0.0
+        self._lock = threading.RLock()
+
+    @property
+    def connected(self):
+        return self._server is not None
+
+    def send(self, msg, user=None, password=None):
+        """Send one EmailMessage; raises on failure."""
+        with self._lock:
+            if self._server is not None and (
+                self._credentials != (user, password)
+                or time.monotonic() - self._last_used > self.settings["idle"]
+            ):
+                self.close()
+
+            for attempt in range(2):
+                if self._server is None:
+                    self._connect(user, password)
+                try:
+                    self._server.send_message(msg)
+                    self._last_used = time.monotonic()
+                    return
+                except self.RECONNECT_ERRORS:
+                    self.close()
+                    if attempt:
+                        raise
 
+    def _connect(self, user, password):
+        settings = self.settings
+        if settings["ssl"]:
+            server = smtplib.SMTP_SSL(
+                settings["host"],
+                settings["port"],
+                timeout=settings["timeout"],
+                context=ssl.create_default_context(),
+            )
+        else:
+            server = smtplib.SMTP(
+                settings["host"], settings["port"], timeout=settings["timeout"]
+            )
+        try:
+            if settings["login"]:
+                server.login(user, password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self._credentials = (user, password)
+        self._last_used = time.monotonic()
+
+    def close(self):
+        """Close the connection (the next send reconnects)."""
+        with self._lock:
+            if self._server is None:
+                return
+            try:
+                self._server.quit()
+            except Exception:
+                self._server.close()
+            self._server = None
+
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_smtp_session():
+    """The process-wide SMTPSession"""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = SMTPSession()
+        return _SESSION
+
+
+def close_smtp_session():
+    """Close the shared SMTP connection (called on application exit)."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
+
+
+def _sender():
+    """
     Returns:
-        dict: {"success": bool, "message": str}
+        tuple: (user, password) or None when no account is configured
     """
-    email_id = "691128287956cc411169ab56"
-    email_account_data = CONFIG_COLLECTION.find_one({"_id": ObjectId(email_id)})
+    user, password = get_email_account()
+    if not get_email_settings()["login"]:
+        return user or DEBUG_SENDER, None
+    if not user or not password:
+        return None
+    return user, password
 
-    EMAIL_USER = email_account_data.get("email")
-    EMAIL_PASSWORD = email_account_data.get("password")  # Must be App Password
 
-    if not EMAIL_USER or not EMAIL_PASSWORD:
-        print("\n*** WARNING: EMAIL_USER or EMAIL_PASSWORD not set in .env.")
-        print(f"*** Email not sent to {email}.")
-        print(f"*** New password (for testing): {new_password}\n")
-        return {
-            "success": False,
-            "message": "Email configuration not set. Password not sent.",
-            "password": new_password,  # For testing only
-        }
+PASSWORD_RESET_SUBJECT = "New Password for Student Management System"
 
-    # Create email content
-    msg = EmailMessage()
-    msg.set_content(
-        f"""
+
+def password_reset_body(username, new_password):
+    """Text of the email carrying a new password"""
+    return f"""
 Hello {username},
 
 Your password reset request has been processed.
@@ -58,17 +200,60 @@ Please login and do not share this password with anyone.
 Best regards,
 Student Management System
     """
+
+
+def build_message(sender, to, subject, body):
+    msg = EmailMessage()
+    msg.set_content(body)
+    msg["Subject"] = subject
+    msg["From"] = sender
+    msg["To"] = to
+    return msg
+
+
+def send_email(to, subject, body):
+    """
+    Send one email over the shared SMTP connection.
+
+    Returns:
+        dict: {"success": bool, "message": str}
+    """
+    sender = _sender()
+    if sender is None:
+        return {"success": False, "message": "Email configuration not set"}
+    try:
+        get_smtp_session().send(build_message(sender[0], to, subject, body), *sender)
+        return {"success": True, "message": f"Email sent to {to}"}
+    except Exception as e:
+        print(f"ERROR sending email to {to}: {e}")
+        return {"success": False, "message": f"Failed to send email: {str(e)}"}
+
+
+def send_password_reset_email(email, username, new_password):
+    """
+    Send email containing new password to user.
+
+    Returns:
+        dict: {"success": bool, "message": str}
+    """
+    sender = _sender()
+    if sender is None:
+        print("\n*** WARNING: EMAIL_USER or EMAIL_PASSWORD not set in .env.")
+        print(f"*** Email not sent to {email}.")
+        print(f"*** New password (for testing): {new_password}\n")
+        return {
+            "success": False,
+            "message": "Email configuration not set. Password not sent.",
+            "password": new_password,  # For testing only
+        }
+
+    user, password = sender
+    msg = build_message(
+        user, email, PASSWORD_RESET_SUBJECT, password_reset_body(username, new_password)
     )
-    msg["Subject"] = "New Password for Student Management System"
-    msg["From"] = EMAIL_USER
-    msg["To"] = email
 
     try:
-        # Send email via Gmail (using SSL)
-        context = ssl.create_default_context()
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=context) as server:
-            server.login(EMAIL_USER, EMAIL_PASSWORD)
-            server.send_message(msg)
+        get_smtp_session().send(msg, user, password)
 
         print(f"New password sent to {email}")
         return {"success": True, "message": f"New password sent to {email}"}
@@ -80,3 +265,32 @@ Student Management System
             "message": f"Failed to send email: {str(e)}",
             "password": new_password,  # For debugging
         }
+
+
+def send_bulk_emails(messages):
+    """
+    Send many emails over the shared SMTP connection.
+
+    Args:
+        messages (iterable): dicts {"to": str, "subject": str, "body": str}
+
+    Returns:
+        dict: {
+            "success": bool (every email sent),
+            "sent": int,
+            "failed": int,
+            "results": [{"to": str, "success": bool, "message": str}]
+        }
+    """
+    results = []
+    for message in messages:
+        result = send_email(message["to"], message["subject"], message["body"])
+        results.append({"to": message["to"], **result})
+
+    sent = sum(1 for result in results if result["success"])
+    return {
+        "success": sent == len(results),
+        "sent": sent,
+        "failed": len(results) - sent,
+        "results": results,
+    }
@@ -0,0 +1,126 @@
+"""
+Import-time report for application startup (`python -X importtime`).
+
+Runs `import main` (or another module) in a fresh interpreter with
+-X importtime, then prints the total import time and the slowest modules.
+With --budget-ms it works as a startup benchmark: the exit status is 1 when
+the imports take longer than the budget, so a build can fail before a slow
+import (e.g. a view module pulled back into main.py) ships in the packaged
+executable. CI runs it against STARTUP_BUDGET_MS (.github/workflows/ci.yaml).
+
+Usage (from src/):
+    python -m utils.import_report                   # report for main.py
+    python -m utils.import_report --top 30
+    python -m utils.import_report --module views.admin.fee_management
+    python -m utils.import_report --budget-ms       # exit 1 when over budget
+    python -m utils.import_report --runs 3 --budget-ms 1200
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Every line written by -X importtime starts with this (times in microseconds)
+PREFIX = "import time:"
+
+# Import time allowed for `import main` when --budget-ms is given no value
+STARTUP_BUDGET_MS = 1500.0
+
+
+def parse_importtime(output):
+    """
+    Parse -X importtime output.
+
+    Returns:
+        list: (module, self_us, cumulative_us) in import order
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith(PREFIX):
+            continue
+        fields = line[len(PREFIX) :].split("|")
+        if len(fields) != 3:
+            continue
+        self_us, cumulative_us, module = fields
+        try:
+            entries.append((module.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue  # the header line
+    return entries
+
+
+def measure(module="main", python=sys.executable, cwd=None, runs=1):
+    """
+    Import `module` in a fresh interpreter and return its parsed
+    -X importtime entries. With runs > 1 the fastest run is kept (the first
+    run of a fresh checkout also compiles the .pyc files).
+    """
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best = None
+    for _ in range(max(runs, 1)):
+        result = subprocess.run(
+            [python, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            last_line = (result.stderr.strip().splitlines() or [""])[-1]
+            raise RuntimeError(f"import {module} failed: {last_line}")
+        entries = parse_importtime(result.stderr)
+        if best is None or total_ms(entries) < total_ms(best):
+            best = entries
+    return best
+
+
+def total_ms(entries):
+    """Wall time of all imports (sum of the self times) in milliseconds"""
+    return sum(self_us for _module, self_us, _cumulative in entries) / 1000
+
+
+def format_report(entries, top=15):
+    """Total import time followed by the `top` slowest modules (cumulative)"""
+    lines = [f"Total import time: {total_ms(entries):.1f} ms ({len(entries)} modules)"]
+    slowest = sorted(entries, key=lambda entry: entry[2], reverse=True)[:top]
+    lines.append(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for module, self_us, cumulative_us in slowest:
+        lines.append(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report module import times.")
+    parser.add_argument("--module", default="main", help="module to import")
+    parser.add_argument("--top", type=int, default=15, help="modules to list")
+    parser.add_argument(
+        "--runs", type=int, default=1, help="keep the fastest of this many runs"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        nargs="?",
+        const=STARTUP_BUDGET_MS,
+        help="exit with status 1 when the total import time exceeds this "
+        f"(default {STARTUP_BUDGET_MS:.0f})",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        entries = measure(args.module, runs=args.runs)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(format_report(entries, top=args.top))
+    if args.budget_ms is not None:
+        elapsed = total_ms(entries)
+        if elapsed > args.budget_ms:
+            print(f"❌ Import time {elapsed:.1f} ms exceeds {args.budget_ms:.0f} ms")
+            return 1
+        print(f"✅ Import time within {args.budget_ms:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Startup pipeline: runs slow startup phases (database connection, data
+prefetch, index bootstrap) on a worker thread while the Tk window is already
+visible, and hands each result back to the Tk thread.
+"""
+
+import queue
+import threading
+import time
+
+
+class StartupPipeline:
+    """
+    Run phases in order on a background thread.
+
+    Tkinter is not thread-safe, so callbacks are never invoked from the worker:
+    results are put on a queue that the Tk thread drains with root.after().
+    If a phase fails, the remaining phases are skipped and their on_error
+    callbacks receive the error.
+    """
+
+    def __init__(self, root, name="startup", poll_interval_ms=50):
+        self.root = root
+        self.name = name
+        self.poll_interval_ms = poll_interval_ms
+        self.timings = {}
+        self._phases = []
+        self._results = queue.Queue()
+        self._started_at = None
+
+    def add_phase(self, name, func, on_done=None, on_error=None):
+        """
+        Register a phase.
+
+        Args:
+            name (str): Name used in the timing log
+            func (callable): Runs on the worker thread, its return value is
+                passed to on_done
+            on_done (callable): Called on the Tk thread with the result
+            on_error (callable): Called on the Tk thread with the exception
+        """
+        self._phases.append((name, func, on_done, on_error))
+        return self
+
+    def start(self):
+        """Start the worker thread and begin polling for results."""
+        self._started_at = time.perf_counter()
+        worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+        worker.start()
+        self.root.after(self.poll_interval_ms, self._poll)
+
+    def _run(self):
+        failure = None
+        for name, func, on_done, on_error in self._phases:
+            if failure is not None:
+                print(f"⏱ [{self.name}] '{name}' skipped")
+                self._results.put((on_error, failure))
+                continue
+
+            started = time.perf_counter()
+            try:
+                result = func()
+            except Exception as e:
+                failure = e
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.timings[name] = elapsed_ms
+
+            if failure is not None:
+                print(f"⏱ [{self.name}] '{name}' failed after {elapsed_ms:.0f} ms")
+                print(f"❌ {failure}")
+                self._results.put((on_error, failure))
+            else:
+                print(f"⏱ [{self.name}] '{name}' took {elapsed_ms:.0f} ms")
+                self._results.put((on_done, result))
+
+        total_ms = (time.perf_counter() - self._started_at) * 1000
+        print(f"⏱ [{self.name}] finished in {total_ms:.0f} ms")
+        self._results.put(None)
+
+    def _poll(self):
+        """Drain finished phases on the Tk thread."""
+        while True:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return
+            callback, value = item
+            if callback is not None:
+                try:
+                    callback(value)
+                except Exception as e:
+                    print(f"Error in {self.name} callback: {e}")
+
+        self.root.after(self.poll_interval_ms, self._poll)
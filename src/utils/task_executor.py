@@ -0,0 +1,165 @@
+"""
+UI-safe background task executor.
+
+Views submit controller calls here instead of calling them on the Tk thread.
+Work runs on a small thread pool; results are queued and delivered back on
+the Tk thread (root.after polling), because Tkinter widgets must only be
+touched from the thread running mainloop.
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskHandle:
+    """Handle returned by TaskExecutor.submit, used to cancel a task."""
+
+    def __init__(self):
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Drop the task's callbacks. A task that has not started yet is not run
+        at all; one already running finishes but its result is discarded.
+        """
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class TaskExecutor:
+    """
+    Thread pool whose results are delivered on the Tk thread.
+
+    Args:
+        root: Tk root (or any widget) used for after() polling
+        max_workers (int): Worker threads
+        poll_interval_ms (int): How often finished tasks are collected
+        on_busy_change (callable): Called on the Tk thread with True when the
+            first task starts and False when no task is left (busy indicator)
+    """
+
+    def __init__(self, root, max_workers=4, poll_interval_ms=30, on_busy_change=None):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self.on_busy_change = on_busy_change
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ui-task"
+        )
+        self._results = queue.Queue()
+        self._pending = set()  # only touched on the Tk thread
+        self._polling = False
+        self._busy = False
+
+    def submit(self, func, *args, on_success=None, on_error=None, **kwargs):
+        """
+        Run func(*args, **kwargs) on a worker thread.
+
+        Args:
+            on_success (callable): Called on the Tk thread with the result
+            on_error (callable): Called on the Tk thread with the exception
+                (defaults to printing it)
+
+        Returns:
+            TaskHandle
+        """
+        handle = TaskHandle()
+        self._pending.add(handle)
+        handle.future = self._pool.submit(func, *args, **kwargs)
+        handle.future.add_done_callback(
+            lambda future: self._results.put((handle, on_success, on_error))
+        )
+        self._update_busy()
+        self._ensure_polling()
+        return handle
+
+    def cancel_all(self):
+        """Cancel every pending task (e.g. when the user navigates away)."""
+        for handle in list(self._pending):
+            handle.cancel()
+        self._update_busy()
+
+    @property
+    def busy(self):
+        return self._busy
+
+    def shutdown(self):
+        """Cancel pending work and stop the worker threads."""
+        self.cancel_all()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval_ms, self._poll)
+
+    def _poll(self):
+        """Deliver finished tasks on the Tk thread."""
+        while True:
+            try:
+                handle, on_success, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            self._pending.discard(handle)
+            if handle.cancelled or handle.future.cancelled():
+                continue
+
+            error = handle.future.exception()
+            try:
+                if error is not None:
+                    if on_error is not None:
+                        on_error(error)
+                    else:
+                        print(f"Background task failed: {error}")
+                elif on_success is not None:
+                    on_success(handle.future.result())
+            except Exception as e:
+                print(f"Error in background task callback: {e}")
+
+        self._update_busy()
+        if self._pending:
+            self.root.after(self.poll_interval_ms, self._poll)
+        else:
+            self._polling = False
+
+    def _update_busy(self):
+        busy = any(not handle.cancelled for handle in self._pending)
+        if busy != self._busy:
+            self._busy = busy
+            if self.on_busy_change is not None:
+                try:
+                    self.on_busy_change(busy)
+                except Exception as e:
+                    print(f"Error updating busy indicator: {e}")
+
+
+def run_task(executor, func, *args, on_success=None, on_error=None, **kwargs):
+    """
+    Submit func to executor, or run it synchronously when a view is used
+    without one (e.g. the standalone `__main__` demos).
+
+    Returns:
+        TaskHandle or None
+    """
+    if executor is not None:
+        return executor.submit(
+            func, *args, on_success=on_success, on_error=on_error, **kwargs
+        )
+
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        if on_error is not None:
+            on_error(e)
+        else:
+            print(f"Task failed: {e}")
+        return None
+    if on_success is not None:
+        on_success(result)
+    return None
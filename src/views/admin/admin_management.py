@@ -1,5 +1,7 @@
 import customtkinter as ctk
-from tkinter import ttk
+
+from utils.task_executor import run_task
+from views.virtual_table import VirtualTable
 
 
 class AdminManagement:
@@ -12,12 +14,18 @@ class AdminManagement:
     """
 
     def __init__(
-        self, parent, back_callback, admin_controller=None, auth_controller=None
+        self,
+        parent,
+        back_callback,
+        admin_controller=None,
+        auth_controller=None,
+        task_executor=None,
     ):
         self.parent = parent
         self.back_callback = back_callback
         self.admin_controller = admin_controller
         self.auth_controller = auth_controller
+        self.task_executor = task_executor
 
         # Visual theme (keep consistent with other views)
         ctk.set_appearance_mode("light")
@@ -66,32 +74,6 @@ class AdminManagement:
         )
         table_container.pack(fill="both", expand=True, padx=60, pady=(0, 30))
 
-        # Treeview styling (consistent with Student management)
-        style = ttk.Style()
-        style.theme_use("default")
-        style.configure(
-            "Treeview",
-            background="white",
-            foreground="black",
-            rowheight=30,
-            fieldbackground="white",
-            font=("Arial", 11),
-        )
-        style.configure(
-            "Treeview.Heading",
-            background="#F0F0F0",
-            foreground="black",
-            font=("Arial", 12, "bold"),
-        )
-        style.map("Treeview", background=[("selected", "#0078D7")])
-
-        # Frame for treeview + scrollbar
-        tree_frame = ctk.CTkFrame(table_container, fg_color="white")
-        tree_frame.pack(fill="both", expand=True, padx=2, pady=2)
-
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side="right", fill="y")
-
         # Columns for admins (kept compact)
         columns = (
             "AdminID",
@@ -103,21 +85,13 @@ class AdminManagement:
             "CreatedAt",
         )
 
-        self.tree = ttk.Treeview(
-            tree_frame,
-            columns=columns,
-            show="headings",
-            yscrollcommand=scrollbar.set,
-            height=12,
+        # Only the rows on screen are materialised as Treeview items
+        self.table = VirtualTable(
+            table_container,
+            columns,
+            column_options={col: {"width": 140} for col in columns},
+            task_executor=self.task_executor,
         )
-        scrollbar.config(command=self.tree.yview)
-
-        for col in columns:
-            self.tree.heading(col, text=col)
-            # set a reasonable width
-            self.tree.column(col, width=140, minwidth=100, anchor="w")
-
-        self.tree.pack(fill="both", expand=True)
 
         # Load admins
         self.load_admins_from_controller()
@@ -141,24 +115,33 @@ class AdminManagement:
         refresh_btn.pack(side="left", padx=(20, 20))
 
         # Double-click => open detail
-        self.tree.bind("<Double-1>", self.on_double_click)
+        self.table.bind("<Double-1>", self.on_double_click)
 
     def load_admins_from_controller(self):
-        """Load admin accounts from controller into treeview"""
+        """Load admin accounts from controller into the table"""
         print("Refreshed admin management view!")
-        # clear existing
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        if not self.admin_controller:
+            # no controller -> load sample data
+            self.load_sample_data()
+            return
 
-        try:
-            if not self.admin_controller:
-                # no controller -> load sample data
-                self.load_sample_data()
-                return
+        def on_error(e):
+            print(f"✗ Error loading admins: {e}")
+            self.load_sample_data()
+
+        run_task(
+            self.task_executor,
+            self.admin_controller.get_all_admins,
+            on_success=self._show_admins,
+            on_error=on_error,
+        )
 
-            res = self.admin_controller.get_all_admins()
+    def _show_admins(self, res):
+        """Fill the table with the admins returned by the controller"""
+        try:
             if res.get("success"):
                 admins = res.get("admins", [])
+                rows = []
                 for admin in admins:
                     created_at = admin.get("createAt") or admin.get("createdAt") or ""
                     # normalize datetime if necessary
@@ -173,7 +156,8 @@ class AdminManagement:
                         admin.get("contact", ""),
                         created_at,
                     )
-                    self.tree.insert("", "end", values=values)
+                    rows.append(values)
+                self.table.set_rows(rows)
                 return
 
             # failed -> sample fallback
@@ -205,22 +189,19 @@ class AdminManagement:
                 "2024-03-15",
             ),
         ]
-        for row in sample_admins:
-            self.tree.insert("", "end", values=row)
+        self.table.set_rows(sample_admins)
 
     def on_double_click(self, event):
-        item = self.tree.selection()
-        if item:
+        if self.table.selected_row():
             self.open_selected_detail()
 
     def open_selected_detail(self):
         """Open detail modal for selected admin"""
-        sel = self.tree.selection()
-        if not sel:
+        values = self.table.selected_row()
+        if not values:
             self.show_error_dialog("Please select an admin to view details.")
             return
 
-        values = self.tree.item(sel[0])["values"]
         admin_id = values[0]
 
         # Fetch detail from controller if available
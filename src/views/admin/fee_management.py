@@ -1,8 +1,9 @@
 import customtkinter as ctk
-from tkinter import ttk
 from controllers.student_controller import StudentController
 from controllers.auth_controller import AuthController
 from controllers.fee_controller import FeeController
+from utils.task_executor import run_task
+from views.virtual_table import VirtualTable
 from datetime import datetime
 
 
@@ -14,12 +15,14 @@ class FeeManagement:
         student_controller: StudentController,
         auth_controller: AuthController,
         fee_controller: FeeController,
+        task_executor=None,
     ):
         self.parent = parent
         self.back_callback = back_callback
         self.student_controller = student_controller
         self.auth_controller = auth_controller
         self.fee_controller = fee_controller
+        self.task_executor = task_executor
 
         ctk.set_appearance_mode("light")
         ctk.set_default_color_theme("green")
@@ -64,11 +67,6 @@ class FeeManagement:
             border_color="black",
         )
         table_container.pack(fill="both", expand=True, padx=60, pady=(0, 30))
-        tree_frame = ctk.CTkFrame(table_container, fg_color="white")
-        tree_frame.pack(fill="both", expand=True, padx=2, pady=2)
-
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side="right", fill="y")
 
         columns = (
             "FeeID",
@@ -79,19 +77,10 @@ class FeeManagement:
             "Period",
             "Status",
         )
-        self.tree = ttk.Treeview(
-            tree_frame,
-            columns=columns,
-            show="headings",
-            yscrollcommand=scrollbar.set,
-            height=12,
+        # Only the rows on screen are materialised as Treeview items
+        self.table = VirtualTable(
+            table_container, columns, task_executor=self.task_executor
         )
-        scrollbar.config(command=self.tree.yview)
-
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=120, minwidth=100, anchor="w")
-        self.tree.pack(fill="both", expand=True)
 
         # Buttons
         buttons_frame = ctk.CTkFrame(main_frame, fg_color="white")
@@ -146,11 +135,11 @@ class FeeManagement:
             width=200,
             height=60,
             corner_radius=12,
-            command=self.load_fees(),
+            command=self.load_fees,
         )
         refresh_btn.pack(side="left", padx=(0, 20))
 
-        self.tree.bind("<Double-1>", self.on_double_click)
+        self.table.bind("<Double-1>", self.on_double_click)
 
         self.load_fees()
 
@@ -163,37 +152,72 @@ class FeeManagement:
 
     # Load fees
     def load_fees(self):
-        self.tree.delete(*self.tree.get_children())
-        result = self.fee_controller.get_all_fees()
+        run_task(
+            self.task_executor,
+            self._fetch_fees,
+            on_success=self._show_fees,
+            on_error=lambda e: print(f"Error loading fees: {e}"),
+        )
+
+    def _fetch_fees(self):
+        """
+        Fees joined with their student's username (runs on the executor):
+        one $lookup aggregation, or when the server rejects it one fee query
+        plus one bulk username lookup - never one query per fee.
+        """
+        result = self.fee_controller.get_all_fees_with_usernames()
         if result["success"]:
-            for fee in result["fees"]:
-                student_username = self.student_controller.get_student_by_id(
-                    fee.student_id
-                )["student"]["username"]
-                due_date_str = (
-                    fee.dueDate.strftime("%d/%m/%Y")
-                    if hasattr(fee.dueDate, "strftime")
-                    else fee.dueDate
-                )
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        str(fee._id),
-                        fee.description,
-                        fee.amount,
-                        student_username,
-                        due_date_str,
-                        fee.period,
-                        fee.status,
-                    ),
+            return result
+
+        fees = self.fee_controller.get_all_fees()["fees"]
+        usernames = self.student_controller.get_usernames_by_ids(
+            fee.student_id for fee in fees
+        )["usernames"]
+        rows = [
+            {
+                "_id": str(fee._id),
+                "description": fee.description,
+                "amount": fee.amount,
+                "student_id": str(fee.student_id) if fee.student_id else None,
+                "student_username": usernames.get(str(fee.student_id), ""),
+                "dueDate": fee.dueDate,
+                "period": fee.period,
+                "status": fee.status,
+            }
+            for fee in fees
+        ]
+        return {"success": True, "fees": rows, "count": len(rows)}
+
+    def _show_fees(self, result):
+        if not result["success"]:
+            self.table.clear()
+            return
+        rows = []
+        for fee in result["fees"]:
+            due_date = fee["dueDate"]
+            due_date_str = (
+                due_date.strftime("%d/%m/%Y")
+                if hasattr(due_date, "strftime")
+                else due_date
+            )
+            rows.append(
+                (
+                    fee["_id"],
+                    fee["description"],
+                    fee["amount"],
+                    fee["student_username"],
+                    due_date_str,
+                    fee["period"],
+                    fee["status"],
                 )
+            )
+        self.table.set_rows(rows)
 
     # Double-click edit
     def on_double_click(self, event):
-        item = self.tree.selection()
-        if item:
-            self.open_edit_fee_dialog(item[0], self.tree.item(item[0])["values"])
+        values = self.table.selected_row()
+        if values:
+            self.open_edit_fee_dialog(values[0], values)
 
     def add_fee_dialog(self):
         """Popup to add a new fee"""
@@ -275,26 +299,43 @@ class FeeManagement:
 
     def add_fee(self, dialog, entries, month_var, year_var):
         try:
-            period = f"{month_var.get()} {year_var.get()}"
-            student_id = self.student_controller.get_student_id_by_username(
-                entries["StudentUsername"].get()
-            )
-            fee = self.fee_controller.create_fee(
-                description=entries["Description"].get().strip(),
-                amount=float(entries["Amount"].get().strip()),
-                student_id=student_id,
-                dueDate=datetime.strptime(entries["DueDate"].get().strip(), "%d/%m/%Y"),
-                period=period,
-            )
-            fee.save()
-            self.load_fees()
-            dialog.destroy()
-            self.show_success_dialog("Fee added successfully!")
+            username = entries["StudentUsername"].get()
+            data = {
+                "description": entries["Description"].get().strip(),
+                "amount": float(entries["Amount"].get().strip()),
+                "dueDate": datetime.strptime(
+                    entries["DueDate"].get().strip(), "%d/%m/%Y"
+                ),
+                "period": f"{month_var.get()} {year_var.get()}",
+            }
         except Exception as e:
             self.show_error_dialog(str(e))
+            return
+        run_task(
+            self.task_executor,
+            self._create_fee,
+            username,
+            data,
+            on_success=lambda _: self._on_fee_changed(
+                "Fee added successfully!", dialog
+            ),
+            on_error=lambda e: self.show_error_dialog(str(e)),
+        )
+
+    def _create_fee(self, username, data):
+        """Resolve the student and insert the fee (runs on the executor)"""
+        student_id = self.student_controller.get_student_id_by_username(username)
+        fee = self.fee_controller.create_fee(student_id=student_id, **data)
+        fee.save()
+
+    def _on_fee_changed(self, message, dialog=None):
+        self.load_fees()
+        if dialog is not None:
+            dialog.destroy()
+        self.show_success_dialog(message)
 
     # Edit Fee dialog
-    def open_edit_fee_dialog(self, tree_item, fee_values):
+    def open_edit_fee_dialog(self, row_key, fee_values):
         dialog = ctk.CTkToplevel(self.parent)
         dialog.title("Edit Fee")
         dialog.geometry("500x450")
@@ -304,18 +345,9 @@ class FeeManagement:
         fields = ["Description", "Amount", "StudentUsername", "DueDate"]
         entries = {}
 
-        # fee_values layout: [FeeID, Description, Amount, StudentID, DueDate, Period, Status]
-        # fee_values[3] is expected to be the StudentID (string)
-        current_student_id_str = str(fee_values[3])
-
-        # Try to find the current student's username (fallback to raw id)
-        current_username = None
-        try:
-            res = self.student_controller.get_student_by_id(current_student_id_str)
-            if res.get("success") and res.get("student"):
-                current_username = res["student"].get("username")
-        except Exception:
-            current_username = None
+        # fee_values layout: [FeeID, Description, Amount, StudentUsername, DueDate, Period, Status]
+        # load_fees already resolved the username, so no lookup is needed here
+        current_username = str(fee_values[3])
 
         # get usernames list (ensure it's a list of strings)
         usernames_res = self.student_controller.get_all_usernames()
@@ -407,73 +439,99 @@ class FeeManagement:
             text="Save",
             width=120,
             command=lambda: self.save_fee_edit(
-                dialog, tree_item, entries, fee_values[0], month_var, year_var
+                dialog, row_key, entries, fee_values[0], month_var, year_var
             ),
         ).pack(side="left", padx=10)
         ctk.CTkButton(btn_frame, text="Cancel", width=120, command=dialog.destroy).pack(
             side="left", padx=10
         )
 
-    def save_fee_edit(self, dialog, tree_item, entries, fee_id, month_var, year_var):
-        # find fee object from controller
-        fee = self.fee_controller.find_by_id(fee_id)
-        if not fee:
-            self.show_error_dialog("Fee not found!")
-            return
+    def save_fee_edit(self, dialog, row_key, entries, fee_id, month_var, year_var):
         try:
-            fee.description = entries["Description"].get().strip()
-            fee.amount = float(entries["Amount"].get().strip())
-
             # get username from the StringVar (OptionMenu)
-            selected_username = entries["StudentUsername"].get()
-            # Convert to student id using controller
-            try:
-                student_obj_id = self.student_controller.get_student_id_by_username(
-                    selected_username
-                )
-            except Exception as e:
-                raise ValueError(f"Cannot resolve student username -> id: {e}")
-
-            fee.student_id = student_obj_id
-            # parse due date in DD/MM/YYYY (you use that format across app)
-            fee.dueDate = datetime.strptime(
-                entries["DueDate"].get().strip(), "%d/%m/%Y"
-            )
-            fee.period = f"{month_var.get()} {year_var.get()}"
-
-            fee.save()
-            self.load_fees()
-            dialog.destroy()
-            self.show_success_dialog("Fee updated successfully!")
+            username = entries["StudentUsername"].get()
+            data = {
+                "description": entries["Description"].get().strip(),
+                "amount": float(entries["Amount"].get().strip()),
+                # parse due date in DD/MM/YYYY (you use that format across app)
+                "dueDate": datetime.strptime(
+                    entries["DueDate"].get().strip(), "%d/%m/%Y"
+                ),
+                "period": f"{month_var.get()} {year_var.get()}",
+            }
         except Exception as e:
             # provide a helpful message instead of raw tkinter error
             self.show_error_dialog(f"Failed to update fee: {e}")
+            return
+        run_task(
+            self.task_executor,
+            self._update_fee,
+            fee_id,
+            username,
+            data,
+            on_success=lambda _: self._on_fee_changed(
+                "Fee updated successfully!", dialog
+            ),
+            on_error=lambda e: self.show_error_dialog(f"Failed to update fee: {e}"),
+        )
+
+    def _update_fee(self, fee_id, username, data):
+        """Load, change and save the fee (runs on the executor)"""
+        fee = self.fee_controller.find_by_id(fee_id)
+        if not fee:
+            raise LookupError("Fee not found!")
+        # Convert to student id using controller
+        try:
+            fee.student_id = self.student_controller.get_student_id_by_username(
+                username
+            )
+        except Exception as e:
+            raise ValueError(f"Cannot resolve student username -> id: {e}")
+        for field, value in data.items():
+            setattr(fee, field, value)
+        fee.save()
 
     # Delete
     def delete_fee(self):
-        item = self.tree.selection()
-        if not item:
+        values = self.table.selected_row()
+        if not values:
             self.show_error_dialog("Select a fee to delete!")
             return
-        fee_id = self.tree.item(item[0])["values"][0]
-        fee = self.fee_controller.find_by_id(fee_id)
-        if fee:
-            fee.delete()
-            self.load_fees()
-            self.show_success_dialog("Fee deleted successfully!")
+        run_task(
+            self.task_executor,
+            self.fee_controller.delete_fee,
+            values[0],
+            on_success=lambda result: (
+                self._on_fee_changed("Fee deleted successfully!")
+                if result["success"]
+                else self.show_error_dialog(result["message"])
+            ),
+            on_error=lambda e: self.show_error_dialog(str(e)),
+        )
 
     # Mark Paid
     def mark_fee_paid(self):
-        item = self.tree.selection()
-        if not item:
+        values = self.table.selected_row()
+        if not values:
             self.show_error_dialog("Select a fee to mark as paid!")
             return
-        fee_id = self.tree.item(item[0])["values"][0]
+        run_task(
+            self.task_executor,
+            self._mark_fee_paid,
+            values[0],
+            on_success=lambda paid: (
+                self._on_fee_changed("Fee marked as paid!") if paid else None
+            ),
+            on_error=lambda e: self.show_error_dialog(str(e)),
+        )
+
+    def _mark_fee_paid(self, fee_id):
+        """Runs on the executor; False when the fee no longer exists"""
         fee = self.fee_controller.find_by_id(fee_id)
-        if fee:
-            fee.markPaid()
-            self.load_fees()
-            self.show_success_dialog("Fee marked as paid!")
+        if not fee:
+            return False
+        fee.markPaid()
+        return True
 
     # Dialog helpers
     def show_success_dialog(self, message):
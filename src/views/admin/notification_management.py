@@ -1,10 +1,11 @@
 # notification_management.py
 import customtkinter as ctk
-from tkinter import ttk
 from bson.objectid import ObjectId
 
 from controllers.notifications_controller import NotificationsController
 from controllers.auth_controller import AuthController
+from utils.task_executor import run_task
+from views.virtual_table import VirtualTable
 
 
 class NotificationManagement:
@@ -14,11 +15,13 @@ class NotificationManagement:
         back_callback,
         notifications_controller: NotificationsController,
         auth_controller: AuthController,  # optional; used to prefill admin id if available
+        task_executor=None,
     ):
         self.parent = parent
         self.back_callback = back_callback
         self.notifications_controller = notifications_controller
         self.auth_controller = auth_controller
+        self.task_executor = task_executor
 
         ctk.set_appearance_mode("light")
         ctk.set_default_color_theme("green")
@@ -65,12 +68,6 @@ class NotificationManagement:
         )
         table_container.pack(fill="both", expand=True, padx=60, pady=(0, 30))
 
-        tree_frame = ctk.CTkFrame(table_container, fg_color="white")
-        tree_frame.pack(fill="both", expand=True, padx=2, pady=2)
-
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side="right", fill="y")
-
         columns = (
             "AnnouncementID",
             "Title",
@@ -79,31 +76,21 @@ class NotificationManagement:
             "Status",
             "CreatedAt",
         )
-        self.tree = ttk.Treeview(
-            tree_frame,
-            columns=columns,
-            show="headings",
-            yscrollcommand=scrollbar.set,
-            height=12,
+        # Only the rows on screen are materialised as Treeview items
+        self.table = VirtualTable(
+            table_container,
+            columns,
+            headings={"ContentPreview": "Content (preview)"},
+            column_options={
+                "AnnouncementID": {"width": 160, "minwidth": 120},
+                "Title": {"width": 220, "minwidth": 150},
+                "ContentPreview": {"width": 420, "minwidth": 200},
+                "CreatedBy": {"width": 160, "minwidth": 120},
+                "Status": {"width": 120, "minwidth": 80},
+                "CreatedAt": {"width": 160, "minwidth": 120},
+            },
+            task_executor=self.task_executor,
         )
-        scrollbar.config(command=self.tree.yview)
-
-        # heading & column sizing
-        self.tree.heading("AnnouncementID", text="AnnouncementID")
-        self.tree.heading("Title", text="Title")
-        self.tree.heading("ContentPreview", text="Content (preview)")
-        self.tree.heading("CreatedBy", text="CreatedBy")
-        self.tree.heading("Status", text="Status")
-        self.tree.heading("CreatedAt", text="CreatedAt")
-
-        self.tree.column("AnnouncementID", width=160, minwidth=120, anchor="w")
-        self.tree.column("Title", width=220, minwidth=150, anchor="w")
-        self.tree.column("ContentPreview", width=420, minwidth=200, anchor="w")
-        self.tree.column("CreatedBy", width=160, minwidth=120, anchor="w")
-        self.tree.column("Status", width=120, minwidth=80, anchor="w")
-        self.tree.column("CreatedAt", width=160, minwidth=120, anchor="w")
-
-        self.tree.pack(fill="both", expand=True)
 
         # Buttons
         buttons_frame = ctk.CTkFrame(main_frame, fg_color="white")
@@ -150,7 +137,7 @@ class NotificationManagement:
         refresh_btn.pack(side="left", padx=(0, 20))
 
         # double-click to view full announcement
-        self.tree.bind("<Double-1>", self.on_double_click)
+        self.table.bind("<Double-1>", self.on_double_click)
 
         # initial load
         self.load_notifications()
@@ -163,11 +150,19 @@ class NotificationManagement:
 
     def load_notifications(self):
         """Load announcements from controller. Handles lists of objects or dicts."""
-        # clear tree
-        self.tree.delete(*self.tree.get_children())
+        run_task(
+            self.task_executor,
+            # Summaries only: the full content is fetched on double-click
+            self.notifications_controller.get_announcement_summaries,
+            on_success=self._show_notifications,
+            on_error=lambda e: self.show_error_dialog(
+                f"Failed to load announcements: {e}"
+            ),
+        )
 
+    def _show_notifications(self, res):
+        rows = []
         try:
-            res = self.notifications_controller.student_view_all_notifications()
             anns = res
             # if controller returned a dict with key 'announcements' or 'data' or 'success'
             if isinstance(res, dict):
@@ -205,6 +200,8 @@ class NotificationManagement:
                     ann, "title", ann.get("title") if isinstance(ann, dict) else ""
                 )
                 content = getattr(
+                    ann, "preview", ann.get("preview") if isinstance(ann, dict) else ""
+                ) or getattr(
                     ann, "content", ann.get("content") if isinstance(ann, dict) else ""
                 )
                 created_by = getattr(
@@ -237,27 +234,35 @@ class NotificationManagement:
                 except Exception:
                     created_at_str = str(created_at)
 
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
+                rows.append(
+                    (
                         ann_id,
                         str(title),
                         self._preview_text(content, length=100),
                         str(created_by),
                         str(status),
                         created_at_str,
-                    ),
+                    )
                 )
         except Exception as e:
             self.show_error_dialog(f"Failed to load announcements: {e}")
+        self.table.set_rows(rows)
 
     def on_double_click(self, event):
-        item = self.tree.selection()
-        if not item:
+        values = self.table.selected_row()
+        if not values:
             return
-        ann_id = self.tree.item(item[0])["values"][0]
-        # Try to fetch the full announcement (best-effort)
+        # Fetch the full announcement off the UI thread
+        run_task(
+            self.task_executor,
+            self._fetch_full_announcement,
+            values[0],
+            on_success=lambda full_ann: self._show_full_announcement(values, full_ann),
+            on_error=lambda e: self._show_full_announcement(values, None),
+        )
+
+    def _fetch_full_announcement(self, ann_id):
+        """Try to fetch the full announcement (best-effort, on the executor)"""
         full_ann = None
         # 1) try controller.announcement_model.find_by_id if available
         try:
@@ -277,11 +282,12 @@ class NotificationManagement:
                         break
                     except Exception:
                         full_ann = None
+        return full_ann
 
-        # 3) if still None, just show the values we have in the tree (preview)
+    def _show_full_announcement(self, values, full_ann):
+        # 3) if still None, just show the values we have in the table (preview)
         if not full_ann:
             # show preview dialog with what's in the row
-            values = self.tree.item(item[0])["values"]
             self.show_view_dialog(
                 title=str(values[1]),
                 content=f"(Full content unavailable)\n\nPreview:\n{values[2]}",
@@ -393,16 +399,25 @@ class NotificationManagement:
             self.show_error_dialog(f"Failed to post announcement: {e}")
 
     def delete_notification(self):
-        item = self.tree.selection()
-        if not item:
+        values = self.table.selected_row()
+        if not values:
             self.show_error_dialog("Select an announcement to delete!")
             return
-        ann_id = self.tree.item(item[0])["values"][0]
+        ann_id = values[0]
         if not ann_id:
             self.show_error_dialog("Cannot determine announcement id.")
             return
 
-        # Best-effort delete without asking for "DELETE" text
+        run_task(
+            self.task_executor,
+            self._delete_announcement,
+            ann_id,
+            on_success=self._on_announcement_deleted,
+            on_error=lambda e: self._on_announcement_deleted(False),
+        )
+
+    def _delete_announcement(self, ann_id):
+        """Best-effort delete without asking for "DELETE" text (on the executor)"""
         deleted = False
         # 1) try controller has a delete method
         try:
@@ -438,7 +453,9 @@ class NotificationManagement:
                                 break
             except Exception:
                 pass
+        return deleted
 
+    def _on_announcement_deleted(self, deleted):
         if deleted:
             self.load_notifications()
             self.show_success_dialog("Announcement deleted successfully!")
@@ -1,22 +1,37 @@
 import customtkinter as ctk
-from tkinter import ttk
 
 from controllers.student_controller import StudentController
 from controllers.auth_controller import AuthController
+from utils.task_executor import run_task
+from views.virtual_table import VirtualTable
 
 
 class StudentManagement:
+    # Editable table columns -> account fields (index in the row tuple)
+    COLUMN_FIELDS = {
+        3: "email",
+        4: "fullName",
+        5: "dob",
+        6: "gender",
+        7: "address",
+        8: "contact",
+        9: "major",
+        10: "imageURL",
+    }
+
     def __init__(
         self,
         parent,
         back_callback,
         student_controller: StudentController,
         auth_controller: AuthController,
+        task_executor=None,
     ):
         self.parent = parent
         self.back_callback = back_callback
         self.student_controller = student_controller  # Store controller reference
         self.auth_controller = auth_controller
+        self.task_executor = task_executor
 
         # Set theme
         ctk.set_appearance_mode("light")
@@ -58,6 +73,19 @@ class StudentManagement:
         )
         header_label.pack(side="left")
 
+        # Server-side search (username, email or full name prefix)
+        self.search_entry = ctk.CTkEntry(
+            header_frame,
+            width=320,
+            height=40,
+            font=ctk.CTkFont(family="Arial", size=16),
+            placeholder_text="Search username, email or name",
+        )
+        self.search_entry.pack(side="left", padx=(40, 0))
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)
+        self._search_job = None
+        self._load_generation = 0  # bumped per load so stale results are dropped
+
         # Table container with border
         table_container = ctk.CTkFrame(
             main_frame,
@@ -68,35 +96,6 @@ class StudentManagement:
         )
         table_container.pack(fill="both", expand=True, padx=60, pady=(0, 30))
 
-        # Create Treeview for table
-        style = ttk.Style()
-        style.theme_use("default")
-
-        # Configure Treeview colors
-        style.configure(
-            "Treeview",
-            background="white",
-            foreground="black",
-            rowheight=30,
-            fieldbackground="white",
-            font=("Arial", 11),
-        )
-        style.configure(
-            "Treeview.Heading",
-            background="#F0F0F0",
-            foreground="black",
-            font=("Arial", 12, "bold"),
-        )
-        style.map("Treeview", background=[("selected", "#0078D7")])
-
-        # Create frame for treeview and scrollbar
-        tree_frame = ctk.CTkFrame(table_container, fg_color="white")
-        tree_frame.pack(fill="both", expand=True, padx=2, pady=2)
-
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side="right", fill="y")
-
         # Define columns
         columns = (
             "StudentID",
@@ -112,28 +111,11 @@ class StudentManagement:
             "ImageURL",
         )
 
-        # Create Treeview
-        self.tree = ttk.Treeview(
-            tree_frame,
-            columns=columns,
-            show="headings",
-            yscrollcommand=scrollbar.set,
-            height=12,
+        # Only the rows on screen are materialised as Treeview items
+        self.table = VirtualTable(
+            table_container, columns, task_executor=self.task_executor
         )
 
-        # Configure scrollbar
-        scrollbar.config(command=self.tree.yview)
-
-        # Define headings
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=120, minwidth=100, anchor="w")
-
-        self.tree.pack(fill="both", expand=True)
-
-        # Load student data from controller
-        self.load_students_from_controller()
-
         # Buttons frame
         buttons_frame = ctk.CTkFrame(main_frame, fg_color="white")
         buttons_frame.pack(fill="x", padx=60, pady=(20, 40))
@@ -178,41 +160,99 @@ class StudentManagement:
             width=200,
             height=60,
             corner_radius=12,
-            command=self.load_students_from_controller(),
+            command=self.load_students_from_controller,
         )
         refresh_btn.pack(side="left", padx=(0, 20))
 
+        # Edited rows waiting for Save
+        self.unsaved_label = ctk.CTkLabel(
+            buttons_frame,
+            text="",
+            font=ctk.CTkFont(family="Arial", size=16, weight="bold"),
+            text_color="#FF7B7B",
+        )
+        self.unsaved_label.pack(side="left", padx=(0, 20))
+
         # Bind double-click to edit
-        self.tree.bind("<Double-1>", self.on_double_click)
+        self.table.bind("<Double-1>", self.on_double_click)
+
+        # Load student data from controller
+        self.load_students_from_controller()
+
+    # Wait this long after the last keystroke before searching
+    SEARCH_DELAY_MS = 300
+    # Matches shown for a search term
+    SEARCH_PAGE_SIZE = 200
 
     def load_students_from_controller(self):
-        """Load student data from student_controller"""
-        try:
-            # Get all students from controller
-            result = self.student_controller.get_all_students()
+        """
+        Load student rows from student_controller (off the UI thread): the
+        search matches when a search term is entered, otherwise every student
+        """
+        self._load_generation += 1
+        generation = self._load_generation
+        term = self.search_entry.get().strip()
+        if term:
+            task = (
+                self.student_controller.search_students,
+                term,
+                1,
+                self.SEARCH_PAGE_SIZE,
+            )
+        else:
+            task = (self.student_controller.get_student_rows,)
+        run_task(
+            self.task_executor,
+            *task,
+            on_success=lambda result: self._on_students_loaded(result, generation),
+            on_error=lambda e: print(f"✗ Error loading students from controller: {e}"),
+        )
+
+    def _on_search_key(self, event=None):
+        """Debounce typing: search once the user pauses"""
+        if self._search_job is not None:
+            self.search_entry.after_cancel(self._search_job)
+        self._search_job = self.search_entry.after(
+            self.SEARCH_DELAY_MS, self._run_search
+        )
 
+    def _run_search(self):
+        self._search_job = None
+        if self.table.dirty_rows():
+            # Replacing the rows would drop the edits
+            self.unsaved_label.configure(text="Save your changes before searching")
+            return
+        self.load_students_from_controller()
+
+    def _on_students_loaded(self, result, generation):
+        if generation != self._load_generation:
+            return  # a newer search or reload was started meanwhile
+        self._show_students(result)
+        if result.get("has_more"):
+            print(f"ℹ️ Showing the first {result['count']} matching students")
+
+    def _show_students(self, result):
+        """Fill the table with the StudentRows returned by the controller"""
+        try:
             if result["success"]:
-                # Clear existing data in treeview
-                for item in self.tree.get_children():
-                    self.tree.delete(item)
-
-                # Load students into treeview
-                for student in result["students"]:
-                    # Map student data to table columns
-                    values = (
-                        student.get("id", ""),  # StudentID (MongoDB _id)
-                        student.get("username", ""),  # Username
+                # Map student rows to table columns
+                self.table.set_rows(
+                    (
+                        str(row._id),  # StudentID (MongoDB _id)
+                        row.username,
                         "*******",  # Password
-                        student.get("email", ""),  # Email
-                        student.get("fullName", ""),  # FullName
-                        student.get("dob", ""),  # DOB
-                        student.get("gender", ""),  # Gender
-                        student.get("address", ""),  # Address
-                        student.get("contact", ""),  # Contact
-                        student.get("major", ""),  # Major
-                        student.get("imageURL", ""),  # ImageURL
+                        row.email,
+                        row.fullName,
+                        row.dob,
+                        row.gender,
+                        row.address,
+                        row.contact,
+                        row.major,
+                        row.imageURL,
                     )
-                    self.tree.insert("", "end", values=values)
+                    for row in result["rows"]
+                )
+                self._update_unsaved_label()
 
                 print(f"✓ Loaded {result['count']} students from database")
             else:
@@ -227,13 +267,12 @@ class StudentManagement:
 
     def on_double_click(self, event):
         """Handle double-click on table row"""
-        item = self.tree.selection()
-        if item:
-            values = self.tree.item(item[0])["values"]
-            # Open edit dialog or form
-            self.open_edit_dialog(item[0], values)  # Pass item reference too
+        values = self.table.selected_row()
+        if values:
+            # Open edit dialog or form (rows are keyed by StudentID)
+            self.open_edit_dialog(values[0], values)
 
-    def open_edit_dialog(self, tree_item, student_data):
+    def open_edit_dialog(self, row_key, student_data):
         """Open dialog to edit student information"""
         # Create a popup window
         dialog = ctk.CTkToplevel(self.parent)
@@ -277,9 +316,6 @@ class StudentManagement:
             if field in ["StudentID", "Username", "Password"]:
                 entry = ctk.CTkEntry(frame, width=350, state="readonly")
                 entry.insert(0, str(value))
-            elif field == "Contact":
-                entry = ctk.CTkEntry(frame, width=350)
-                entry.insert(0, f"0{str(value)}")
             else:
                 entry = ctk.CTkEntry(frame, width=350)
                 entry.insert(0, str(value))
@@ -295,60 +331,25 @@ class StudentManagement:
             btn_frame,
             text="Save",
             width=120,
-            command=lambda: self.save_edit(dialog, tree_item, entries, student_data[0]),
+            command=lambda: self.save_edit(dialog, row_key, entries, student_data[0]),
         ).pack(side="left", padx=10)
         ctk.CTkButton(btn_frame, text="Cancel", width=120, command=dialog.destroy).pack(
             side="left", padx=10
         )
 
-    def save_edit(self, dialog, tree_item, entries, student_id):
-        """Save edited student data to database"""
-        try:
-            # Get student from database
-            from models.account import Account
-
-            student = Account.find_by_id(student_id)
-
-            if not student:
-                self.show_error_dialog("Student not found in database")
-                return
-
-            # Prepare update data (skip ID, username, password)
-            updated_data = {
-                "email": entries["Email"].get().strip(),
-                "fullName": entries["FullName"].get().strip(),
-                "dob": entries["DOB"].get().strip(),
-                "gender": entries["Gender"].get().strip(),
-                "address": entries["Address"].get().strip(),
-                "contact": entries["Contact"].get().strip(),
-                "major": entries["Major"].get().strip(),
-            }
-
-            # Add imageURL if not empty
-            image_url = entries["ImageURL"].get().strip()
-            if image_url and image_url != "None":
-                updated_data["imageURL"] = image_url
-
-            # Remove empty values
-            updated_data = {k: v for k, v in updated_data.items() if v}
+    def save_edit(self, dialog, row_key, entries, student_id):
+        """
+        Apply the edit to the table. Edited rows are written together by
+        save_changes (the Save button).
+        """
+        values = [entry.get() for entry in entries.values()]
+        self.table.update_row(row_key, values)
+        self._update_unsaved_label()
+        dialog.destroy()
 
-            # Update in database
-            result = self.student_controller.update_student_profile(
-                student, updated_data
-            )
-
-            if result["success"]:
-                # Update treeview
-                values = [entry.get() for entry in entries.values()]
-                self.tree.item(tree_item, values=values)
-
-                dialog.destroy()
-                self.show_success_dialog("Student updated successfully!")
-            else:
-                self.show_error_dialog(result.get("message", "Update failed"))
-
-        except Exception as e:
-            self.show_error_dialog(f"Error: {str(e)}")
+    def _update_unsaved_label(self):
+        count = len(self.table.dirty_rows())
+        self.unsaved_label.configure(text=f"{count} unsaved change(s)" if count else "")
 
     def show_success_dialog(self, message):
         """Show success message"""
@@ -495,8 +496,8 @@ class StudentManagement:
             return
 
         # Check if username already exists
-        for item in self.tree.get_children():
-            existing_username = self.tree.item(item)["values"][1]
+        for row in self.table.rows():
+            existing_username = row[1]
             if existing_username == username:
                 error_dialog = ctk.CTkToplevel(dialog)
                 error_dialog.title("Error")
@@ -536,12 +537,24 @@ class StudentManagement:
             "",  # ImageURL (blank)
         ]
 
-        # Add to treeview
-        resigter_callback = self.student_controller.register_student_by_admin(
-            self.auth_controller.current_account, values[1], values[2]
+        # Register off the UI thread, then add to table
+        run_task(
+            self.task_executor,
+            self.student_controller.register_student_by_admin,
+            self.auth_controller.current_account,
+            values[1],
+            values[2],
+            on_success=lambda result: self._on_student_registered(
+                dialog, values, result
+            ),
+            on_error=lambda e: self.show_error_dialog(f"Error: {str(e)}"),
         )
+
+    def _on_student_registered(self, dialog, values, resigter_callback):
+        """Add the registered student to the table and confirm"""
+        student_id, username = values[0], values[1]
         if resigter_callback["success"] is True:
-            self.tree.insert("", "end", values=values)
+            self.table.add_row(values)
             print(f"New student registered: ID={student_id}, Username={username}")
 
             dialog.destroy()
@@ -580,85 +593,51 @@ class StudentManagement:
             print(resigter_callback)
 
     def save_changes(self):
-        """Save all changes to database"""
-        print("Saving all changes to database...")
+        """Write the edited rows to the database with one bulk update"""
+        changes = {}
+        for original, current in self.table.dirty_rows():
+            # Only the fields that actually changed are sent
+            fields = {
+                field: str(current[i]).strip()
+                for i, field in self.COLUMN_FIELDS.items()
+                if str(current[i]) != str(original[i])
+            }
+            if fields:
+                changes[str(current[0])] = fields
 
-        # Get all data from treeview
-        all_students = []
-        for item in self.tree.get_children():
-            values = self.tree.item(item)["values"]
-            all_students.append(values)
+        if not changes:
+            self.table.mark_clean()
+            self._update_unsaved_label()
+            self.show_success_dialog("No changes to save.")
+            return
 
-        print(f"Total students: {len(all_students)}")
+        print(f"Saving {len(changes)} edited student(s)...")
+        run_task(
+            self.task_executor,
+            self.student_controller.bulk_update_students,
+            changes,
+            on_success=self._on_changes_saved,
+            on_error=lambda e: self.show_error_dialog(f"Error: {str(e)}"),
+        )
 
-        # Track results
+    def _on_changes_saved(self, result):
+        """Show the per-row results of save_changes"""
         success_count = 0
         error_count = 0
         error_messages = []
-        # Update each student in database
-        for student_values in all_students:
-            try:
-                # Extract student data from treeview row
-                student_id = student_values[0]  # StudentID (MongoDB _id)
-                username = student_values[1]
-                # password = student_values[2]  # Skip password (it's masked)
-                email = student_values[3]
-                full_name = student_values[4]
-                dob = student_values[5]
-                gender = student_values[6]
-                address = student_values[7]
-                contact = student_values[8]
-                major = student_values[9]
-                image_url = student_values[10]
-
-                # Get the student object from database
-                from models.account import Account
-
-                student = Account.find_by_id(student_id)
-
-                if not student:
-                    error_count += 1
-                    error_messages.append(f"Student {username} not found in database")
-                    continue
-
-                # Prepare update data (only include non-empty fields)
-                updated_data = {}
-
-                if email and email.strip():
-                    updated_data["email"] = email.strip()
-                if full_name and full_name.strip():
-                    updated_data["fullName"] = full_name.strip()
-                if dob and dob.strip():
-                    updated_data["dob"] = dob.strip()
-                if gender and gender.strip():
-                    updated_data["gender"] = gender.strip()
-                if address and address.strip():
-                    updated_data["address"] = address.strip()
-                if contact and str(contact).strip():
-                    updated_data["contact"] = str(contact).strip()
-                if major and major.strip():
-                    updated_data["major"] = major.strip()
-                if image_url and str(image_url).strip() and str(image_url) != "None":
-                    updated_data["imageURL"] = str(image_url).strip()
-
-                # Update student profile using controller
-                result = self.student_controller.update_student_profile(
-                    student, updated_data
-                )
-
-                if result["success"]:
-                    success_count += 1
-                    print(f"✓ Updated {username}: {result.get('message', '')}")
-                else:
-                    error_count += 1
-                    error_msg = f"{username}: {result.get('message', 'Unknown error')}"
-                    error_messages.append(error_msg)
-                    print(f"✗ Failed to update {username}: {result.get('message', '')}")
-
-            except Exception as e:
-                print(f"✗ Error updating student: {e}")
+        for row in result["results"]:
+            values = self.table.find(row["id"])
+            username = values[1] if values else row["id"]
+            if row["success"]:
+                success_count += 1
+                self.table.mark_clean([row["id"]])
+                print(f"✓ Updated {username}: {row['message']}")
+            else:
+                error_count += 1
+                error_messages.append(f"{username}: {row['message']}")
+                print(f"✗ Failed to update {username}: {row['message']}")
+        self._update_unsaved_label()
 
-        # Show result dialog
         if error_count == 0:
             # All successful
             success_dialog = ctk.CTkToplevel(self.parent)
@@ -1,22 +1,30 @@
 import customtkinter as ctk
-from tkinter import ttk
 from datetime import datetime
 
 from controllers.transaction_controller import TransactionController
+from views.virtual_table import VirtualTable
 
 
 class TransactionManagement:
     """
     Simple transaction management view:
-    - Shows a table of transactions
+    - Shows a table of transactions, fetched one page at a time as the user
+      scrolls (keyset pagination in the controller)
+    - Filters: student, fee, method, status, date range
     - Buttons: Refresh, View Detail, Back
     - Double-click or "View Detail" opens a modal with transaction details
     """
 
-    def __init__(self, parent, back_callback, transaction_controller=None):
+    PAGE_SIZE = 50
+
+    def __init__(
+        self, parent, back_callback, transaction_controller=None, task_executor=None
+    ):
         self.parent = parent
         self.back_callback = back_callback
         self.transaction_controller: TransactionController = transaction_controller
+        self.task_executor = task_executor
+        self._filters = {}  # server-side filters of the loaded pages
 
         # Theme (consistent with other views)
         ctk.set_appearance_mode("light")
@@ -55,6 +63,35 @@ class TransactionManagement:
         )
         title_label.pack(side="left")
 
+        # Filters (applied server-side)
+        filter_frame = ctk.CTkFrame(main_frame, fg_color="white")
+        filter_frame.pack(fill="x", padx=60, pady=(0, 10))
+
+        self.filter_entries = {}
+        for key, placeholder, width in (
+            ("student_id", "Student ID", 200),
+            ("fee_id", "Fee ID", 200),
+            ("method", "Method", 110),
+            ("status", "Status", 110),
+            ("date_from", "From (YYYY-MM-DD)", 150),
+            ("date_to", "To (YYYY-MM-DD)", 150),
+        ):
+            entry = ctk.CTkEntry(
+                filter_frame, width=width, placeholder_text=placeholder
+            )
+            entry.pack(side="left", padx=(0, 8))
+            entry.bind("<Return>", lambda e: self.load_transactions())
+            self.filter_entries[key] = entry
+
+        ctk.CTkButton(
+            filter_frame,
+            text="Apply",
+            width=90,
+            fg_color="#22C55E",
+            hover_color="#1e9c4e",
+            command=self.load_transactions,
+        ).pack(side="left")
+
         # Table container
         table_container = ctk.CTkFrame(
             main_frame,
@@ -65,32 +102,6 @@ class TransactionManagement:
         )
         table_container.pack(fill="both", expand=True, padx=60, pady=(0, 30))
 
-        # Treeview style
-        style = ttk.Style()
-        style.theme_use("default")
-        style.configure(
-            "Treeview",
-            background="white",
-            foreground="black",
-            rowheight=30,
-            fieldbackground="white",
-            font=("Arial", 11),
-        )
-        style.configure(
-            "Treeview.Heading",
-            background="#F0F0F0",
-            foreground="black",
-            font=("Arial", 12, "bold"),
-        )
-        style.map("Treeview", background=[("selected", "#0078D7")])
-
-        # Tree frame + scrollbar
-        tree_frame = ctk.CTkFrame(table_container, fg_color="white")
-        tree_frame.pack(fill="both", expand=True, padx=2, pady=2)
-
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side="right", fill="y")
-
         # Define columns
         columns = (
             "TransactionID",
@@ -101,26 +112,24 @@ class TransactionManagement:
             "Status",
             "Date",
         )
-        self.tree = ttk.Treeview(
-            tree_frame,
-            columns=columns,
-            show="headings",
-            yscrollcommand=scrollbar.set,
-            height=12,
+        # Rows are fetched page by page as the user scrolls; the filters above
+        # are applied server-side, so the table's own filters/sorting are off
+        self.table = VirtualTable(
+            table_container,
+            columns,
+            column_options={
+                "TransactionID": {"width": 200, "minwidth": 120},
+                "Amount": {"width": 120, "minwidth": 100, "anchor": "e"},
+                "Method": {"width": 140},
+                "StudentID": {"width": 200, "minwidth": 120},
+                "FeeID": {"width": 200, "minwidth": 120},
+                "Status": {"width": 140},
+                "Date": {"width": 140},
+            },
+            show_filters=False,
+            page_loader=self._load_page,
+            task_executor=self.task_executor,
         )
-        scrollbar.config(command=self.tree.yview)
-
-        for col in columns:
-            self.tree.heading(col, text=col)
-            # give ID columns wider space
-            if col in ("TransactionID", "StudentID", "FeeID"):
-                self.tree.column(col, width=200, minwidth=120, anchor="w")
-            elif col == "Amount":
-                self.tree.column(col, width=120, minwidth=100, anchor="e")
-            else:
-                self.tree.column(col, width=140, minwidth=100, anchor="w")
-
-        self.tree.pack(fill="both", expand=True)
 
         # Buttons frame
         buttons_frame = ctk.CTkFrame(main_frame, fg_color="white")
@@ -155,7 +164,7 @@ class TransactionManagement:
         view_btn.pack(side="left", padx=(0, 20))
 
         # Bind double click to view details
-        self.tree.bind("<Double-1>", self.on_double_click)
+        self.table.bind("<Double-1>", self.on_double_click)
 
         # Load initial data
         self.load_transactions()
@@ -176,80 +185,85 @@ class TransactionManagement:
         except Exception:
             return str(v)
 
-    def load_transactions(self):
-        """Load transactions from controller or sample data"""
-        # clear existing
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def _current_filters(self):
+        return {
+            key: entry.get().strip()
+            for key, entry in self.filter_entries.items()
+            if entry.get().strip()
+        }
 
+    def load_transactions(self):
+        """(Re)load the first page with the current filters"""
+        # Read the entries here, on the UI thread; pages load on a worker
+        self._filters = self._current_filters()
+        if not self.transaction_controller:
+            print("Error: Failed to load transactions (no controller provided)")
+            self.table.clear()
+            return
+        self.table.reload()
+
+    def _load_page(self, cursor):
+        """VirtualTable page loader (runs off the UI thread)"""
+        result = self.transaction_controller.get_transactions_page(
+            page_size=self.PAGE_SIZE,
+            cursor=cursor,
+            with_total=cursor is None,
+            **self._filters,
+        )
+        if not result.get("success"):
+            raise RuntimeError(result.get("message", "Failed to load transactions"))
+
+        return {
+            "rows": [self._tx_to_row(tx) for tx in result.get("transactions", [])],
+            "next_cursor": result.get("next_cursor"),
+            "has_more": result.get("has_more", False),
+            "total": result.get("total"),
+        }
+
+    def _tx_to_row(self, tx):
+        """Format one transaction as table values"""
+        # tx may be dict or object-like
+        tx_id = str(getattr(tx, "_id", None) or tx.get("_id") or tx.get("id") or "")
+        amount = getattr(tx, "amount", None) or tx.get("amount", "")
+        method = getattr(tx, "method", None) or tx.get("method", "")
+        student_id = getattr(tx, "student_id", None) or tx.get("student_id", "")
+        fee_id = getattr(tx, "fee_id", None) or tx.get("fee_id", "")
+        status = getattr(tx, "status", None) or tx.get("status", "")
+        date = getattr(tx, "date", None) or tx.get("date", "") or tx.get("createAt", "")
+
+        date_str = self._format_dt(date)
+
+        # Format amount nicely if numeric
         try:
-            if self.transaction_controller:
-                result = self.transaction_controller.get_all_transactions()
-            else:
-                result = {"success": False, "message": "No controller provided"}
-        except Exception as e:
-            print(f"Error calling controller: {e}")
-            result = {"success": False, "message": str(e)}
-
-        if result.get("success"):
-            txs = result.get("transactions", [])
-            for tx in txs:
-                # tx may be dict or object-like
-                tx_id = str(
-                    getattr(tx, "_id", None) or tx.get("_id") or tx.get("id") or ""
-                )
-                amount = getattr(tx, "amount", None) or tx.get("amount", "")
-                method = getattr(tx, "method", None) or tx.get("method", "")
-                student_id = getattr(tx, "student_id", None) or tx.get("student_id", "")
-                fee_id = getattr(tx, "fee_id", None) or tx.get("fee_id", "")
-                status = getattr(tx, "status", None) or tx.get("status", "")
-                date = (
-                    getattr(tx, "date", None)
-                    or tx.get("date", "")
-                    or tx.get("createAt", "")
-                )
-
-                date_str = self._format_dt(date)
-
-                # Format amount nicely if numeric
-                try:
-                    amt_int = int(round(float(amount)))
-                    amt_str = f"{amt_int:,}".replace(",", ".")
-                except Exception:
-                    amt_str = str(amount)
-
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        tx_id,
-                        amt_str,
-                        method,
-                        str(student_id),
-                        str(fee_id),
-                        status,
-                        date_str,
-                    ),
-                )
-        else:
-            print("Error: Failed to load transactions")
+            amt_int = int(round(float(amount)))
+            amt_str = f"{amt_int:,}".replace(",", ".")
+        except Exception:
+            amt_str = str(amount)
+
+        return (
+            tx_id,
+            amt_str,
+            method,
+            str(student_id),
+            str(fee_id),
+            status,
+            date_str,
+        )
 
     # -------------------------
     # Selection / detail
     # -------------------------
     def on_double_click(self, event):
-        item = self.tree.selection()
-        if not item:
+        if not self.table.selected_row():
             return
         self.view_selected_detail()
 
     def view_selected_detail(self):
-        sel = self.tree.selection()
-        if not sel:
+        values = self.table.selected_row()
+        if not values:
             self.show_error_dialog("Select a transaction first")
             return
 
-        values = self.tree.item(sel[0])["values"]
         tx_id = values[0]
 
         # Try controller.find_by_id and handle different return shapes
@@ -1,6 +1,7 @@
 import customtkinter as ctk
 
 from controllers.notifications_controller import NotificationsController
+from views.notification_feed import NotificationFeed
 
 
 class LoginNotificationApp:
@@ -13,6 +14,8 @@ class LoginNotificationApp:
         handle_login_callback,
         admin_dashboard_callback,
         notifications_controller: NotificationsController,
+        first_page=None,
+        task_executor=None,
     ):
         self.parent = parent
         self.forgot_password_callback = forgot_password_callback
@@ -22,6 +25,7 @@ class LoginNotificationApp:
         self.admin_dashboard_callback = admin_dashboard_callback
 
         self.notifications_controller = notifications_controller
+        self.task_executor = task_executor
 
         # Set theme and color
         ctk.set_appearance_mode("light")
@@ -56,13 +60,19 @@ class LoginNotificationApp:
         )
         self.scrollable_frame.pack(fill="both", expand=True, padx=10, pady=(0, 20))
 
-        # Sample notifications data (you can load this from database/API)
-        self.notifications = (
-            self.notifications_controller.student_view_all_notifications()
+        # The first page is fetched in the background by MainApp; until it
+        # arrives (set_first_page) a loading message is shown instead. Later
+        # pages are loaded by the feed while scrolling.
+        self.feed = NotificationFeed(
+            self.scrollable_frame,
+            page_loader=self.load_page,
+            create_item=self.create_notification_item,
+            task_executor=self.task_executor,
         )
-
-        # Load notifications
-        self.load_notifications()
+        if first_page is None:
+            self.show_notifications_status("Loading notifications...")
+        else:
+            self.feed.reload(first_page)
 
         # Right side - Login
         login_frame = ctk.CTkFrame(
@@ -138,56 +148,64 @@ class LoginNotificationApp:
         forgot_label.pack(pady=10)
         forgot_label.bind("<Button-1>", lambda e: self.forgot_password())
 
-    def load_notifications(self):
-        """Load notifications into scrollable frame"""
-        for notif in self.notifications:
-            notif_item = ctk.CTkFrame(
-                self.scrollable_frame,
-                fg_color="white",
-                corner_radius=15,
-                border_width=2,
-                border_color="black",
-            )
-            notif_item.pack(padx=20, pady=10, fill="x")
-
-            # Make the frame clickable
-            notif_item.configure(cursor="hand2")
-            notif_item.bind("<Button-1>", lambda e, n=notif: self.open_detail(n))
-
-            title_label = ctk.CTkLabel(
-                notif_item,
-                text=notif.title,
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
-                text_color="#22C55E",
-                anchor="w",
-                cursor="hand2",
-            )
-            title_label.pack(padx=15, pady=(15, 5), anchor="w", fill="x")
-            title_label.bind("<Button-1>", lambda e, n=notif: self.open_detail(n))
-
-            date_label = ctk.CTkLabel(
-                notif_item,
-                text=notif.createAt,
-                font=ctk.CTkFont(family="Arial", size=12),
-                text_color="black",
-                anchor="w",
-                cursor="hand2",
-            )
-            date_label.pack(padx=15, pady=(0, 15), anchor="w", fill="x")
-            date_label.bind("<Button-1>", lambda e, n=notif: self.open_detail(n))
+    def load_page(self, before):
+        """Runs on the task executor"""
+        return self.notifications_controller.get_notifications_page(before=before)
+
+    def create_notification_item(self, notif):
+        """Create the widgets of one notification"""
+        notif_item = ctk.CTkFrame(
+            self.scrollable_frame,
+            fg_color="white",
+            corner_radius=15,
+            border_width=2,
+            border_color="black",
+        )
+        notif_item.pack(padx=20, pady=10, fill="x")
+
+        # Make the frame clickable
+        notif_item.configure(cursor="hand2")
+        notif_item.bind("<Button-1>", lambda e, n=notif: self.open_detail(n))
+
+        title_label = ctk.CTkLabel(
+            notif_item,
+            text=notif.title,
+            font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+            text_color="#22C55E",
+            anchor="w",
+            cursor="hand2",
+        )
+        title_label.pack(padx=15, pady=(15, 5), anchor="w", fill="x")
+        title_label.bind("<Button-1>", lambda e, n=notif: self.open_detail(n))
+
+        date_label = ctk.CTkLabel(
+            notif_item,
+            text=notif.createAt,
+            font=ctk.CTkFont(family="Arial", size=12),
+            text_color="black",
+            anchor="w",
+            cursor="hand2",
+        )
+        date_label.pack(padx=15, pady=(0, 15), anchor="w", fill="x")
+        date_label.bind("<Button-1>", lambda e, n=notif: self.open_detail(n))
+
+    def show_notifications_status(self, message):
+        """Show a status message (loading / error) in the notifications panel"""
+        self.feed.show_status(message)
+
+    def set_first_page(self, page):
+        """Swap the loading message for the prefetched first page"""
+        if not self.scrollable_frame.winfo_exists():
+            return
+        self.feed.reload(page)
 
     def open_detail(self, notification_data):
         """Open notification detail page"""
         self.detail_callback(notification_data)
 
-    def add_notification(self, title, date):
-        """Dynamically add a new notification"""
-        self.notifications.insert(0, {"title": title, "date": date})
-
-        # Clear and reload all notifications
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        self.load_notifications()
+    def add_notification(self):
+        """Reload the list so a newly posted notification shows on top"""
+        self.feed.reload()
 
     def login(self):
         account = self.account_entry.get()
@@ -237,6 +255,6 @@ class LoginNotificationApp:
 
 # # Example: Add a new notification after 3 seconds
 # def add_new_notification():
-#     app.add_notification("New Notification!", "date: 11/04/2025")
+#     app.add_notification()
 
 # root.after(3000, add_new_notification)  # Add notification after 3 seconds
@@ -1,11 +1,22 @@
 import customtkinter as ctk
 
+from utils.task_executor import run_task
+
 
 class NotificationDetailApp:
-    def __init__(self, parent, back_callback, notification_data):
+    def __init__(
+        self,
+        parent,
+        back_callback,
+        notification_data,
+        notifications_controller=None,
+        task_executor=None,
+    ):
         self.parent = parent
         self.back_callback = back_callback
         self.notification_data = notification_data
+        self.notifications_controller = notifications_controller
+        self.task_executor = task_executor
 
         # Set theme and color
         ctk.set_appearance_mode("light")
@@ -57,16 +68,22 @@ class NotificationDetailApp:
         )
         content_scroll.pack(fill="both", expand=True, padx=20, pady=20)
 
+        # List screens pass a summary without the content; the full
+        # announcement is fetched when the detail page opens
+        content = getattr(notification_data, "content", None)
+
         # Content text (italic)
-        content_label = ctk.CTkLabel(
+        self.content_label = ctk.CTkLabel(
             content_scroll,
-            text=notification_data.content,
+            text=content if content is not None else "Loading...",
             font=ctk.CTkFont(family="Arial", size=18, slant="italic"),
             text_color="black",
             justify="left",
             wraplength=1200,
         )
-        content_label.pack(fill="both", expand=True, pady=20)
+        self.content_label.pack(fill="both", expand=True, pady=20)
+        if content is None:
+            self.load_content()
 
         # Date label (bottom right)
         date_label = ctk.CTkLabel(
@@ -92,6 +109,33 @@ class NotificationDetailApp:
         )
         back_btn.place(x=40, y=40)
 
+    def load_content(self):
+        """Fetch the full announcement and show its content"""
+        if self.notifications_controller is None:
+            self.content_label.configure(text=self.notification_data.preview)
+            return
+        run_task(
+            self.task_executor,
+            self.notifications_controller.get_announcement,
+            self.notification_data._id,
+            on_success=self._show_content,
+            on_error=lambda e: self._show_content(
+                {"success": False, "message": str(e)}
+            ),
+        )
+
+    def _show_content(self, result):
+        if not self.content_label.winfo_exists():
+            return
+        if result.get("success"):
+            self.content_label.configure(text=result["announcement"].content)
+        else:
+            # Keep the preview so the page is not empty
+            self.content_label.configure(
+                text=f"{self.notification_data.preview}\n\n"
+                f"(Could not load the full announcement: {result.get('message')})"
+            )
+
 
 # Example standalone usage
 if __name__ == "__main__":
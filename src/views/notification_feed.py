@@ -0,0 +1,157 @@
+"""
+Infinite-scroll announcement list used by the login screen and the student
+notifications screen.
+
+Creating a frame with labels and bindings for every announcement ever posted
+makes those screens slower each year. NotificationFeed fetches announcements
+a page at a time (NotificationsController.get_notifications_page) and only
+creates widgets for the pages loaded so far; the next page is requested when
+the user scrolls near the bottom of the list.
+"""
+
+import customtkinter as ctk
+
+from utils.task_executor import run_task
+
+
+class NotificationFeed:
+    """
+    Args:
+        scrollable_frame (ctk.CTkScrollableFrame): Container of the items
+        page_loader (callable): page_loader(before) -> result of
+            get_notifications_page; runs on task_executor
+        create_item (callable): create_item(announcement) builds the
+            widgets of one announcement inside scrollable_frame
+        task_executor: utils.task_executor.TaskExecutor (optional)
+        empty_text (str): Shown when there are no announcements
+    """
+
+    # Fetch the next page once the bottom of the view passes this fraction
+    PREFETCH_AT = 0.85
+
+    def __init__(
+        self,
+        scrollable_frame,
+        page_loader,
+        create_item,
+        task_executor=None,
+        empty_text="No notifications yet.",
+    ):
+        self.scrollable_frame = scrollable_frame
+        self.page_loader = page_loader
+        self.create_item = create_item
+        self.task_executor = task_executor
+        self.empty_text = empty_text
+
+        self.count = 0
+        self.status_label = None
+        self._next_cursor = None
+        self._has_more = False
+        self._loading = False
+        self._generation = 0  # bumped on reload so stale pages are ignored
+
+        # CTkScrollableFrame scrolls an inner canvas; hook its scroll
+        # callback to learn how far down the user is
+        canvas = scrollable_frame._parent_canvas
+        scrollbar = scrollable_frame._scrollbar
+        canvas.configure(
+            yscrollcommand=lambda first, last: self._on_scroll(scrollbar, first, last)
+        )
+
+    def show_status(self, message):
+        """Show a status message (loading / error / end of list)"""
+        if self.status_label is None:
+            self.status_label = ctk.CTkLabel(
+                self.scrollable_frame,
+                text=message,
+                font=ctk.CTkFont(family="Arial", size=14),
+                text_color="gray",
+            )
+        else:
+            self.status_label.configure(text=message)
+        # Keep the label below the items
+        self.status_label.pack_forget()
+        self.status_label.pack(pady=20)
+
+    def hide_status(self):
+        if self.status_label is not None:
+            self.status_label.destroy()
+            self.status_label = None
+
+    def reload(self, first_page=None):
+        """
+        Drop the shown items and start from the first page, either the one
+        given (e.g. prefetched at startup) or a freshly fetched one.
+        """
+        self._generation += 1
+        for widget in self.scrollable_frame.winfo_children():
+            widget.destroy()
+        self.status_label = None
+        self.count = 0
+        self._next_cursor = None
+        self._has_more = True
+        self._loading = False
+        if first_page is not None:
+            self._on_page(first_page, self._generation)
+        else:
+            self._fetch_page()
+
+    def _on_scroll(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        if float(last) >= self.PREFETCH_AT:
+            self._maybe_fetch_more()
+
+    def _maybe_fetch_more(self):
+        if self._has_more and not self._loading:
+            self._fetch_page()
+
+    def _fetch_page(self):
+        generation = self._generation
+        self._loading = True
+        self.show_status("Loading notifications...")
+        run_task(
+            self.task_executor,
+            self.page_loader,
+            self._next_cursor,
+            on_success=lambda page: self._on_page(page, generation),
+            on_error=lambda e: self._on_page_error(e, generation),
+        )
+
+    def _on_page(self, page, generation):
+        if generation != self._generation:
+            return  # reloaded while this page was loading
+        if not self.scrollable_frame.winfo_exists():
+            return  # view already left
+        self._loading = False
+        if not page.get("success", True):
+            self._on_page_error(page.get("message"), generation)
+            return
+
+        self.hide_status()
+        for announcement in page.get("notifications", []):
+            self.create_item(announcement)
+        self.count += page.get("count", len(page.get("notifications", [])))
+        self._next_cursor = page.get("next_cursor")
+        self._has_more = bool(page.get("has_more"))
+        if self.count == 0:
+            self.show_status(self.empty_text)
+        # A short first page may not fill the view (no scroll event comes),
+        # so check again once the new items are laid out
+        elif self._has_more:
+            self.scrollable_frame.after_idle(self._fill_view)
+
+    def _fill_view(self):
+        if not self.scrollable_frame.winfo_exists():
+            return
+        _first, last = self.scrollable_frame._parent_canvas.yview()
+        if last >= self.PREFETCH_AT:
+            self._maybe_fetch_more()
+
+    def _on_page_error(self, error, generation):
+        if generation != self._generation:
+            return
+        self._loading = False
+        self._has_more = False
+        print(f"Can not fetch any annoucement datas: {error}")
+        if self.scrollable_frame.winfo_exists():
+            self.show_status("Could not load notifications.")
@@ -0,0 +1,56 @@
+"""
+Lazy registry of the application screens.
+
+Importing every view module up front (and PIL through the student views)
+slows down startup although a student never opens the admin screens and
+vice versa. MainApp asks this registry for a view class when its route is
+first shown; the module is imported at that moment and the class is kept
+for later visits. How long each import took is recorded in IMPORT_TIMES_MS
+(see also utils.import_report for the whole-startup report).
+"""
+
+import importlib
+import time
+
+# View class name -> module defining it
+VIEW_MODULES = {
+    "LoginNotificationApp": "views.login",
+    "ForgotPasswordApp": "views.forgot_password",
+    "NotificationDetailApp": "views.notification_detail",
+    # Student screens
+    "StudentDashboard": "views.student.student_dashboard",
+    "StudentProfile": "views.student.student_profile",
+    "UpdateStudentProfile": "views.student.update_student_profile",
+    "StudentDashboardViewNotification": (
+        "views.student.student_dashboard_view_notifications"
+    ),
+    "FinancialSummaryApp": "views.student.financial_summary",
+    "PaymentApp": "views.student.payment",
+    # Admin screens
+    "AdminDashboard": "views.admin.admin_dashboard",
+    "StudentManagement": "views.admin.student_management",
+    "MakeAnnouncement": "views.admin.make_anoucements",
+    "FeeManagement": "views.admin.fee_management",
+    "AdminManagement": "views.admin.admin_management",
+    "TransactionManagement": "views.admin.transaction_management",
+    "NotificationManagement": "views.admin.notification_management",
+}
+
+# View class name -> milliseconds spent importing its module
+IMPORT_TIMES_MS = {}
+
+_LOADED = {}
+
+
+def get_view(name):
+    """The view class `name`, importing its module on first use"""
+    view_class = _LOADED.get(name)
+    if view_class is None:
+        module_name = VIEW_MODULES[name]
+        started = time.perf_counter()
+        module = importlib.import_module(module_name)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        view_class = _LOADED[name] = getattr(module, name)
+        IMPORT_TIMES_MS[name] = elapsed_ms
+        print(f"⏱ [views] imported {module_name} in {elapsed_ms:.0f} ms")
+    return view_class
@@ -4,6 +4,8 @@ from bson.objectid import ObjectId
 
 from controllers.student_controller import StudentController
 from controllers.fee_controller import FeeController
+from controllers.financial_controller import FinancialController
+from utils.task_executor import run_task
 
 
 class FinancialSummaryApp:
@@ -14,9 +16,13 @@ class FinancialSummaryApp:
         student_controller: StudentController,
         fee_controller: FeeController,
         back_callback=None,
+        task_executor=None,
+        financial_controller: FinancialController = None,
     ):
         self.parent = parent
         self.back_callback = back_callback
+        self.task_executor = task_executor
+        self.financial_controller = financial_controller
         self.student_id = (
             ObjectId(student_id) if not isinstance(student_id, ObjectId) else student_id
         )
@@ -52,14 +58,14 @@ class FinancialSummaryApp:
         if back_callback:
             back_arrow.bind("<Button-1>", lambda e: back_callback())
 
-        student_name = self._get_student_display_name()
-        title_label = ctk.CTkLabel(
+        # The student's name is filled in once it has been fetched
+        self.title_label = ctk.CTkLabel(
             header_frame,
-            text=f"Financial Summary — {student_name}",
+            text=f"Financial Summary — {self.student_id}",
             font=ctk.CTkFont(family="Arial", size=48, weight="bold"),
             text_color="#22C55E",
         )
-        title_label.pack(side="left")
+        self.title_label.pack(side="left")
 
         # --- Scrollable frame for fees table ---
         scrollable_frame = ctk.CTkScrollableFrame(
@@ -159,7 +165,18 @@ class FinancialSummaryApp:
         self.total_unpaid_label.grid(row=0, column=3, sticky="nsew")
 
         # Load data
-        self.load_financial_data()
+        if self.financial_controller:
+            # Name, fees and totals in one aggregation
+            self.load_financial_summary()
+        else:
+            run_task(
+                self.task_executor,
+                self._get_student_display_name,
+                on_success=lambda name: self.title_label.configure(
+                    text=f"Financial Summary — {name}"
+                ),
+            )
+            self.load_financial_data()
 
     # -----------------------
     # Helpers
@@ -178,11 +195,55 @@ class FinancialSummaryApp:
             pass
         return str(self.student_id)
 
+    def load_financial_summary(self):
+        run_task(
+            self.task_executor,
+            self.financial_controller.get_financial_summary,
+            self.student_id,
+            on_success=self._show_financial_summary,
+            on_error=lambda e: self._show_financial_summary(
+                {"success": False, "message": str(e)}
+            ),
+        )
+
+    def _show_financial_summary(self, result):
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+
+        if not result.get("success"):
+            self.tree.insert("", "end", values=("", "No fees found or error", "", ""))
+            self._update_totals(0, 0)
+            return
+
+        info = result.get("student_info", {})
+        self.title_label.configure(
+            text=f"Financial Summary — {info.get('name') or str(self.student_id)}"
+        )
+        for fee in result.get("financial_data", []):
+            self.tree.insert(
+                "",
+                "end",
+                values=(fee["index"], fee["name"], fee["fee"], fee["remain"]),
+            )
+        totals = result.get("totals", {})
+        self.total_fee_label.configure(text=totals.get("fee", "0"))
+        self.total_unpaid_label.configure(text=totals.get("remain", "0"))
+
     def load_financial_data(self):
+        run_task(
+            self.task_executor,
+            self.fee_controller.get_fees_by_student,
+            self.student_id,
+            on_success=self._show_financial_data,
+            on_error=lambda e: self._show_financial_data(
+                {"success": False, "error": str(e)}
+            ),
+        )
+
+    def _show_financial_data(self, result):
         for item in self.tree.get_children():
             self.tree.delete(item)
 
-        result = self.fee_controller.get_fees_by_student(self.student_id)
         if not result.get("success"):
             self.tree.insert("", "end", values=("", "No fees found or error", "", ""))
             self._update_totals(0, 0)
@@ -1,24 +1,38 @@
 import customtkinter as ctk
 import tkinter as tk
-from datetime import datetime
+import uuid
 from bson.objectid import ObjectId
 
-# Models
-from models.transaction import Transaction
+from utils.task_executor import run_task
 
 
 # NOTE: this view expects:
 # - student_controller.get_student_by_id(student_id) -> {"success": True, "student": {...}}
 # - fee_controller.get_fees_by_student(student_id) -> {"success": True, "fees": [Fee, ...]}
-# - Fee objects support ._id, .description, .amount, .student_id, .dueDate, .period, .status, .markPaid(), .save()
+# - Fee objects support ._id, .description, .amount, .student_id, .dueDate, .period, .status
+# - payment_controller.process_payment(student_id, fee_ids, idempotency_key=...)
+#   -> {"success": True, "paid_fee_ids": [...], "skipped_fee_ids": [...], "total_paid": n}
 class PaymentApp:
     def __init__(
-        self, parent, student_id, student_controller, fee_controller, back_callback=None
+        self,
+        parent,
+        student_id,
+        student_controller,
+        fee_controller,
+        payment_controller,
+        back_callback=None,
+        task_executor=None,
     ):
         self.parent = parent
         self.back_callback = back_callback
+        self.task_executor = task_executor
         self.student_controller = student_controller
         self.fee_controller = fee_controller
+        self.payment_controller = payment_controller
+
+        # Idempotency key of the payment being submitted; kept after a failure
+        # so pressing Pay again retries it instead of charging twice
+        self._payment_key = None
 
         # normalize student_id
         self.student_id = (
@@ -67,19 +81,22 @@ class PaymentApp:
         )
         title_label.pack(side="left")
 
-        # Student info (attempt to get from controller)
-        student_display = self._fetch_student_info_for_display()
-
+        # Student info (fetched from controller in the background)
         details_frame = ctk.CTkFrame(main_frame, fg_color="#F9FAFB", corner_radius=10)
         details_frame.pack(fill="x", padx=60, pady=(20, 10))
-        details_label = ctk.CTkLabel(
+        self.details_label = ctk.CTkLabel(
             details_frame,
-            text=student_display,
+            text=f"Student ID: {str(self.student_id)}\nFull name: -\nDate of birth: -\n",
             font=ctk.CTkFont(family="Arial", size=16),
             text_color="black",
             justify="left",
         )
-        details_label.pack(anchor="w", padx=20, pady=12)
+        self.details_label.pack(anchor="w", padx=20, pady=12)
+        run_task(
+            self.task_executor,
+            self._fetch_student_info_for_display,
+            on_success=lambda text: self.details_label.configure(text=text),
+        )
 
         # Fee list container
         fee_list_container = ctk.CTkFrame(
@@ -133,7 +150,7 @@ class PaymentApp:
         self.total_label.pack(side="left", padx=(10, 20))
 
         # Pay button
-        pay_button = ctk.CTkButton(
+        self.pay_button = ctk.CTkButton(
             footer_frame,
             text="Pay",
             font=ctk.CTkFont(family="Arial", size=18, weight="bold"),
@@ -145,7 +162,7 @@ class PaymentApp:
             corner_radius=10,
             command=self.pay_action,
         )
-        pay_button.pack(side="right")
+        self.pay_button.pack(side="right")
 
         # Load unpaid fees
         self.load_unpaid_fees()
@@ -164,17 +181,40 @@ class PaymentApp:
             pass
         return f"Student ID: {str(self.student_id)}\nFull name: -\nDate of birth: -\n"
 
+    def refresh(self):
+        """
+        Reload the view when it is shown again. A payment still in flight
+        when the user navigated away was cancelled and its callbacks are
+        dropped, so clear its state here; the reloaded list shows whether
+        it went through, and a new key cannot charge a paid fee again.
+        """
+        self._payment_key = None
+        self.pay_button.configure(state="normal")
+        self.load_unpaid_fees()
+
     def load_unpaid_fees(self):
         """Fetch unpaid fees for this student and populate the scroll frame"""
+        if not self.fee_controller or not self.student_id:
+            self._show_unpaid_fees(None)
+            return
+
+        run_task(
+            self.task_executor,
+            self.fee_controller.get_fees_by_student,
+            self.student_id,
+            on_success=self._show_unpaid_fees,
+            on_error=lambda e: self._show_error(f"Failed to load fees: {e}"),
+        )
+
+    def _show_unpaid_fees(self, res):
         # clear existing
         for child in self.scroll_frame.winfo_children():
             child.destroy()
         self.fee_items.clear()
 
-        if not self.fee_controller or not self.student_id:
+        if res is None:
             return
 
-        res = self.fee_controller.get_fees_by_student(self.student_id)
         if not res.get("success"):
             # show a simple error popup
             self._show_error(f"Failed to load fees: {res.get('message', 'Unknown')}")
@@ -185,13 +225,7 @@ class PaymentApp:
         unpaid_fees = [f for f in fees if getattr(f, "status", "").lower() != "paid"]
 
         if not unpaid_fees:
-            empty_label = ctk.CTkLabel(
-                self.scroll_frame,
-                text="No unpaid fees found.",
-                font=ctk.CTkFont(size=16),
-            )
-            empty_label.pack(padx=10, pady=20)
-            self.total_label.configure(text="Total: 0")
+            self._show_empty()
             return
 
         # create items
@@ -201,6 +235,15 @@ class PaymentApp:
         # after adding all, update total
         self.update_total()
 
+    def _show_empty(self):
+        empty_label = ctk.CTkLabel(
+            self.scroll_frame,
+            text="No unpaid fees found.",
+            font=ctk.CTkFont(size=16),
+        )
+        empty_label.pack(padx=10, pady=20)
+        self.total_label.configure(text="Total: 0")
+
     def _add_fee_item(self, fee):
         """Add one fee row (checkbox + info)"""
         fee_id = str(fee._id)
@@ -236,53 +279,60 @@ class PaymentApp:
         self.total_label.configure(text=f"Total: {self._format_number(self.total_fee)}")
 
     def pay_action(self):
-        """Mark selected fees as paid and create transactions (pseudo payment)."""
-        selected = [it for it in self.fee_items.values() if it["var"].get()]
+        """Pay the selected fees with one batched request to the controller."""
+        selected = [fid for fid, it in self.fee_items.items() if it["var"].get()]
         if not selected:
             self._show_error("No fee selected to pay.")
             return
 
-        total_paid = 0
-        paid_descriptions = []
+        if self._payment_key is None:
+            self._payment_key = uuid.uuid4().hex
+
+        # Block double clicks while the request is in flight
+        self.pay_button.configure(state="disabled")
+        run_task(
+            self.task_executor,
+            self.payment_controller.process_payment,
+            self.student_id,
+            selected,
+            idempotency_key=self._payment_key,
+            on_success=self._on_paid,
+            on_error=lambda e: self._on_pay_failed(f"Payment failed: {e}"),
+        )
 
-        # process each selected fee
-        for item in selected:
-            fee = item["fee"]
-            try:
-                amount = int(round(float(getattr(fee, "amount", 0))))
-            except Exception:
-                amount = 0
-
-            # mark fee paid (Fee.markPaid does .save())
-            try:
-                fee.markPaid()
-            except Exception:
-                # fallback: attempt to set status and save
-                try:
-                    fee.status = "paid"
-                    fee.save()
-                except Exception as e:
-                    print("Warning: could not mark fee paid:", e)
-
-            # create transaction record
-            try:
-                tx = Transaction(
-                    amount=amount,
-                    method="manual",  # pseudo
-                    student_id=fee.student_id,
-                    fee_id=fee._id,
-                    status="completed",
-                    date=datetime.utcnow(),
-                )
-                tx.save()
-            except Exception as e:
-                print("Warning: transaction save failed:", e)
+    def _on_pay_failed(self, message):
+        self.pay_button.configure(state="normal")
+        self._show_error(message)
 
-            total_paid += amount
-            paid_descriptions.append(fee.description)
+    def _on_paid(self, res):
+        if not res.get("success"):
+            if res.get("skipped_fee_ids"):
+                # Nothing left to pay among the selection: show the real list
+                self._payment_key = None
+                self.load_unpaid_fees()
+            self._on_pay_failed(f"Payment failed: {res.get('message', 'Unknown')}")
+            return
 
-        # reload unpaid fees list
-        self.load_unpaid_fees()
+        self._payment_key = None
+        self.pay_button.configure(state="normal")
+
+        # Apply the result to the list instead of reloading it
+        paid_descriptions = []
+        for fee_id in res.get("paid_fee_ids", []):
+            item = self.fee_items.pop(fee_id, None)
+            if item is not None:
+                paid_descriptions.append(item["fee"].description)
+                item["frame"].destroy()
+
+        if res.get("skipped_fee_ids"):
+            # Someone else changed these fees; fetch the current list
+            self.load_unpaid_fees()
+        elif not self.fee_items:
+            self._show_empty()
+        else:
+            self.update_total()
+
+        total_paid = res.get("total_paid", 0)
 
         # show success dialog
         dialog = ctk.CTkToplevel(self.parent)
@@ -1,10 +1,11 @@
 import customtkinter as ctk
 
-from PIL import Image
 import os
 
 
 from controllers.auth_controller import AuthController
+from utils.avatar_cache import DASHBOARD_SIZE, get_avatar
+from utils.task_executor import run_task
 
 
 class StudentDashboard:
@@ -18,10 +19,12 @@ class StudentDashboard:
         show_update_info_callback=None,
         show_more_info_callback=None,
         logout_callback=None,  # Added logout callback
+        task_executor=None,
     ):
         self.parent = parent
         self.auth_controller = auth_controller
         self.logout_callback = logout_callback
+        self.task_executor = task_executor
 
         self.student_data = {
             "student_id": str(auth_controller.current_account._id),
@@ -120,18 +123,18 @@ class StudentDashboard:
         avatar_label = ctk.CTkLabel(avatar_frame, text="", fg_color="#F0F0F0")
         avatar_label.pack(fill="both", expand=True, padx=3, pady=3)
 
-        # Load student's avatar if available
+        # Load student's avatar if available (cached thumbnail, decoded off
+        # the Tk thread)
         avatar_path = self.student_data.get("avatar")
         if avatar_path and os.path.exists(avatar_path):
-            try:
-                img = Image.open(avatar_path).convert("RGBA")
-                img = img.resize((250, 320), Image.Resampling.LANCZOS)
-                self.avatar_ctk_img = ctk.CTkImage(
-                    light_image=img, dark_image=img, size=(250, 320)
-                )
-                avatar_label.configure(image=self.avatar_ctk_img, text="")
-            except Exception as e:
-                print("Failed to load avatar:", e)
+            run_task(
+                self.task_executor,
+                get_avatar,
+                avatar_path,
+                DASHBOARD_SIZE,
+                on_success=lambda img: self._show_avatar(avatar_label, img),
+                on_error=lambda e: print("Failed to load avatar:", e),
+            )
         else:
             avatar_label.configure(
                 text="No Avatar", font=ctk.CTkFont(size=14, slant="italic")
@@ -276,6 +279,14 @@ class StudentDashboard:
             )
             btn.pack(padx=20, pady=(0, 30), fill="x")
 
+    def _show_avatar(self, avatar_label, img):
+        if img is None or not avatar_label.winfo_exists():
+            return
+        self.avatar_ctk_img = ctk.CTkImage(
+            light_image=img, dark_image=img, size=DASHBOARD_SIZE
+        )
+        avatar_label.configure(image=self.avatar_ctk_img, text="")
+
     def logout(self):
         """Handle logout"""
         if self.logout_callback:
@@ -1,6 +1,7 @@
 import customtkinter as ctk
 
 from controllers.notifications_controller import NotificationsController
+from views.notification_feed import NotificationFeed
 
 
 class StudentDashboardViewNotification:
@@ -10,11 +11,13 @@ class StudentDashboardViewNotification:
         back_callback,
         detail_callback,
         notification_controller: NotificationsController,
+        task_executor=None,
     ):
         self.parent = parent
         self.back_callback = back_callback
         self.detail_callback = detail_callback
         self.notification_controller = notification_controller
+        self.task_executor = task_executor
 
         # Set theme
         ctk.set_appearance_mode("light")
@@ -65,22 +68,28 @@ class StudentDashboardViewNotification:
         )
         self.scrollable_frame.pack(fill="both", expand=True, padx=60, pady=(0, 40))
 
+        # Notifications are loaded a page at a time while scrolling
+        self.feed = NotificationFeed(
+            self.scrollable_frame,
+            page_loader=self.load_page,
+            create_item=self.create_notification_item,
+            task_executor=self.task_executor,
+        )
+
         # Load notifications
         self.load_notifications()
 
     def load_notifications(self):
-        """Load notifications from controller or sample data"""
+        """Load the first page of notifications from the controller"""
         if self.notification_controller:
-            notifications = (
-                self.notification_controller.student_view_all_notifications()
-            )
+            self.feed.reload()
         else:
             # Sample data if no controller
             print("Can not fetch any annoucement datas")
 
-        # Create notification items
-        for notif in notifications:
-            self.create_notification_item(notif)
+    def load_page(self, before):
+        """Runs on the task executor"""
+        return self.notification_controller.get_notifications_page(before=before)
 
     def create_notification_item(self, notification):
         """Create a single notification item"""
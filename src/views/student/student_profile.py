@@ -1,7 +1,8 @@
 import customtkinter as ctk
-from PIL import Image
 
 from controllers.auth_controller import AuthController
+from utils.avatar_cache import PROFILE_SIZE, get_avatar
+from utils.task_executor import run_task
 
 
 class StudentProfile:
@@ -18,9 +19,11 @@ class StudentProfile:
         auth_controller: AuthController,
         back_callback,
         edit_callback,
+        task_executor=None,
     ):
         self.parent = parent
         self.auth_controller = auth_controller
+        self.task_executor = task_executor
 
         self.student_data = {
             "student_id": auth_controller.current_account._id,
@@ -124,43 +127,20 @@ class StudentProfile:
         avatar_label.pack(fill="both", expand=True, padx=3, pady=3)
 
         # --- LOAD AND INSERT AVATAR IMAGE (if available) ---
-        # Insert this block right after avatar_label.pack(...)
+        # Center-cropped to a square, then scaled to the frame's inner size;
+        # the thumbnail is cached and decoded off the Tk thread
         avatar_path = self.student_data.get("avatar")
-        # print(avatar_path)
         if avatar_path:
-            try:
-                from PIL import ImageOps
-
-                img = Image.open(avatar_path).convert("RGBA")
-
-                # Optional: center-crop to square before resizing (keeps aspect ratio)
-                w, h = img.size
-                side = min(w, h)
-                img = ImageOps.fit(
-                    img,
-                    (side, side),
-                    method=Image.Resampling.LANCZOS,
-                    centering=(0.5, 0.5),
-                )
-
-                # Resize to the frame's display size (match avatar_frame inner size)
-                target_size = (
-                    274,
-                    354,
-                )  # same size used elsewhere; adjust if you change frame size
-                img = img.resize(target_size, Image.Resampling.LANCZOS)
-
-                # Wrap with CTkImage so CustomTkinter can scale it on HiDPI displays
-                self._avatar_ctk_image = ctk.CTkImage(
-                    light_image=img, dark_image=img, size=target_size
-                )
-
-                # Set image on label and remove any placeholder text
-                avatar_label.configure(image=self._avatar_ctk_image, text="")
-
-            except Exception as e:
+            run_task(
+                self.task_executor,
+                get_avatar,
+                avatar_path,
+                PROFILE_SIZE,
+                crop_square=True,
+                on_success=lambda img: self._show_avatar(avatar_label, img),
                 # If loading fails, keep existing placeholder and print the error
-                print("Failed to load avatar image:", e)
+                on_error=lambda e: print("Failed to load avatar image:", e),
+            )
 
         avatar_label.pack(fill="both", expand=True, padx=3, pady=3)
 
@@ -217,6 +197,16 @@ class StudentProfile:
         )
         edit_btn.pack(side="right")
 
+    def _show_avatar(self, avatar_label, img):
+        if img is None or not avatar_label.winfo_exists():
+            return
+        # Wrap with CTkImage so CustomTkinter can scale it on HiDPI displays
+        self._avatar_ctk_image = ctk.CTkImage(
+            light_image=img, dark_image=img, size=PROFILE_SIZE
+        )
+        # Set image on label and remove any placeholder text
+        avatar_label.configure(image=self._avatar_ctk_image, text="")
+
     def create_info_field(self, parent, label_text, value_text):
         """Create a single information field display"""
         field_container = ctk.CTkFrame(
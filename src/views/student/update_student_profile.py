@@ -1,10 +1,11 @@
 import customtkinter as ctk
 from tkinter import filedialog
-from PIL import Image
 from datetime import datetime
 
 from controllers.auth_controller import AuthController
 from controllers.student_controller import StudentController
+from utils.avatar_cache import PROFILE_SIZE, get_avatar
+from utils.task_executor import run_task
 
 
 class UpdateStudentProfile:
@@ -22,10 +23,12 @@ class UpdateStudentProfile:
         back_callback,
         auth_controller: AuthController,
         student_controller: StudentController,  # Callback để gọi controller
+        task_executor=None,
     ):
         self.parent = parent
         self.auth_controller = auth_controller
         self.student_controller = student_controller
+        self.task_executor = task_executor
 
         self.back_callback = back_callback
         self.avatar_path = None  # Store new avatar path
@@ -125,19 +128,18 @@ class UpdateStudentProfile:
         )
         self.avatar_label.pack(fill="both", expand=True, padx=3, pady=3)
 
-        # If student already has an avatar, load it using CTkImage (so CTk can scale it)
+        # If student already has an avatar, load its cached thumbnail off the
+        # Tk thread
         if self.student_data.get("avatar"):
-            try:
-                existing_img = Image.open(self.student_data["avatar"]).convert("RGBA")
-                existing_img = existing_img.resize((274, 354), Image.Resampling.LANCZOS)
-                # create CTkImage (supports HiDPI scaling)
-                self._avatar_ctk_image = ctk.CTkImage(
-                    light_image=existing_img, dark_image=existing_img, size=(274, 354)
-                )
-                self.avatar_label.configure(image=self._avatar_ctk_image, text="")
-            except Exception as e:
+            run_task(
+                self.task_executor,
+                get_avatar,
+                self.student_data["avatar"],
+                PROFILE_SIZE,
+                on_success=self._show_avatar,
                 # if loading fails, keep placeholder and optionally log
-                print("Failed to load initial avatar:", e)
+                on_error=lambda e: print("Failed to load initial avatar:", e),
+            )
 
         # Upload button below avatar
         upload_btn = ctk.CTkButton(
@@ -383,32 +385,40 @@ class UpdateStudentProfile:
         )
 
         if file_path:
-            try:
-                # Load and display image
-                image = Image.open(file_path).convert("RGBA")
-                # Resize to fit frame
-                image = image.resize((274, 354), Image.Resampling.LANCZOS)
-
-                # Use CTkImage so CustomTkinter can scale on HiDPI displays
-                ctk_image = ctk.CTkImage(
-                    light_image=image, dark_image=image, size=(274, 354)
-                )
-
-                # Update avatar label
-                self.avatar_label.configure(image=ctk_image, text="")
-                # Keep reference to avoid garbage collection
-                self._avatar_ctk_image = ctk_image
-
-                # Hide placeholder if exists
-                if hasattr(self, "avatar_placeholder"):
-                    self.avatar_placeholder.place_forget()
-
-                # Store path
-                self.avatar_path = file_path
-                print(f"Avatar uploaded: {file_path}")
-
-            except Exception as e:
-                self.show_error_popup(f"Failed to load image: {str(e)}")
+            # Decode and scale off the Tk thread (cached for the other screens)
+            run_task(
+                self.task_executor,
+                get_avatar,
+                file_path,
+                PROFILE_SIZE,
+                on_success=lambda image: self._on_avatar_uploaded(file_path, image),
+                on_error=lambda e: self.show_error_popup(
+                    f"Failed to load image: {str(e)}"
+                ),
+            )
+
+    def _show_avatar(self, image):
+        if image is None or not self.avatar_label.winfo_exists():
+            return False
+        # Use CTkImage so CustomTkinter can scale on HiDPI displays
+        ctk_image = ctk.CTkImage(light_image=image, dark_image=image, size=PROFILE_SIZE)
+        # Update avatar label
+        self.avatar_label.configure(image=ctk_image, text="")
+        # Keep reference to avoid garbage collection
+        self._avatar_ctk_image = ctk_image
+        return True
+
+    def _on_avatar_uploaded(self, file_path, image):
+        if not self._show_avatar(image):
+            return
+
+        # Hide placeholder if exists
+        if hasattr(self, "avatar_placeholder"):
+            self.avatar_placeholder.place_forget()
+
+        # Store path
+        self.avatar_path = file_path
+        print(f"Avatar uploaded: {file_path}")
 
     def validate_data(self):
         """Validate all input data"""
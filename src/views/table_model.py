@@ -0,0 +1,244 @@
+"""
+Backing data for VirtualTable: holds every row in memory as a tuple and keeps
+a filtered/sorted "view" (a list of row indices). The widget only ever asks
+for the slice of the view that is on screen, so no Tk item exists for rows
+that are not visible. Rows are also indexed by key (and by view position), so
+finding, editing or selecting a row does not scan the table.
+
+Kept free of Tk so it can be unit tested.
+"""
+
+
+def _sort_key(value):
+    """Numbers sort numerically, everything else case-insensitively."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value, "")
+    text = "" if value is None else str(value)
+    try:
+        return (0, float(text), "")
+    except ValueError:
+        return (1, 0, text.lower())
+
+
+class TableModel:
+    """
+    Rows + column filters + sort order.
+
+    Args:
+        columns (sequence): Column names
+        key_index (int): Column holding the row's unique id (e.g. the _id)
+    """
+
+    def __init__(self, columns, key_index=0):
+        self.columns = tuple(columns)
+        self.key_index = key_index
+        self._rows = []
+        self._filters = {}  # column index -> lower-cased text
+        self._sort = None  # (column index, descending)
+        self._view = []
+        self._originals = {}  # key -> row as loaded, for rows edited since
+        self._index_by_key = {}  # key -> index in _rows
+        self._position_by_index = {}  # index in _rows -> position in _view
+
+    # -------------------------
+    # Rows
+    # -------------------------
+    def set_rows(self, rows):
+        """Replace every row (and forget pending edits)"""
+        self._rows = [tuple(row) for row in rows]
+        self._originals = {}
+        self._reindex_keys()
+        self._refresh()
+
+    def append_rows(self, rows):
+        """Add rows at the end (e.g. the next page of a paged source)"""
+        start = len(self._rows)
+        self._rows.extend(tuple(row) for row in rows)
+        for i in range(start, len(self._rows)):
+            self._index_by_key.setdefault(self.key_of(self._rows[i]), i)
+        if self._sort is not None:
+            self._refresh()
+            return
+        for i in range(start, len(self._rows)):
+            if self._matches(self._rows[i]):
+                self._position_by_index[i] = len(self._view)
+                self._view.append(i)
+
+    def add_row(self, values):
+        self.append_rows([values])
+
+    def clear(self):
+        self._rows = []
+        self._view = []
+        self._originals = {}
+        self._index_by_key = {}
+        self._position_by_index = {}
+
+    def rows(self):
+        """All rows in source order, ignoring filters"""
+        return list(self._rows)
+
+    def key_of(self, row):
+        return str(row[self.key_index])
+
+    def find(self, key):
+        """Row with this key, or None"""
+        index = self._source_index(key)
+        return self._rows[index] if index is not None else None
+
+    def update_row(self, key, values):
+        """
+        Replace the row with this key; returns False if it does not exist.
+        The row is marked dirty until mark_clean() (editing it back to its
+        loaded values clears the mark).
+        """
+        index = self._source_index(key)
+        if index is None:
+            return False
+        previous = self._rows[index]
+        key = self.key_of(previous)
+        values = tuple(values)
+        original = self._originals.setdefault(key, previous)
+        if values == original:
+            del self._originals[key]
+        self._rows[index] = values
+
+        new_key = self.key_of(values)
+        if new_key != key:
+            del self._index_by_key[key]
+            self._index_by_key.setdefault(new_key, index)
+
+        # Patched in place unless the edit moves the row in or out of the
+        # filter or changes its sort position
+        if self._matches(values) != self._matches(previous) or (
+            self._sort is not None
+            and self._sort_value(values) != self._sort_value(previous)
+        ):
+            self._refresh()
+        return True
+
+    def remove_row(self, key):
+        """Remove the row with this key; returns False if it does not exist"""
+        index = self._source_index(key)
+        if index is None:
+            return False
+        self._originals.pop(self.key_of(self._rows[index]), None)
+        del self._rows[index]
+        self._reindex_keys()
+        self._refresh()
+        return True
+
+    # -------------------------
+    # Dirty tracking
+    # -------------------------
+    def dirty_rows(self):
+        """[(original row, current row)] for every row edited since loading"""
+        dirty = []
+        for key, original in self._originals.items():
+            current = self.find(key)
+            if current is not None:
+                dirty.append((original, current))
+        return dirty
+
+    def mark_clean(self, keys=None):
+        """Accept the current values of these rows (all rows by default)"""
+        if keys is None:
+            self._originals = {}
+            return
+        for key in keys:
+            self._originals.pop(str(key), None)
+
+    @property
+    def is_dirty(self):
+        return bool(self._originals)
+
+    def _source_index(self, key):
+        return self._index_by_key.get(str(key))
+
+    def _reindex_keys(self):
+        self._index_by_key = {}
+        for i, row in enumerate(self._rows):
+            self._index_by_key.setdefault(self.key_of(row), i)
+
+    # -------------------------
+    # View (filtered + sorted)
+    # -------------------------
+    def __len__(self):
+        return len(self._view)
+
+    def row(self, view_index):
+        return self._rows[self._view[view_index]]
+
+    def window(self, offset, count):
+        """Rows [offset, offset + count) of the view"""
+        return [self._rows[i] for i in self._view[offset : offset + count]]
+
+    def index_of(self, key):
+        """Position of the row with this key in the view, or None"""
+        index = self._source_index(key)
+        if index is None:
+            return None
+        return self._position_by_index.get(index)
+
+    @property
+    def total_rows(self):
+        return len(self._rows)
+
+    # -------------------------
+    # Filtering / sorting
+    # -------------------------
+    def set_filter(self, column, text):
+        """Keep rows whose `column` contains `text` (case-insensitive)"""
+        index = self._column_index(column)
+        text = (text or "").strip().lower()
+        if text:
+            self._filters[index] = text
+        else:
+            self._filters.pop(index, None)
+        self._refresh()
+
+    def clear_filters(self):
+        self._filters = {}
+        self._refresh()
+
+    def sort_by(self, column, descending=None):
+        """
+        Sort the view by `column`. Without `descending`, clicking the same
+        column again flips the direction. Returns the direction used.
+        """
+        index = self._column_index(column)
+        if descending is None:
+            descending = self._sort == (index, False)
+        self._sort = (index, descending)
+        self._refresh()
+        return descending
+
+    @property
+    def sort_state(self):
+        """(column name, descending) or None"""
+        if self._sort is None:
+            return None
+        return self.columns[self._sort[0]], self._sort[1]
+
+    def _column_index(self, column):
+        return column if isinstance(column, int) else self.columns.index(column)
+
+    def _matches(self, row):
+        for index, text in self._filters.items():
+            value = row[index] if index < len(row) else ""
+            if text not in str(value).lower():
+                return False
+        return True
+
+    def _sort_value(self, row):
+        index = self._sort[0]
+        return _sort_key(row[index] if index < len(row) else None)
+
+    def _refresh(self):
+        self._view = [i for i, row in enumerate(self._rows) if self._matches(row)]
+        if self._sort is not None:
+            self._view.sort(
+                key=lambda i: self._sort_value(self._rows[i]),
+                reverse=self._sort[1],
+            )
+        self._position_by_index = {i: p for p, i in enumerate(self._view)}
@@ -0,0 +1,161 @@
+"""
+View cache used by MainApp for navigation.
+
+Rebuilding a screen (fonts, frames, tables, images) and re-fetching all of
+its data on every visit makes going back and forth between screens slow.
+ViewCache keeps the screens it has built alive in their own host frame and
+only hides them (pack_forget) when another screen is shown. Going back to a
+cached screen just packs its frame again; its data is refreshed only when it
+is stale:
+    - older than the route's max_age (seconds; 0 = refresh on every visit,
+      None = never by age)
+    - or explicitly invalidated (e.g. after the data changed elsewhere)
+
+Cached screens are evicted least-recently-used first when there are more
+than max_views of them or their widgets together exceed widget_budget (the
+widget count is used as a proxy for the memory a screen holds).
+"""
+
+import time
+
+# Refresh a cached screen's data when it is shown after this many seconds
+DEFAULT_MAX_AGE = 60.0
+
+
+class CachedView:
+    """A built screen together with its refresh rule"""
+
+    def __init__(self, key, host, view, refresh, max_age, cache, now):
+        self.key = key
+        self.host = host
+        self.view = view
+        self.refresh = refresh
+        self.max_age = max_age
+        self.cache = cache
+        self.refreshed_at = now
+        self.cost = 0
+
+    def is_stale(self, now):
+        if self.refreshed_at is None:
+            return True
+        return self.max_age is not None and now - self.refreshed_at >= self.max_age
+
+
+def count_widgets(widget):
+    """Number of widgets below `widget` (including itself)"""
+    count, stack = 0, [widget]
+    while stack:
+        count += 1
+        stack.extend(stack.pop().winfo_children())
+    return count
+
+
+class ViewCache:
+    """
+    Args:
+        make_host (callable): Creates an empty, unpacked frame in the app
+            container for a new screen
+        max_views (int): Cached screens kept at most (besides the shown one)
+        widget_budget (int): Widgets kept at most over all cached screens
+        clock (callable): Time source in seconds
+    """
+
+    def __init__(
+        self, make_host, max_views=6, widget_budget=6000, clock=time.monotonic
+    ):
+        self.make_host = make_host
+        self.max_views = max_views
+        self.widget_budget = widget_budget
+        self.clock = clock
+        self._entries = {}  # key -> CachedView, least recently used first
+        self._current = None
+
+    @property
+    def current_key(self):
+        return self._current.key if self._current is not None else None
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def show(self, key, build, refresh=None, max_age=DEFAULT_MAX_AGE, cache=True):
+        """
+        Show the screen `key`, building it with build(host) if it is not
+        cached. A cached screen is refreshed with refresh(view) when stale.
+
+        Args:
+            cache (bool): False for screens that must be built fresh each time
+                (forms, per-item detail pages); they are destroyed on leave
+
+        Returns:
+            The view object
+        """
+        self._leave()
+        now = self.clock()
+
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._entries[key] = entry  # most recently used
+            entry.host.pack(fill="both", expand=True)
+            if entry.refresh is not None and entry.is_stale(now):
+                entry.refresh(entry.view)
+                entry.refreshed_at = now
+        else:
+            host = self.make_host()
+            host.pack(fill="both", expand=True)
+            view = build(host)
+            entry = CachedView(key, host, view, refresh, max_age, cache, now)
+            if cache:
+                self._entries[key] = entry
+
+        self._current = entry
+        self._evict()
+        return entry.view
+
+    def invalidate(self, *keys):
+        """Refresh these screens (all when no key is given) on their next show"""
+        for key in keys or list(self._entries):
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshed_at = None
+
+    def evict(self, *keys):
+        """Destroy these cached screens (all when no key is given)"""
+        for key in keys or list(self._entries):
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                continue
+            if entry is self._current:
+                self._current = None
+            entry.host.destroy()
+
+    def clear(self):
+        """Destroy every screen, the shown one included"""
+        self._leave()
+        self.evict()
+
+    def _leave(self):
+        entry, self._current = self._current, None
+        if entry is None:
+            return
+        if entry.cache and self._entries.get(entry.key) is entry:
+            # Fully loaded by now: measure what keeping it costs
+            entry.cost = count_widgets(entry.host)
+            entry.host.pack_forget()
+        else:
+            entry.host.destroy()
+
+    def _evict(self):
+        def over_budget():
+            hidden = [e for e in self._entries.values() if e is not self._current]
+            return (
+                len(hidden) > self.max_views
+                or sum(e.cost for e in hidden) > self.widget_budget
+            )
+
+        while over_budget():
+            oldest = next(e for e in self._entries.values() if e is not self._current)
+            print(f"♻️ [views] evicting '{oldest.key}' ({oldest.cost} widgets)")
+            self.evict(oldest.key)
@@ -0,0 +1,403 @@
+"""
+Virtual table used by the admin management screens.
+
+A plain ttk.Treeview with one item per row needs seconds (and a lot of
+memory) to show 100k rows. VirtualTable keeps the rows in a TableModel and
+only creates Treeview items for the rows that fit on screen; scrolling just
+re-fills those few items. It also supports:
+    - sorting by clicking a column heading
+    - per-column text filters
+    - lazy page fetching from a paged data source (page_loader)
+"""
+
+import customtkinter as ctk
+from tkinter import ttk
+
+from utils.task_executor import run_task
+from views.table_model import TableModel
+
+
+class VirtualTable:
+    """
+    Args:
+        parent: Container widget
+        columns (sequence): Column names
+        headings (dict): Optional column -> heading text
+        column_options (dict): Optional column -> ttk column options
+            (width, minwidth, anchor)
+        key_index (int): Column holding the row id
+        show_filters (bool): Show a filter entry per column
+        sortable (bool): Sort when a heading is clicked
+        page_loader (callable): page_loader(cursor) -> {"rows": [...],
+            "next_cursor": ..., "has_more": bool, "total": int | None};
+            runs on task_executor. Paged sources are shown in server order,
+            so sorting/filtering should be done by the loader instead.
+        task_executor: utils.task_executor.TaskExecutor (optional)
+    """
+
+    ROW_HEIGHT = 30
+    # Fetch the next page when this many loaded rows are left below the window
+    PREFETCH_ROWS = 20
+    # Apply a column filter once typing pauses for this long
+    FILTER_DELAY_MS = 250
+    # Own ttk style, so the app-wide "Treeview" style and theme are untouched
+    STYLE = "Virtual.Treeview"
+    _styled = set()  # Tk interpreters where STYLE is configured
+
+    def __init__(
+        self,
+        parent,
+        columns,
+        headings=None,
+        column_options=None,
+        key_index=0,
+        show_filters=True,
+        sortable=True,
+        page_loader=None,
+        task_executor=None,
+    ):
+        self.columns = tuple(columns)
+        self.headings = headings or {}
+        self.model = TableModel(self.columns, key_index=key_index)
+        self.sortable = sortable and page_loader is None
+        self.page_loader = page_loader
+        self.task_executor = task_executor
+
+        self.offset = 0  # view index of the first rendered row
+        self.visible_rows = 12
+        self._selected_key = None
+        self._iid_to_index = {}
+        self._filter_job = None
+        self._pending_filters = set()
+
+        # Paging state
+        self._next_cursor = None
+        self._has_more = False
+        self._loading = False
+        self._total = None
+        self._generation = 0  # bumped on reload so stale pages are ignored
+
+        self._configure_style()
+
+        self.frame = ctk.CTkFrame(parent, fg_color="white")
+        self.frame.pack(fill="both", expand=True, padx=2, pady=2)
+
+        if show_filters:
+            self._build_filters(column_options or {})
+
+        tree_frame = ctk.CTkFrame(self.frame, fg_color="white")
+        tree_frame.pack(fill="both", expand=True)
+
+        self.scrollbar = ttk.Scrollbar(tree_frame, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree = ttk.Treeview(
+            tree_frame,
+            columns=self.columns,
+            show="headings",
+            height=self.visible_rows,
+            selectmode="browse",
+            style=self.STYLE,
+        )
+        for col in self.columns:
+            heading = {"text": self.headings.get(col, col)}
+            if self.sortable:
+                heading["command"] = lambda c=col: self.sort_by(c)
+            self.tree.heading(col, **heading)
+            options = {"width": 120, "minwidth": 100, "anchor": "w"}
+            options.update((column_options or {}).get(col, {}))
+            self.tree.column(col, **options)
+        self.tree.pack(fill="both", expand=True)
+
+        self.status_label = ctk.CTkLabel(
+            self.frame,
+            text="",
+            font=ctk.CTkFont(family="Arial", size=12),
+            text_color="gray",
+        )
+        self.status_label.pack(anchor="e", padx=10)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self.visible_rows))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self.visible_rows))
+
+    def _configure_style(self):
+        style = ttk.Style()
+        if style.tk in VirtualTable._styled:
+            return  # already configured for this Tk interpreter
+        VirtualTable._styled.add(style.tk)
+        style.configure(
+            self.STYLE,
+            background="white",
+            foreground="black",
+            rowheight=self.ROW_HEIGHT,
+            fieldbackground="white",
+            font=("Arial", 11),
+        )
+        style.configure(
+            f"{self.STYLE}.Heading",
+            background="#F0F0F0",
+            foreground="black",
+            font=("Arial", 12, "bold"),
+        )
+        style.map(self.STYLE, background=[("selected", "#0078D7")])
+
+    def _build_filters(self, column_options):
+        filter_frame = ctk.CTkFrame(self.frame, fg_color="white")
+        filter_frame.pack(fill="x", pady=(0, 4))
+        self.filter_entries = {}
+        for col in self.columns:
+            width = column_options.get(col, {}).get("width", 120)
+            entry = ctk.CTkEntry(
+                filter_frame,
+                width=width,
+                height=26,
+                placeholder_text=f"Filter {self.headings.get(col, col)}",
+            )
+            entry.pack(side="left", padx=(0, 2))
+            entry.bind("<KeyRelease>", lambda e, c=col: self._on_filter(c))
+            self.filter_entries[col] = entry
+
+    # -------------------------
+    # Data
+    # -------------------------
+    def set_rows(self, rows):
+        """Show these rows (in-memory source)"""
+        self.model.set_rows(rows)
+        self.offset = 0
+        self.refresh()
+
+    def add_row(self, values):
+        self.model.add_row(values)
+        self.refresh()
+
+    def update_row(self, key, values):
+        """Replace a row; it stays in dirty_rows() until mark_clean()"""
+        updated = self.model.update_row(key, values)
+        self.refresh()
+        return updated
+
+    def remove_row(self, key):
+        removed = self.model.remove_row(key)
+        if str(key) == self._selected_key:
+            self._selected_key = None
+        self.refresh()
+        return removed
+
+    def clear(self):
+        self.model.clear()
+        self.offset = 0
+        self._selected_key = None
+        self.refresh()
+
+    def rows(self):
+        """Every row, ignoring filters"""
+        return self.model.rows()
+
+    def find(self, key):
+        return self.model.find(key)
+
+    def dirty_rows(self):
+        """[(original row, current row)] for rows edited since loading"""
+        return self.model.dirty_rows()
+
+    def mark_clean(self, keys=None):
+        self.model.mark_clean(keys)
+
+    def selected_row(self):
+        """Values of the selected row, or None"""
+        if self._selected_key is None:
+            return None
+        return self.model.find(self._selected_key)
+
+    def bind(self, sequence, func):
+        """Bind an event on the underlying Treeview (e.g. "<Double-1>")"""
+        self.tree.bind(sequence, func, add="+")
+
+    # -------------------------
+    # Paged source
+    # -------------------------
+    def reload(self):
+        """Drop loaded rows and fetch the first page from page_loader"""
+        self._generation += 1
+        self._next_cursor = None
+        self._has_more = False
+        self._loading = False
+        self._total = None
+        self.clear()
+        self._has_more = True
+        self._fetch_page()
+
+    def _maybe_fetch_more(self):
+        remaining = len(self.model) - (self.offset + self.visible_rows)
+        if (
+            self.page_loader is not None
+            and self._has_more
+            and not self._loading
+            and remaining <= self.PREFETCH_ROWS
+        ):
+            self._fetch_page()
+
+    def _fetch_page(self):
+        generation = self._generation
+        self._loading = True
+        self._update_status()
+        run_task(
+            self.task_executor,
+            self.page_loader,
+            self._next_cursor,
+            on_success=lambda page: self._on_page(page, generation),
+            on_error=lambda e: self._on_page_error(e, generation),
+        )
+
+    def _on_page(self, page, generation):
+        if generation != self._generation:
+            return  # reloaded while this page was loading
+        self._loading = False
+        self._next_cursor = page.get("next_cursor")
+        self._has_more = bool(page.get("has_more"))
+        if page.get("total") is not None:
+            self._total = page["total"]
+        self.model.append_rows(page.get("rows", []))
+        self.refresh()
+
+    def _on_page_error(self, error, generation):
+        if generation != self._generation:
+            return
+        self._loading = False
+        self._has_more = False
+        print(f"Error loading table page: {error}")
+        self.refresh()
+
+    # -------------------------
+    # Sorting / filtering
+    # -------------------------
+    def sort_by(self, column):
+        descending = self.model.sort_by(column)
+        for col in self.columns:
+            text = self.headings.get(col, col)
+            if col == column:
+                text += " ▼" if descending else " ▲"
+            self.tree.heading(col, text=text)
+        self.offset = 0
+        self.refresh()
+
+    def _on_filter(self, column):
+        """Debounce typing: filtering re-scans every row"""
+        self._pending_filters.add(column)
+        if self._filter_job is not None:
+            self.frame.after_cancel(self._filter_job)
+        self._filter_job = self.frame.after(self.FILTER_DELAY_MS, self._apply_filters)
+
+    def _apply_filters(self):
+        self._filter_job = None
+        columns, self._pending_filters = self._pending_filters, set()
+        for column in columns:
+            self.model.set_filter(column, self.filter_entries[column].get())
+        self.offset = 0
+        self.refresh()
+
+    # -------------------------
+    # Rendering
+    # -------------------------
+    def refresh(self):
+        """Re-render the visible window"""
+        max_offset = max(len(self.model) - self.visible_rows, 0)
+        self.offset = max(0, min(self.offset, max_offset))
+
+        self.tree.delete(*self.tree.get_children())
+        self._iid_to_index = {}
+        selected_iid = None
+        for i, row in enumerate(self.model.window(self.offset, self.visible_rows)):
+            iid = self.tree.insert("", "end", values=row)
+            self._iid_to_index[iid] = self.offset + i
+            if self.model.key_of(row) == self._selected_key:
+                selected_iid = iid
+        if selected_iid is not None:
+            self.tree.selection_set(selected_iid)
+
+        self._update_scrollbar()
+        self._update_status()
+        self._maybe_fetch_more()
+
+    def _update_scrollbar(self):
+        total = len(self.model)
+        if total <= self.visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(
+                self.offset / total, (self.offset + self.visible_rows) / total
+            )
+
+    def _update_status(self):
+        shown = len(self.model)
+        if self.page_loader is not None:
+            text = f"Loaded {shown}"
+            if self._total is not None:
+                text += f" of {self._total}"
+            if self._loading:
+                text += " (loading...)"
+        elif shown != self.model.total_rows:
+            text = f"{shown} of {self.model.total_rows} rows"
+        else:
+            text = f"{shown} rows"
+        self.status_label.configure(text=text)
+
+    def _scroll_to(self, offset):
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def _scroll_by(self, rows):
+        self._scroll_to(self.offset + rows)
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        total = len(self.model)
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * total))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self._scroll_by(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        heading_height = self.ROW_HEIGHT
+        rows = max(1, (event.height - heading_height) // self.ROW_HEIGHT)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.refresh()
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self._iid_to_index:
+            row = self.model.row(self._iid_to_index[selection[0]])
+            self._selected_key = self.model.key_of(row)
+
+    def _move_selection(self, delta):
+        """Keyboard navigation across the whole view, not just the window"""
+        if not len(self.model):
+            return "break"
+        current = (
+            self.model.index_of(self._selected_key)
+            if self._selected_key is not None
+            else None
+        )
+        target = 0 if current is None else current + delta
+        target = max(0, min(target, len(self.model) - 1))
+        self._selected_key = self.model.key_of(self.model.row(target))
+
+        if target < self.offset:
+            self.offset = target
+        elif target >= self.offset + self.visible_rows:
+            self.offset = target - self.visible_rows + 1
+        self.refresh()
+        return "break"
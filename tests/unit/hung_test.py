@@ -151,6 +151,125 @@ def test_account_save_insert_and_update_and_delete(monkeypatch):
     assert a.delete() is False
 
 
+def test_update_password_is_not_saved_again(monkeypatch):
+    from unittest.mock import MagicMock
+
+    fake = MagicMock()
+    monkeypatch.setattr(account_module, "ACCOUNTS_COLLECTION", fake)
+    account = Account.from_document(
+        {
+            "_id": "sid1",
+            "username": "u1",
+            "email": "u1@example.com",
+            "role": "student",
+            "password_hash": "old$hash",
+        }
+    )
+
+    account.update_password("new-password")
+    account.email = "new@example.com"
+    account.save()
+
+    # save() chỉ gửi field vừa sửa, không gửi lại password_hash
+    assert fake.update_one.call_args.args[1] == {"$set": {"email": "new@example.com"}}
+    assert check_password("new-password", account.password_hash)
+
+
+def test_find_id_by_username_uses_cache_and_invalidates(monkeypatch):
+    from unittest.mock import MagicMock
+
+    fake = MagicMock()
+    fake.find_one.return_value = {"_id": "sid1", "role": "student"}
+    monkeypatch.setattr(account_module, "ACCOUNTS_COLLECTION", fake)
+    account_module.invalidate_username_cache()
+
+    assert Account.find_id_by_username("sv1", role="student") == "sid1"
+    assert Account.find_id_by_username("sv1", role="student") == "sid1"
+    # lần thứ hai lấy từ cache, không query lại
+    fake.find_one.assert_called_once()
+    # sai role -> None
+    assert Account.find_id_by_username("sv1", role="admin") is None
+
+    # xóa account -> cache bị vô hiệu hóa
+    account_module.invalidate_username_cache(account_id="sid1")
+    Account.find_id_by_username("sv1")
+    assert fake.find_one.call_count == 2
+
+
+def test_bulk_update_fields_reports_invalid_id_per_row(monkeypatch):
+    from unittest.mock import MagicMock
+    from bson import ObjectId
+
+    fake = MagicMock()
+    fake.bulk_write.return_value.matched_count = 1
+    monkeypatch.setattr(account_module, "ACCOUNTS_COLLECTION", fake)
+    good = str(ObjectId())
+
+    result = Account.bulk_update_fields(
+        {good: {"contact": "0987654321"}, "20251234": {"contact": "0123456789"}},
+        role="student",
+    )
+
+    # id giữ chỗ (StudentID) chỉ làm hỏng dòng của nó, dòng còn lại vẫn được ghi
+    assert result == {good: None, "20251234": "Invalid account id"}
+    ops = fake.bulk_write.call_args.args[0]
+    assert len(ops) == 1
+    assert ops[0]._filter == {"_id": ObjectId(good), "role": "student"}
+
+
+def test_search_by_role_uses_collated_prefix_range(monkeypatch):
+    from unittest.mock import MagicMock
+
+    fake = MagicMock()
+    fake.find.return_value.sort.return_value.skip.return_value.limit.return_value = [
+        {"_id": "sid1", "username": "Nguyen"}
+    ]
+    monkeypatch.setattr(account_module, "ACCOUNTS_COLLECTION", fake)
+
+    docs = Account.search_by_role("student", " ngu ", projection={"username": 1})
+
+    assert docs == [{"_id": "sid1", "username": "Nguyen"}]
+    query, projection = fake.find.call_args.args
+    # Khoảng [prefix, prefix + \uffff) thay cho $regex không phân biệt hoa thường
+    assert query["role"] == "student"
+    assert query["$or"][0] == {"username": {"$gte": "ngu", "$lt": "ngu\uffff"}}
+    assert "$regex" not in str(query)
+    assert fake.find.call_args.kwargs["collation"] == account_module.SEARCH_COLLATION
+    # Mỗi trường tìm kiếm có index với cùng collation
+    collated = {
+        m.document["name"]
+        for m in account_module.ACCOUNT_INDEXES
+        if m.document.get("collation") == account_module.SEARCH_COLLATION.document
+    }
+    assert collated == {"role_username_ci", "role_email_ci", "role_fullName_ci"}
+
+
+def test_password_hash_is_loaded_lazily(monkeypatch):
+    from unittest.mock import MagicMock
+
+    fake = MagicMock()
+    fake.find.return_value = [
+        {"_id": "sid1", "username": "sv1", "email": "a@x", "role": "student"}
+    ]
+    fake.find_one.return_value = {"_id": "sid1", "password_hash": "salt$hash"}
+    monkeypatch.setattr(account_module, "ACCOUNTS_COLLECTION", fake)
+
+    # Danh sách: projection bỏ password_hash, không find_one cho từng account
+    students = Account.find_all_students()
+    assert fake.find.call_args.args[1] == {"password_hash": 0}
+    assert students[0].fullName is None
+    fake.find_one.assert_not_called()
+
+    # Chỉ query khi thật sự cần, và chỉ một lần
+    assert students[0].password_hash == "salt$hash"
+    assert students[0].password_hash == "salt$hash"
+    fake.find_one.assert_called_once()
+
+    # Hash vừa load không bị coi là thay đổi khi save()
+    students[0].save()
+    fake.update_one.assert_not_called()
+
+
 #  ========================================================================================================================
 
 
@@ -301,6 +420,88 @@ def test_find_by_id_returns_none(monkeypatch):
     assert ann is None
 
 
+# ✅ Test iter_page: keyset theo (createAt, _id), mới nhất trước
+def test_iter_page_uses_keyset_after_cursor(monkeypatch):
+    from unittest.mock import MagicMock
+
+    fake = MagicMock()
+    cursor = fake.find.return_value
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = iter([])
+    monkeypatch.setattr("models.announcement.ANNOUNCEMENTS_COLLECTION", fake)
+
+    created, last_id = datetime(2025, 1, 10), ObjectId()
+    assert list(Announcement.iter_page(21, before=(created, last_id))) == []
+
+    query = fake.find.call_args.args[0]
+    assert query["status"] == "published"
+    assert query["$or"] == [
+        {"createAt": {"$lt": created}},
+        {"createAt": created, "_id": {"$lt": last_id}},
+    ]
+    cursor.sort.assert_called_once_with([("createAt", -1), ("_id", -1)])
+    cursor.limit.assert_called_once_with(21)
+
+
+# ✅ Test preview: lưu kèm thông báo, cập nhật khi content đổi
+def test_announcement_preview_follows_content(monkeypatch):
+    from unittest.mock import MagicMock
+    from models.announcement import PREVIEW_LENGTH, SUMMARY_PROJECTION
+
+    fake = MagicMock()
+    monkeypatch.setattr("models.announcement.ANNOUNCEMENTS_COLLECTION", fake)
+
+    ann = Announcement.from_document(
+        {"_id": ObjectId(), "title": "T", "content": "Ngắn\ngọn", "createBy": "a"}
+    )
+    assert ann.preview == "Ngắn gọn"
+
+    ann.edit({"content": "x" * 1000})
+    changes = fake.update_one.call_args.args[1]["$set"]
+    assert len(changes["preview"]) == PREVIEW_LENGTH
+    assert changes["preview"].endswith("...")
+
+    # Màn hình danh sách không tải content
+    assert "content" not in SUMMARY_PROJECTION and "preview" in SUMMARY_PROJECTION
+
+
+# ✅ Test preview của thông báo cũ (chưa lưu preview) được ghi xuống DB
+def test_legacy_announcement_preview_is_persisted(monkeypatch):
+    from unittest.mock import MagicMock
+    from models.announcement import backfill_previews
+
+    fake = MagicMock()
+    monkeypatch.setattr("models.announcement.ANNOUNCEMENTS_COLLECTION", fake)
+
+    legacy = Announcement.from_document(
+        {"_id": ObjectId(), "title": "T", "content": "A\n b", "createBy": "a"}
+    )
+    legacy.publish()
+    assert fake.update_one.call_args.args[1]["$set"]["preview"] == "A b"
+
+    # Preview đã lưu thì không bị tính lại khi content không đổi
+    stored = Announcement.from_document(
+        {
+            "_id": ObjectId(),
+            "title": "T",
+            "content": "A b",
+            "createBy": "a",
+            "preview": "custom",
+            "status": "draft",
+        }
+    )
+    stored.publish()
+    assert fake.update_one.call_args.args[1] == {"$set": {"status": "published"}}
+
+    # Backfill: ghi preview cho mọi thông báo chưa có
+    fake.find.return_value = [{"_id": 1, "content": "x"}, {"_id": 2}]
+    fake.bulk_write.return_value.modified_count = 2
+    assert backfill_previews() == 2
+    ops = fake.bulk_write.call_args.args[0]
+    assert [op._doc["$set"]["preview"] for op in ops] == ["x", ""]
+    assert fake.find.call_args.args[0] == {"preview": {"$exists": False}}
+
+
 #  ========================================================================================================================
 
 
@@ -343,6 +544,61 @@ def test_close_connection(monkeypatch):
     mock_client.close.assert_called_once()
 
 
+def test_lazy_collection_resolves_on_first_call():
+    """Kiểm tra collection chỉ kết nối khi được gọi lần đầu"""
+    from models.database import LazyCollection
+
+    fake_db = MagicMock()
+    lazy = LazyCollection(fake_db, "fees")
+
+    find_one = lazy.find_one  # lấy method không kết nối
+    fake_db.get_db.assert_not_called()
+
+    find_one({"_id": 1})
+    lazy.count_documents({})
+    fake_db.get_db.assert_called_once()
+    fake_db.get_db.return_value["fees"].find_one.assert_called_once_with({"_id": 1})
+
+
+def test_pool_stats_listener_tracks_checkouts():
+    """Kiểm tra PoolStatsListener đếm kết nối đang dùng và thời gian chờ"""
+    from types import SimpleNamespace
+    from models.database import PoolStatsListener
+
+    listener = PoolStatsListener()
+    event = SimpleNamespace(duration=0.002)
+
+    listener.connection_created(event)
+    listener.connection_check_out_started(event)
+    listener.connection_checked_out(event)
+    listener.connection_check_out_started(event)
+    listener.connection_checked_out(event)
+    listener.connection_checked_in(event)
+
+    stats = listener.snapshot()
+    assert stats["connections_open"] == 1
+    assert stats["checked_out"] == 1
+    assert stats["max_checked_out"] == 2
+    assert stats["checkouts"] == 2
+    assert stats["avg_wait_ms"] == pytest.approx(2.0)
+
+
+def test_mongo_client_options_from_env(monkeypatch):
+    """Kiểm tra cấu hình pool/timeout đọc từ biến môi trường"""
+    from utils.config import get_mongo_client_options
+
+    monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "7")
+    monkeypatch.setenv("MONGO_RETRY_WRITES", "false")
+    monkeypatch.setenv("MONGO_COMPRESSORS", "zlib,unknown")
+    monkeypatch.setenv("MONGO_SOCKET_TIMEOUT_MS", "abc")
+
+    options = get_mongo_client_options()
+    assert options["maxPoolSize"] == 7
+    assert options["retryWrites"] is False
+    assert options["compressors"] == "zlib"
+    assert options["socketTimeoutMS"] == 20000
+
+
 #  ========================================================================================================================
 
 import pytest
@@ -380,10 +636,61 @@ def test_save_update(mock_collection):
     fee_id = ObjectId()
     fee = Fee("Update test", 300, ObjectId(), "2025-06-01", "HK3 2025", _id=fee_id)
 
+    # Chưa có snapshot -> ghi toàn bộ field (trừ _id)
     fee.save()
+    expected = {k: v for k, v in fee.to_document().items() if k != "_id"}
+    mock_collection.update_one.assert_called_once_with(
+        {"_id": fee_id}, {"$set": expected}
+    )
+
+
+@patch("models.fee.FEES_COLLECTION")
+def test_save_only_sets_changed_fields(mock_collection):
+    """Fee load từ DB: save() chỉ $set field thay đổi, không đổi thì không ghi"""
+    fee_id = ObjectId()
+    mock_collection.find_one.return_value = {
+        "_id": fee_id,
+        "description": "Test",
+        "amount": 100,
+        "student_id": ObjectId(),
+        "dueDate": "2025-06-01",
+        "period": "HK1 2025",
+        "status": "pending",
+    }
+    fee = Fee.find_by_id(fee_id)
+
+    fee.save()
+    mock_collection.update_one.assert_not_called()
+
+    fee.markPaid()
     mock_collection.update_one.assert_called_once_with(
-        {"_id": fee_id}, {"$set": vars(fee)}
+        {"_id": fee_id}, {"$set": {"status": "paid"}}
     )
+    assert not fee.is_dirty
+    assert "_loaded_state" not in fee.to_document()
+
+
+@patch("models.fee.FEES_COLLECTION")
+def test_iter_by_student_id_streams_with_batch_limit_and_projection(mock_collection):
+    """iter_by_student_id: batch_size/skip/limit/projection, trả document thô"""
+    student_id = ObjectId()
+    cursor = MagicMock()
+    cursor.skip.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.__iter__.return_value = iter([{"_id": ObjectId(), "amount": 100}])
+    mock_collection.find.return_value = cursor
+
+    rows = Fee.iter_by_student_id(
+        str(student_id), projection={"amount": 1}, batch_size=50, limit=10, skip=20
+    )
+    mock_collection.find.assert_not_called()  # generator: chưa query
+
+    assert [doc["amount"] for doc in rows] == [100]
+    mock_collection.find.assert_called_once_with(
+        {"student_id": student_id}, {"amount": 1}, batch_size=50
+    )
+    cursor.skip.assert_called_once_with(20)
+    cursor.limit.assert_called_once_with(10)
 
 
 @patch("models.fee.FEES_COLLECTION")
@@ -457,3 +764,613 @@ def test_find_by_id_not_found(mock_collection):
     mock_collection.find_one.return_value = None
     result = Fee.find_by_id(ObjectId())
     assert result is None
+
+
+#  ========================================================================================================================
+
+import pytest
+from unittest.mock import MagicMock
+from models import indexes as indexes_module
+
+
+def _fake_database(existing_by_collection):
+    database = {}
+    for name in indexes_module.INDEX_REGISTRY:
+        coll = MagicMock()
+        coll.index_information.return_value = existing_by_collection.get(
+            name, {"_id_": {"key": [("_id", 1)]}}
+        )
+        coll.create_indexes.side_effect = lambda models: [
+            m.document["name"] for m in models
+        ]
+        database[name] = coll
+    return database
+
+
+def test_check_indexes_reports_missing_and_undeclared():
+    """Index đã có (khác tên) không bị coi là thiếu; index lạ được báo cáo"""
+    database = _fake_database(
+        {
+            "fees": {
+                "_id_": {"key": [("_id", 1)]},
+                "my_student_idx": {"key": [("student_id", 1)]},
+                "old_idx": {"key": [("period", 1)]},
+            }
+        }
+    )
+    report = indexes_module.check_indexes(database)
+
+    assert report["fees"]["missing"] == []
+    assert report["fees"]["undeclared"] == ["old_idx"]
+    missing_accounts = [m.document["name"] for m in report["accounts"]["missing"]]
+    assert "username_unique" in missing_accounts
+
+
+def test_ensure_indexes_check_mode_raises_and_create_mode_creates():
+    database = _fake_database({})
+
+    with pytest.raises(indexes_module.IndexCheckError):
+        indexes_module.ensure_indexes(database, check_only=True)
+    database["accounts"].create_indexes.assert_not_called()
+
+    indexes_module.ensure_indexes(database)
+    database["accounts"].create_indexes.assert_called_once()
+
+
+def test_check_indexes_conflicting_definition():
+    """Cùng tên nhưng khác option (unique) -> conflicting"""
+    database = _fake_database(
+        {
+            "accounts": {
+                "_id_": {"key": [("_id", 1)]},
+                "username_unique": {"key": [("username", 1)]},
+            }
+        }
+    )
+    report = indexes_module.check_indexes(database)
+    assert report["accounts"]["conflicting"] == ["username_unique"]
+
+
+def test_check_indexes_compares_collation():
+    """Index không có collation không thay được index tìm kiếm có collation"""
+    database = _fake_database(
+        {
+            "accounts": {
+                "_id_": {"key": [("_id", 1)]},
+                "role_email": {"key": [("role", 1), ("email", 1)]},
+                "role_username_ci": {
+                    "key": [("role", 1), ("username", 1)],
+                    "collation": {"locale": "en", "strength": 2, "caseLevel": False},
+                },
+            }
+        }
+    )
+    report = indexes_module.check_indexes(database)
+    missing = [m.document["name"] for m in report["accounts"]["missing"]]
+    assert "role_email_ci" in missing
+    assert "role_username_ci" not in missing
+    assert "role_email" in report["accounts"]["undeclared"]
+
+
+#  ========================================================================================================================
+
+import threading
+import time
+from utils.startup import StartupPipeline
+from utils.task_executor import TaskExecutor, run_task
+
+
+class FakeRoot:
+    """Root giả: lưu các callback của after() để test tự gọi"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+
+def _drain(root, timeout=2.0):
+    deadline = time.time() + timeout
+    while root.scheduled and time.time() < deadline:
+        callback = root.scheduled.pop(0)
+        callback()
+        time.sleep(0.01)
+
+
+def test_startup_pipeline_runs_phases_and_skips_after_failure():
+    root = FakeRoot()
+    received = {}
+
+    def fail():
+        raise RuntimeError("offline")
+
+    pipeline = StartupPipeline(root)
+    pipeline.add_phase("ok", lambda: 42, on_done=lambda v: received.update(ok=v))
+    pipeline.add_phase("connect", fail, on_error=lambda e: received.update(err=e))
+    pipeline.add_phase(
+        "prefetch",
+        lambda: received.update(ran=True),
+        on_error=lambda e: received.update(skipped=str(e)),
+    )
+    pipeline.start()
+    _drain(root)
+
+    assert received["ok"] == 42
+    assert isinstance(received["err"], RuntimeError)
+    assert received["skipped"] == "offline"
+    assert "ran" not in received
+    assert set(pipeline.timings) == {"ok", "connect"}
+
+
+def test_task_executor_delivers_results_and_drops_cancelled_tasks():
+    root = FakeRoot()
+    busy_changes = []
+    received = {}
+    release = threading.Event()
+
+    executor = TaskExecutor(root, max_workers=2, on_busy_change=busy_changes.append)
+    executor.submit(lambda x: x * 2, 21, on_success=lambda v: received.update(ok=v))
+    executor.submit(
+        lambda: 1 / 0, on_error=lambda e: received.update(err=type(e).__name__)
+    )
+    # Task của view đã rời đi: kết quả bị bỏ qua
+    handle = executor.submit(
+        release.wait, on_success=lambda v: received.update(stale=v)
+    )
+    handle.cancel()
+    release.set()
+    _drain(root)
+    executor.shutdown()
+
+    assert received == {"ok": 42, "err": "ZeroDivisionError"}
+    assert busy_changes == [True, False]
+    assert not executor.busy
+
+
+def test_run_task_without_executor_runs_synchronously():
+    received = {}
+    handle = run_task(None, lambda: "done", on_success=lambda v: received.update(ok=v))
+    run_task(None, lambda: 1 / 0, on_error=lambda e: received.update(err=e))
+
+    assert handle is None
+    assert received["ok"] == "done"
+    assert isinstance(received["err"], ZeroDivisionError)
+
+
+from views.table_model import TableModel
+
+
+def test_table_model_window_filter_sort_and_updates():
+    model = TableModel(("ID", "Name", "Amount"))
+    model.set_rows((str(i), f"user{i}", i * 10) for i in range(100000))
+
+    # Chỉ lấy đúng phần đang hiển thị
+    assert len(model) == 100000
+    assert model.window(500, 3) == [
+        ("500", "user500", 5000),
+        ("501", "user501", 5010),
+        ("502", "user502", 5020),
+    ]
+
+    model.set_filter("Name", "USER9999")
+    assert len(model) == 11
+    assert [row[0] for row in model.window(0, 2)] == ["9999", "99990"]
+
+    # Sắp xếp theo số (không theo chuỗi); bấm lần 2 thì đảo chiều
+    assert model.sort_by("Amount") is False
+    assert model.row(0)[0] == "9999"
+    assert model.sort_by("Amount") is True
+    assert model.row(0)[0] == "99999"
+    assert model.sort_state == ("Amount", True)
+
+    assert model.update_row("99999", ("99999", "renamed", 1))
+    assert model.index_of("99999") is None  # không còn khớp filter
+    assert model.find("99999") == ("99999", "renamed", 1)
+    assert model.remove_row("9999")
+    assert not model.remove_row("missing")
+
+    model.clear_filters()
+    assert len(model) == model.total_rows == 99999
+
+
+def test_table_model_tracks_dirty_rows():
+    model = TableModel(("ID", "Name", "Major"))
+    model.set_rows([("1", "An", "CS"), ("2", "Binh", "IT")])
+    assert model.dirty_rows() == [] and not model.is_dirty
+
+    model.update_row("1", ("1", "An", "Math"))
+    model.update_row("1", ("1", "An Nguyen", "Math"))
+    # Giữ bản gốc lúc load, không phải bản sửa trước đó
+    assert model.dirty_rows() == [(("1", "An", "CS"), ("1", "An Nguyen", "Math"))]
+
+    # Sửa về giá trị ban đầu thì không còn dirty
+    model.update_row("2", ("2", "Binh", "EE"))
+    model.update_row("2", ("2", "Binh", "IT"))
+    assert [cur[0] for _orig, cur in model.dirty_rows()] == ["1"]
+
+    model.mark_clean(["1"])
+    assert not model.is_dirty
+    model.update_row("2", ("2", "Binh", "EE"))
+    model.set_rows(model.rows())
+    assert not model.is_dirty
+
+
+def test_table_model_indexes_rows_and_patches_edits_in_place():
+    model = TableModel(("ID", "Name", "Amount"))
+    model.set_rows((str(i), f"user{i}", i) for i in range(1000))
+    model.sort_by("Amount", descending=True)
+    assert model.index_of("0") == 999 and model.index_of("999") == 0
+
+    # Sửa cột không ảnh hưởng filter/sort: không sắp xếp lại cả bảng
+    refreshes = []
+    original_refresh = model._refresh
+    model._refresh = lambda: (refreshes.append(1), original_refresh())
+    model.update_row("5", ("5", "renamed", 5))
+    assert refreshes == []
+    assert model.row(model.index_of("5")) == ("5", "renamed", 5)
+
+    # Đổi giá trị cột đang sort thì vị trí được tính lại
+    model.update_row("5", ("5", "renamed", 5000))
+    assert refreshes == [1] and model.index_of("5") == 0
+
+    model.append_rows([("1000", "user1000", -1)])
+    assert model.index_of("1000") == 1000
+    assert model.find("1000") == ("1000", "user1000", -1)
+    assert model.remove_row("0") and model.find("999") == ("999", "user999", 999)
+    assert model.index_of("1000") == 999
+
+
+def test_read_model_rows_use_projection(monkeypatch):
+    import models.read_models as read_models
+    from unittest.mock import MagicMock
+
+    fake = MagicMock()
+    fake.find.return_value = [{"_id": "sid1", "username": "sv1", "major": "IT"}]
+    monkeypatch.setattr(read_models, "ACCOUNTS_COLLECTION", fake)
+
+    rows = list(read_models.iter_student_rows(batch_size=10))
+
+    query, projection = fake.find.call_args.args
+    assert query == {"role": "student"}
+    # Chỉ lấy các field hiển thị, không có password_hash
+    assert "password_hash" not in projection and projection["major"] == 1
+    assert fake.find.call_args.kwargs["batch_size"] == 10
+    assert rows[0].username == "sv1" and rows[0].email == ""
+    assert not hasattr(rows[0], "__dict__")  # __slots__
+
+
+def test_email_service_caches_config_and_reuses_smtp_connection(monkeypatch):
+    import smtplib
+    from unittest.mock import MagicMock
+    import utils.email_service as email_service
+
+    # Giả lập server SMTP debug cục bộ (không SSL, không login)
+    monkeypatch.setenv("EMAIL_SMTP_SSL", "false")
+    monkeypatch.setenv("EMAIL_SMTP_LOGIN", "false")
+    connections = []
+
+    class FakeSMTP:
+        def __init__(self, host, port, timeout=None):
+            self.sent = []
+            self.fail_next = False
+            connections.append(self)
+
+        def send_message(self, msg):
+            if self.fail_next:
+                raise smtplib.SMTPServerDisconnected("dropped")
+            self.sent.append(msg["To"])
+
+        def quit(self):
+            pass
+
+        close = quit
+
+    monkeypatch.setattr(email_service.smtplib, "SMTP", FakeSMTP)
+    config = MagicMock()
+    config.find_one.return_value = {"email": "sender@x"}
+    monkeypatch.setattr(email_service, "CONFIG_COLLECTION", config)
+    email_service.invalidate_email_config()
+    email_service.close_smtp_session()
+
+    result = email_service.send_bulk_emails(
+        [{"to": f"sv{i}@x", "subject": "s", "body": "b"} for i in range(3)]
+    )
+    assert result["sent"] == 3 and result["success"]
+    assert email_service.send_password_reset_email("sv9@x", "sv9", "pw")["success"]
+
+    # Một kết nối cho cả 4 email, config chỉ đọc một lần
+    assert len(connections) == 1
+    assert connections[0].sent == ["sv0@x", "sv1@x", "sv2@x", "sv9@x"]
+    config.find_one.assert_called_once()
+
+    # Server ngắt kết nối -> tự kết nối lại và gửi lại
+    connections[0].fail_next = True
+    assert email_service.send_password_reset_email("sv8@x", "sv8", "pw")["success"]
+    assert len(connections) == 2 and connections[1].sent == ["sv8@x"]
+
+    email_service.close_smtp_session()
+
+
+def test_email_outbox_worker_retries_with_backoff(monkeypatch):
+    import utils.email_outbox as email_outbox
+    from models import email_job
+
+    # Hàng đợi giả trong bộ nhớ thay cho collection 'email_outbox'
+    jobs = {
+        1: {
+            "_id": 1,
+            "kind": "email",
+            "to": "sv1@x",
+            "subject": "s",
+            "body": "b",
+            "status": "pending",
+            "attempts": 0,
+        },
+    }
+    updates = []
+
+    def claim_next():
+        for job in jobs.values():
+            if job["status"] == "pending" and job.get("retry_at") is None:
+                job["status"] = "sending"
+                job["attempts"] += 1
+                return dict(job)
+        return None
+
+    def mark_sent(job_id):
+        jobs[job_id]["status"] = "sent"
+        updates.append(("sent", job_id))
+
+    def mark_failed(job_id, error, retry_at=None):
+        jobs[job_id]["status"] = "pending" if retry_at else "failed"
+        jobs[job_id]["retry_at"] = retry_at
+        updates.append(("failed", job_id, error, retry_at is not None))
+
+    monkeypatch.setattr(email_job, "claim_next", claim_next)
+    monkeypatch.setattr(email_job, "mark_sent", mark_sent)
+    monkeypatch.setattr(email_job, "mark_failed", mark_failed)
+
+    outcomes = [{"success": False, "message": "down"}, {"success": True}]
+    worker = email_outbox.EmailOutboxWorker(
+        send=lambda to, subject, body: outcomes.pop(0),
+        max_attempts=2,
+        base_delay=10,
+        max_delay=25,
+    )
+
+    # Lần 1 thất bại -> hẹn gửi lại (chưa đến hạn nên run_once dừng)
+    assert worker.run_once() == 1
+    assert updates == [("failed", 1, "down", True)]
+
+    # Đến hạn -> lần 2 thành công
+    jobs[1]["retry_at"] = None
+    assert worker.run_once() == 1
+    assert updates[-1] == ("sent", 1) and jobs[1]["status"] == "sent"
+
+    # Backoff tăng gấp đôi, không vượt max_delay
+    assert [worker.backoff(n) for n in (1, 2, 3)] == [10, 20, 25]
+
+    # Hết số lần thử -> 'failed'
+    jobs[2] = {
+        "_id": 2,
+        "kind": "email",
+        "to": "sv2@x",
+        "subject": "s",
+        "body": "b",
+        "status": "pending",
+        "attempts": 1,
+    }
+    worker.send = lambda to, subject, body: {"success": False, "message": "x"}
+    assert worker.run_once() == 1
+    assert updates[-1] == ("failed", 2, "x", False)
+    assert jobs[2]["status"] == "failed"
+
+
+def test_email_outbox_renders_password_reset_at_send_time(monkeypatch):
+    import utils.email_outbox as email_outbox
+    from models import email_job
+    from unittest.mock import MagicMock
+
+    # enqueue: job password_reset chỉ lưu account_id, không có body
+    collection = MagicMock()
+    monkeypatch.setattr(email_job, "OUTBOX_COLLECTION", collection)
+    email_job.enqueue("sv1@x", "s", kind="password_reset", account_id="sid1")
+    stored = collection.insert_one.call_args.args[0]
+    assert "body" not in stored and stored["account_id"] == "sid1"
+    assert stored["created_at"].tzinfo is not None
+
+    account = MagicMock(username="sv1")
+    monkeypatch.setattr(
+        email_outbox.Account, "find_by_id", MagicMock(return_value=account)
+    )
+    monkeypatch.setattr(email_job, "mark_sent", MagicMock())
+    sent = []
+    worker = email_outbox.EmailOutboxWorker(
+        send=lambda to, subject, body: sent.append(body) or {"success": True}
+    )
+
+    worker._deliver({"_id": 1, "kind": "password_reset", "attempts": 1, **stored})
+
+    # Mật khẩu được tạo, lưu vào account và gửi đi ngay lúc gửi
+    new_password = account.update_password.call_args.args[0]
+    assert new_password in sent[0]
+    email_job.mark_sent.assert_called_once_with(1)
+
+
+def test_view_cache_reuses_refreshes_and_evicts():
+    from views.view_cache import ViewCache
+
+    # Frame giả: chỉ ghi lại pack / pack_forget / destroy
+    class FakeHost:
+        def __init__(self, widgets=0):
+            self.packed = False
+            self.destroyed = False
+            self.children = [FakeHost() for _ in range(widgets)]
+
+        def pack(self, **kwargs):
+            self.packed = True
+
+        def pack_forget(self):
+            self.packed = False
+
+        def destroy(self):
+            self.destroyed = True
+
+        def winfo_children(self):
+            return self.children
+
+    now = [0.0]
+    hosts = []
+
+    def make_host():
+        hosts.append(FakeHost(widgets=9))  # 10 widget mỗi màn hình
+        return hosts[-1]
+
+    cache = ViewCache(make_host, max_views=2, widget_budget=25, clock=lambda: now[0])
+    builds, refreshes = [], []
+
+    def show(key, **kwargs):
+        return cache.show(
+            key,
+            lambda host: builds.append(key) or key,
+            refresh=lambda view: refreshes.append(view),
+            **kwargs,
+        )
+
+    show("a", max_age=60)
+    show("b")
+    assert not hosts[0].packed and hosts[1].packed
+
+    # Quay lại 'a': không dựng lại, chưa cũ nên không tải lại dữ liệu
+    now[0] = 30
+    assert show("a", max_age=60) == "a"
+    assert builds == ["a", "b"] and refreshes == []
+
+    # Quá max_age hoặc bị invalidate -> chỉ tải lại dữ liệu
+    now[0] = 100
+    show("b")
+    show("a")
+    assert refreshes == ["b", "a"]
+    cache.invalidate("b")
+    show("b")
+    assert refreshes == ["b", "a", "b"] and builds == ["a", "b"]
+
+    # Màn hình không cache bị hủy khi rời đi
+    show("form", cache=False)
+    show("a")
+    assert hosts[2].destroyed and "form" not in cache
+
+    # Vượt max_views -> hủy màn hình dùng lâu nhất ('b')
+    show("c")
+    show("d")
+    assert hosts[1].destroyed and "b" not in cache
+    assert "a" in cache and "c" in cache and "d" in cache
+
+    # Vượt widget_budget -> hủy màn hình dùng lâu nhất dù chưa quá max_views
+    cache = ViewCache(make_host, max_views=10, widget_budget=15, clock=lambda: 0)
+    for key in ("x", "y", "z"):
+        show(key)
+    assert "x" not in cache and "y" in cache and "z" in cache
+
+
+def test_views_are_imported_lazily_by_main():
+    import ast
+    import os
+    import utils.import_report as import_report
+    from views.registry import VIEW_MODULES
+
+    src = os.path.join(os.path.dirname(__file__), "..", "..", "src")
+
+    # main.py chỉ import registry / view_cache, không import màn hình nào
+    with open(os.path.join(src, "main.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    view_imports = [
+        node.module
+        for node in tree.body
+        if isinstance(node, ast.ImportFrom) and node.module.startswith("views.")
+    ]
+    assert sorted(view_imports) == ["views.registry", "views.view_cache"]
+
+    # Mỗi tên trong registry là một class của module tương ứng
+    for name, module in VIEW_MODULES.items():
+        path = os.path.join(src, *module.split(".")) + ".py"
+        with open(path, encoding="utf-8") as f:
+            classes = {
+                node.name
+                for node in ast.parse(f.read()).body
+                if isinstance(node, ast.ClassDef)
+            }
+        assert name in classes, f"{name} not in {module}"
+
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   pymongo.errors",
+            "import time:      2000 |       2120 | pymongo",
+            "unrelated line",
+        ]
+    )
+    entries = import_report.parse_importtime(output)
+    assert entries == [("pymongo.errors", 120, 120), ("pymongo", 2000, 2120)]
+    assert import_report.total_ms(entries) == 2.12
+
+
+def test_import_report_budget_exit_status(monkeypatch):
+    import utils.import_report as import_report
+
+    calls = []
+
+    def fake_measure(module, runs=1):
+        calls.append((module, runs))
+        return [("main", 1_000_000, 1_000_000)]  # 1000 ms
+
+    monkeypatch.setattr(import_report, "measure", fake_measure)
+
+    # --budget-ms không kèm giá trị dùng STARTUP_BUDGET_MS
+    monkeypatch.setattr(import_report, "STARTUP_BUDGET_MS", 1200.0)
+    assert import_report.main(["--budget-ms", "--runs", "3"]) == 0
+    assert calls == [("main", 3)]
+    monkeypatch.setattr(import_report, "STARTUP_BUDGET_MS", 900.0)
+    assert import_report.main(["--budget-ms"]) == 1
+
+    assert import_report.main(["--budget-ms", "500"]) == 1
+    assert import_report.main([]) == 0
+
+
+def test_avatar_cache_memory_and_disk(tmp_path, monkeypatch):
+    PIL_Image = pytest.importorskip("PIL.Image")
+    import utils.avatar_cache as avatar_cache
+
+    photo = tmp_path / "photo.jpg"
+    PIL_Image.new("RGB", (2000, 1500), "red").save(photo)
+    cache_dir = tmp_path / "thumbs"
+
+    renders = []
+    real_render = avatar_cache.render_thumbnail
+
+    def counting_render(*args, **kwargs):
+        renders.append(args)
+        return real_render(*args, **kwargs)
+
+    monkeypatch.setattr(avatar_cache, "render_thumbnail", counting_render)
+
+    cache = avatar_cache.AvatarCache(cache_dir=str(cache_dir), memory_items=1)
+    thumb = cache.get(str(photo), avatar_cache.DASHBOARD_SIZE)
+    assert thumb.size == (250, 320) and thumb.mode == "RGBA"
+    # Lần 2: lấy từ bộ nhớ, không giải mã lại
+    assert cache.get(str(photo), avatar_cache.DASHBOARD_SIZE) is thumb
+    assert len(renders) == 1 and len(list(cache_dir.iterdir())) == 1
+
+    # Cache mới (lần chạy sau) đọc thumbnail từ đĩa
+    other = avatar_cache.AvatarCache(cache_dir=str(cache_dir), memory_items=1)
+    assert other.get(str(photo), avatar_cache.DASHBOARD_SIZE).size == (250, 320)
+    assert len(renders) == 1
+
+    # Kích thước khác -> thumbnail khác; LRU chỉ giữ 1 ảnh trong bộ nhớ
+    square = cache.get(str(photo), avatar_cache.PROFILE_SIZE, crop_square=True)
+    assert square.size == (274, 354) and len(renders) == 2
+    assert len(cache._memory) == 1
+
+    # File không tồn tại -> None
+    assert cache.get(str(tmp_path / "missing.jpg"), (10, 10)) is None
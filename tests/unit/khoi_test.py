@@ -13,6 +13,7 @@ from controllers.notifications_controller import NotificationsController
 from controllers.payment_controller import PaymentController
 from controllers.student_controller import StudentController
 from controllers.transaction_controller import TransactionController
+from models.read_models import AdminRow, StudentRow
 
 class DummyStudent:
     """Một class giả để làm 'type' cho isinstance() hoạt động"""
@@ -153,11 +154,14 @@ def admin_controller(mocker):
     # SỬA: Xóa patch cho ObjectId
     # mocker.patch('controllers.admin_controller.ObjectId')
     mocker.patch('models.database.db')
+    # Danh sách admin đọc qua read model (projection), không qua Account
+    mock_iter_admin_rows = mocker.patch('controllers.admin_controller.iter_admin_rows')
     
     return {
         "controller": AdminController(),
         "MockAccount": mock_account,
-        "MockAdmin": mock_admin
+        "MockAdmin": mock_admin,
+        "iter_admin_rows": mock_iter_admin_rows
     }
 
 
@@ -174,18 +178,12 @@ def fee_controller(mocker):
 @pytest.fixture
 def financial_controller(mocker):
     """Mock các dependencies cho FinancialController."""
-    # Account được import BÊN TRONG HÀM -> patch đường dẫn GỐC
-    mock_account = mocker.patch('models.account.Account')
-    
-    # SỬA: Fee và Transaction được import ở ĐẦU FILE -> patch đường dẫn LOCAL
-    mock_fee = mocker.patch('controllers.financial_controller.Fee')
-    mock_tx = mocker.patch('controllers.financial_controller.Transaction')
-    
+    # Toàn bộ dữ liệu lấy bằng một aggregation trên collection accounts
+    mock_collection = mocker.patch('controllers.financial_controller.ACCOUNTS_COLLECTION')
+
     return {
         "controller": FinancialController(),
-        "MockAccount": mock_account,
-        "MockFee": mock_fee,
-        "MockTransaction": mock_tx
+        "MockCollection": mock_collection
     }
 
 
@@ -195,9 +193,15 @@ def payment_controller(mocker):
     # Account được import BÊN TRONG HÀM -> patch đường dẫn GỐC
     mock_account = mocker.patch('models.account.Account') 
     
-    # SỬA: Fee và Transaction được import ở ĐẦU FILE -> patch đường dẫn LOCAL
+    # SỬA: Fee được import ở ĐẦU FILE -> patch đường dẫn LOCAL
     mock_fee = mocker.patch('controllers.payment_controller.Fee')
-    mock_tx = mocker.patch('controllers.payment_controller.Transaction')
+
+    # process_payment làm việc trực tiếp trên collection trong một session
+    mock_fees = mocker.patch('controllers.payment_controller.FEES_COLLECTION')
+    mock_txs = mocker.patch('controllers.payment_controller.TRANSACTIONS_COLLECTION')
+    mock_db = mocker.patch('controllers.payment_controller.db')
+    session = mock_db.start_session.return_value.__enter__.return_value
+    session.with_transaction.side_effect = lambda callback: callback(session)
     
     mocker.patch('controllers.payment_controller.datetime')
     
@@ -205,7 +209,9 @@ def payment_controller(mocker):
         "controller": PaymentController(),
         "MockAccount": mock_account,
         "MockFee": mock_fee,
-        "MockTransaction": mock_tx
+        "MockFees": mock_fees,
+        "MockTransactions": mock_txs,
+        "session": session
     }
 
 
@@ -234,11 +240,15 @@ def student_controller(mocker):
     )
     
     mock_account = mocker.patch('controllers.student_controller.Account')
+    mock_iter_student_rows = mocker.patch('controllers.student_controller.iter_student_rows')
+    mock_iter_usernames = mocker.patch('controllers.student_controller.iter_usernames')
     
     return {
         "controller": StudentController(),
         "MockStudent": mock_student_class, # Đây là class DummyStudent
-        "MockAccount": mock_account
+        "MockAccount": mock_account,
+        "iter_student_rows": mock_iter_student_rows,
+        "iter_usernames": mock_iter_usernames
     }
 
 
@@ -304,12 +314,34 @@ class TestAuthController:
         assert controller.current_account is None
         os.remove.assert_called_once_with(controller.TOKEN_FILE)
 
+    def test_recover_password_queues_email(self, auth_controller, mock_student_obj, mocker):
+        controller = auth_controller["controller"]
+        MockAccount = auth_controller["MockAccount"]
+        MockAccount.find_by_email.return_value = mock_student_obj
+        mock_student_obj.update_password = mocker.MagicMock()
+        mock_queue = mocker.patch('controllers.auth_controller.queue_email', return_value="job1")
+
+        result = controller.recover_password(mock_student_obj.email)
+
+        # Không chờ SMTP: email được đưa vào outbox, trả về ngay
+        assert result["success"] is True
+        assert result["job_id"] == "job1"
+        assert mock_queue.call_args.kwargs["kind"] == "password_reset"
+        assert mock_queue.call_args.kwargs["account_id"] == mock_student_obj._id
+        assert mock_queue.call_args.args[0] == mock_student_obj.email
+        # Mật khẩu mới chỉ được tạo khi worker gửi, không nằm trong outbox
+        mock_student_obj.update_password.assert_not_called()
+        assert "body" not in mock_queue.call_args.kwargs
+        assert len(mock_queue.call_args.args) == 2
+
 class TestAdminController:
-    def test_get_all_admins_success(self, admin_controller, mock_admin_obj):
+    def test_get_all_admins_success(self, admin_controller):
         controller = admin_controller["controller"]
-        MockAccount = admin_controller["MockAccount"]
+        iter_admin_rows = admin_controller["iter_admin_rows"]
         
-        MockAccount.find_all_admins.return_value = [mock_admin_obj]
+        iter_admin_rows.return_value = iter([
+            AdminRow(ObjectId(VALID_ADMIN_ID), "admin_user", "admin@test.com", "Mock Admin", createAt=datetime(2025, 1, 1))
+        ])
         
         result = controller.get_all_admins()
         
@@ -373,6 +405,31 @@ class TestFeeController:
         
         assert result == mock_fee_obj
 
+    def test_get_all_fees_with_usernames_success(self, fee_controller, mocker):
+        controller = fee_controller["controller"]
+        MockCollection = mocker.patch('controllers.fee_controller.FEES_COLLECTION')
+
+        MockCollection.aggregate.return_value = [
+            {
+                "_id": ObjectId(VALID_FEE_ID),
+                "description": "Mock Fee",
+                "amount": 100000,
+                "student_id": ObjectId(VALID_STUDENT_ID),
+                "student_username": "student_user",
+                "dueDate": datetime(2025, 1, 1),
+                "period": "Mock Period",
+                "status": "pending",
+            }
+        ]
+
+        result = controller.get_all_fees_with_usernames()
+
+        assert result["success"] is True
+        assert result["count"] == 1
+        assert result["fees"][0]["_id"] == VALID_FEE_ID
+        assert result["fees"][0]["student_username"] == "student_user"
+        MockCollection.aggregate.assert_called_once()
+
     def test_create_fee(self, fee_controller, mocker):
         controller = fee_controller["controller"]
         MockFee = fee_controller["MockFee"]
@@ -397,32 +454,45 @@ class TestFeeController:
         mock_fee_obj.save.assert_called_once()
 
 class TestFinancialController:
-    def test_get_financial_summary_success(self, financial_controller, mock_student_obj, mock_fee_obj, mock_tx_obj):
+    def test_get_financial_summary_success(self, financial_controller):
         controller = financial_controller["controller"]
-        MockAccount = financial_controller["MockAccount"]
-        MockFee = financial_controller["MockFee"]
-        MockTransaction = financial_controller["MockTransaction"]
+        MockCollection = financial_controller["MockCollection"]
+
+        MockCollection.aggregate.return_value = iter([{
+            "_id": ObjectId(VALID_STUDENT_ID),
+            "fullName": "Mock Student",
+            "dob": "01/01/2000",
+            "major": "IT",
+            "fees": [
+                {"name": "Mock Fee - Mock Period", "amount": 100000, "paid": 100000, "remain": 0},
+                {"name": "Tuition - 1/2025", "amount": 2500000, "paid": 500000, "remain": 2000000},
+            ],
+        }])
 
-        MockAccount.find_by_id.return_value = mock_student_obj
-        MockFee.find_by_student_id.return_value = [mock_fee_obj]
-        MockTransaction.find_by_student_id.return_value = [mock_tx_obj]
-        
         result = controller.get_financial_summary(VALID_STUDENT_ID)
-        
-        # SỬA: Lỗi "assert False is True" đã được fix bằng cách xóa mock ObjectId
+
         assert result["success"] is True
         assert result["student_info"]["name"] == "Mock Student"
-        assert len(result["financial_data"]) == 1
+        assert len(result["financial_data"]) == 2
         assert result["financial_data"][0]["remain"] == "0"
+        assert result["financial_data"][1] == {
+            "index": "2", "name": "Tuition - 1/2025", "fee": "2.500.000", "remain": "2.000.000"
+        }
+        assert result["totals"] == {"fee": "2.600.000", "remain": "2.000.000"}
+
+        # Một round trip duy nhất, lọc theo student_id và role
+        pipeline = MockCollection.aggregate.call_args[0][0]
+        MockCollection.aggregate.assert_called_once()
+        assert pipeline[0] == {"$match": {"_id": ObjectId(VALID_STUDENT_ID), "role": "student"}}
 
     def test_get_financial_summary_student_not_found(self, financial_controller):
         controller = financial_controller["controller"]
-        MockAccount = financial_controller["MockAccount"]
-        
-        MockAccount.find_by_id.return_value = None
-        
+        MockCollection = financial_controller["MockCollection"]
+
+        MockCollection.aggregate.return_value = iter([])
+
         result = controller.get_financial_summary(VALID_STUDENT_ID)
-        
+
         assert result["success"] is False
         assert result["message"] == "Student not found"
 
@@ -449,6 +519,57 @@ class TestNotificationsController:
         assert result["success"] is False
         assert result["message"] == "Failed to post an announcement"
 
+    def test_get_notifications_page_keyset(self, notifications_controller):
+        controller = notifications_controller["controller"]
+        MockAnnouncement = notifications_controller["MockAnnouncement"]
+
+        created = datetime(2025, 1, 10, 8, 30)
+        docs = [
+            {"_id": ObjectId(), "title": f"T{i}", "preview": "p", "createAt": created}
+            for i in range(3)
+        ]
+        MockAnnouncement.iter_page.return_value = iter(docs)
+
+        # Trang 2 thông báo: lấy thừa 1 để biết còn trang sau
+        result = controller.get_notifications_page(limit=2)
+
+        assert result["success"] is True
+        assert [n.title for n in result["notifications"]] == ["T0", "T1"]
+        assert result["has_more"] is True
+        # Chỉ lấy preview, không lấy content
+        assert MockAnnouncement.iter_page.call_args.args == (3,)
+        projection = MockAnnouncement.iter_page.call_args.kwargs["projection"]
+        assert "content" not in projection and "preview" in projection
+
+        # Cursor của trang trước -> (createAt, _id) của thông báo cuối
+        MockAnnouncement.iter_page.return_value = iter([docs[2]])
+        result = controller.get_notifications_page(limit=2, before=result["next_cursor"])
+
+        assert MockAnnouncement.iter_page.call_args.kwargs["before"] == (created, docs[1]["_id"])
+        assert result["count"] == 1
+        assert result["has_more"] is False and result["next_cursor"] is None
+
+    def test_get_announcement_loads_full_content(self, notifications_controller, mock_announcement_obj):
+        controller = notifications_controller["controller"]
+        MockAnnouncement = notifications_controller["MockAnnouncement"]
+        MockAnnouncement.find_by_id.return_value = mock_announcement_obj
+
+        result = controller.get_announcement(str(mock_announcement_obj._id))
+
+        assert result["success"] is True
+        assert result["announcement"].content == "Test Content"
+
+        MockAnnouncement.find_by_id.return_value = None
+        assert controller.get_announcement("missing")["success"] is False
+
+    def test_get_notifications_page_invalid_cursor(self, notifications_controller):
+        controller = notifications_controller["controller"]
+
+        result = controller.get_notifications_page(before="not-a-cursor")
+
+        assert result["success"] is False
+        assert result["notifications"] == []
+
 class TestPaymentController:
     def test_get_student_payment_data_success(self, payment_controller, mock_student_obj, mock_fee_obj, mocker):
         controller = payment_controller["controller"]
@@ -468,23 +589,109 @@ class TestPaymentController:
         assert len(result["fees"]) == 1
         assert result["fees"][0]["id"] == str(VALID_FEE_ID)
 
-    def test_process_payment_success(self, payment_controller, mock_fee_obj, mocker):
+    def test_process_payment_success(self, payment_controller, mocker):
         controller = payment_controller["controller"]
-        MockFee = payment_controller["MockFee"]
-        MockTransaction = payment_controller["MockTransaction"]
+        MockFees = payment_controller["MockFees"]
+        MockTransactions = payment_controller["MockTransactions"]
+        session = payment_controller["session"]
         
-        mock_tx_instance = mocker.MagicMock()
+        MockTransactions.find.return_value = []
+        MockFees.find.return_value = [{"_id": ObjectId(VALID_FEE_ID), "amount": 100000}]
         
-        MockFee.find_by_id.return_value = mock_fee_obj
-        MockTransaction.return_value = mock_tx_instance
+        result = controller.process_payment(VALID_STUDENT_ID, [VALID_FEE_ID, VALID_FEE_ID], idempotency_key="k1")
         
-        result = controller.process_payment(VALID_STUDENT_ID, [VALID_FEE_ID])
+        assert result["success"] is True
+        assert result["total_paid"] == 100000
+        assert result["paid_fee_ids"] == [VALID_FEE_ID]
+        assert result["replayed"] is False
+        # Trong transaction: một find $in, một update_many cùng filter, một insert_many
+        query = MockFees.find.call_args.args[0]
+        assert query["_id"] == {"$in": [ObjectId(VALID_FEE_ID)]}
+        assert query["status"] == {"$ne": "paid"}
+        MockFees.update_many.assert_called_once_with(
+            query, {"$set": {"status": "paid"}}, session=session
+        )
+        MockFees.find_one_and_update.assert_not_called()
+        docs = MockTransactions.insert_many.call_args.args[0]
+        assert [d["idempotency_key"] for d in docs] == [f"k1:{VALID_FEE_ID}"]
+        assert MockTransactions.insert_many.call_args.kwargs["session"] is session
+
+    def test_process_payment_skips_fee_paid_meanwhile(self, payment_controller):
+        controller = payment_controller["controller"]
+        MockFees = payment_controller["MockFees"]
+        MockTransactions = payment_controller["MockTransactions"]
+        other_fee_id = str(ObjectId())
+        
+        MockTransactions.find.return_value = []
+        # Phí thứ hai đã được thanh toán ở nơi khác -> find không trả về, không bị tính tiền
+        MockFees.find.return_value = [{"_id": ObjectId(VALID_FEE_ID), "amount": 100000}]
+        
+        result = controller.process_payment(VALID_STUDENT_ID, [VALID_FEE_ID, other_fee_id], idempotency_key="k1")
+        
+        assert result["success"] is True
+        assert result["paid_fee_ids"] == [VALID_FEE_ID]
+        assert result["skipped_fee_ids"] == [other_fee_id]
+        docs = MockTransactions.insert_many.call_args.args[0]
+        assert [d["fee_id"] for d in docs] == [ObjectId(VALID_FEE_ID)]
+
+    def test_process_payment_standalone_flips_each_fee(self, payment_controller, mocker):
+        controller = payment_controller["controller"]
+        MockFees = payment_controller["MockFees"]
+        MockTransactions = payment_controller["MockTransactions"]
+        other_fee_id = str(ObjectId())
+        mocker.patch.object(PaymentController, "_run_in_transaction", staticmethod(lambda callback: callback(None)))
+        
+        MockTransactions.find.return_value = []
+        # Không có transaction: đổi trạng thái từng phí có điều kiện
+        MockFees.find_one_and_update.side_effect = [
+            {"_id": ObjectId(VALID_FEE_ID), "amount": 100000, "status": "pending"},
+            None,
+        ]
+        
+        result = controller.process_payment(VALID_STUDENT_ID, [VALID_FEE_ID, other_fee_id], idempotency_key="k1")
+        
+        assert result["paid_fee_ids"] == [VALID_FEE_ID]
+        assert result["skipped_fee_ids"] == [other_fee_id]
+        assert MockFees.find_one_and_update.call_count == 2
+        MockFees.update_many.assert_not_called()
+
+    def test_process_payment_standalone_failure_restores_fees(self, payment_controller, mocker):
+        controller = payment_controller["controller"]
+        MockFees = payment_controller["MockFees"]
+        MockTransactions = payment_controller["MockTransactions"]
+        # Server standalone: callback chạy không có transaction
+        mocker.patch.object(PaymentController, "_run_in_transaction", staticmethod(lambda callback: callback(None)))
+        
+        MockTransactions.find.return_value = []
+        MockFees.find_one_and_update.return_value = {
+            "_id": ObjectId(VALID_FEE_ID), "amount": 100000, "status": "overdue"
+        }
+        MockTransactions.insert_many.side_effect = RuntimeError("network error")
+        
+        result = controller.process_payment(VALID_STUDENT_ID, [VALID_FEE_ID], idempotency_key="k1")
+        
+        assert result["success"] is False
+        # Không có transaction nào được ghi -> trả lại trạng thái cũ của phí
+        MockFees.update_one.assert_called_once_with(
+            {"_id": ObjectId(VALID_FEE_ID), "status": "paid"},
+            {"$set": {"status": "overdue"}},
+        )
+
+    def test_process_payment_retry_is_not_charged_twice(self, payment_controller):
+        controller = payment_controller["controller"]
+        MockFees = payment_controller["MockFees"]
+        MockTransactions = payment_controller["MockTransactions"]
+        
+        # Lần thử trước đã ghi transaction với cùng idempotency key
+        MockTransactions.find.return_value = [{"fee_id": ObjectId(VALID_FEE_ID), "amount": 100000}]
+        
+        result = controller.process_payment(VALID_STUDENT_ID, [VALID_FEE_ID], idempotency_key="k1")
         
-        # SỬA: Lỗi "assert False is True" đã được fix bằng cách xóa mock ObjectId
         assert result["success"] is True
+        assert result["replayed"] is True
         assert result["total_paid"] == 100000
-        mock_tx_instance.save.assert_called_once()
-        mock_fee_obj.markPaid.assert_called_once()
+        MockTransactions.insert_many.assert_not_called()
+        MockFees.find_one_and_update.assert_not_called()
 
 class TestStudentController:
     def test_update_student_profile_success(self, student_controller, mock_student_obj):
@@ -514,6 +721,31 @@ class TestStudentController:
         assert result["success"] is False
         assert "Contact number must be 10 digits" in result["message"] 
 
+    def test_bulk_update_students_sends_one_bulk_write(self, student_controller):
+        controller = student_controller["controller"]
+        MockAccount = student_controller["MockAccount"]
+        other_id = "60c72b9f9b1d8f001f8e4c6d"
+        
+        MockAccount.bulk_update_fields.return_value = {VALID_STUDENT_ID: None, other_id: "Account not found"}
+        
+        changes = {
+            VALID_STUDENT_ID: {"contact": " 0987654321 ", "password_hash": "x"},
+            other_id: {"major": "CS"},
+            "60c72b9f9b1d8f001f8e4c6e": {"dob": "2001-10-10"},  # sai định dạng -> không gửi
+        }
+        result = controller.bulk_update_students(changes)
+        
+        # Chỉ gửi các field hợp lệ đã thay đổi, trong một lần gọi
+        MockAccount.bulk_update_fields.assert_called_once_with(
+            {VALID_STUDENT_ID: {"contact": "0987654321"}, other_id: {"major": "CS"}},
+            role="student",
+        )
+        assert result["success"] is False
+        assert result["updated"] == 1 and result["failed"] == 2
+        assert [r["success"] for r in result["results"]] == [True, False, False]
+        assert result["results"][1]["message"] == "Account not found"
+        assert "DD/MM/YYYY" in result["results"][2]["message"]
+
     def test_register_student_by_admin_success(self, student_controller, mock_admin_obj, mock_student_obj, mocker): # Thêm 'mocker'
         controller = student_controller["controller"]
         MockAccount = student_controller["MockAccount"]
@@ -538,16 +770,68 @@ class TestStudentController:
         assert result["success"] is False
         assert 'already exists' in result["message"]
 
-    def test_get_all_students_success(self, student_controller, mock_student_obj):
+    def test_get_all_students_success(self, student_controller):
         controller = student_controller["controller"]
-        MockAccount = student_controller["MockAccount"]
+        iter_student_rows = student_controller["iter_student_rows"]
         
-        MockAccount.find_all_students.return_value = [mock_student_obj]
+        iter_student_rows.return_value = iter([
+            StudentRow(ObjectId(VALID_STUDENT_ID), "student_user", fullName="Mock Student", createAt=datetime(2025, 1, 1))
+        ])
         
         result = controller.get_all_students()
         
         assert result["success"] is True
         assert result["count"] == 1
+        assert result["students"][0]["id"] == VALID_STUDENT_ID
+        assert result["students"][0]["createAt"] == "2025-01-01"
+
+    def test_get_all_usernames_fetches_only_usernames(self, student_controller):
+        controller = student_controller["controller"]
+        iter_usernames = student_controller["iter_usernames"]
+        
+        iter_usernames.return_value = iter(["sv1", "sv2"])
+        
+        result = controller.get_all_usernames()
+        
+        iter_usernames.assert_called_once_with("student")
+        assert result["students_usernames"] == ["sv1", "sv2"]
+
+    def test_get_usernames_by_ids_success(self, student_controller):
+        controller = student_controller["controller"]
+        MockAccount = student_controller["MockAccount"]
+
+        MockAccount.find_many_by_ids.return_value = {
+            ObjectId(VALID_STUDENT_ID): {"_id": ObjectId(VALID_STUDENT_ID), "username": "student_user"}
+        }
+
+        result = controller.get_usernames_by_ids([VALID_STUDENT_ID])
+
+        assert result["success"] is True
+        assert result["usernames"] == {VALID_STUDENT_ID: "student_user"}
+        MockAccount.find_many_by_ids.assert_called_once_with(
+            [VALID_STUDENT_ID], projection={"username": 1}
+        )
+
+    def test_search_students_paging(self, student_controller):
+        controller = student_controller["controller"]
+        MockAccount = student_controller["MockAccount"]
+
+        MockAccount.search_by_role.return_value = [
+            {"_id": ObjectId(), "username": "sv1"},
+            {"_id": ObjectId(), "username": "sv2"},
+            {"_id": ObjectId(), "username": "sv3"},
+        ]
+
+        result = controller.search_students("sv", page=2, page_size=2)
+
+        assert result["success"] is True
+        assert result["count"] == 2
+        assert result["has_more"] is True
+        assert [row.username for row in result["rows"]] == ["sv1", "sv2"]
+        kwargs = MockAccount.search_by_role.call_args.kwargs
+        assert kwargs["limit"] == 3
+        assert kwargs["skip"] == 2
+        assert "password_hash" not in kwargs["projection"]
 
 class TestTransactionController:
     def test_get_all_transactions_success(self, transaction_controller, mocker):
@@ -565,6 +849,56 @@ class TestTransactionController:
         assert result["count"] == 1
         assert result["transactions"][0]["_id"] == VALID_TX_ID
 
+    def test_get_transactions_page_keyset(self, transaction_controller):
+        controller = transaction_controller["controller"]
+        MockCollection = transaction_controller["MockCollection"]
+
+        date = datetime(2025, 1, 2, 10, 30)
+        docs = [
+            {"_id": ObjectId(VALID_TX_ID), "amount": 100, "status": "completed", "date": date},
+            {"_id": ObjectId(VALID_FEE_ID), "amount": 50, "status": "completed", "date": date},
+        ]
+        find = MockCollection.find
+        find.return_value.sort.return_value.limit.return_value = docs
+        MockCollection.count_documents.return_value = 7
+
+        # page_size=1 -> lấy thừa 1 bản ghi để biết còn trang sau
+        result = controller.get_transactions_page(
+            page_size=1, with_total=True, method="cash", date_from="2025-01-01"
+        )
+
+        assert result["success"] is True
+        assert result["count"] == 1
+        assert result["has_more"] is True
+        assert result["total"] == 7
+        assert result["next_cursor"] == f"{date.isoformat()}|{VALID_TX_ID}"
+        query = find.call_args[0][0]
+        assert query == {"method": "cash", "date": {"$gte": datetime(2025, 1, 1)}}
+        find.return_value.sort.return_value.limit.assert_called_once_with(2)
+
+        # Trang tiếp theo: điều kiện keyset (date, _id) thay cho skip
+        find.return_value.sort.return_value.limit.return_value = docs[1:]
+        result = controller.get_transactions_page(
+            page_size=1, cursor=result["next_cursor"]
+        )
+
+        assert result["has_more"] is False
+        assert result["next_cursor"] is None
+        assert find.call_args[0][0] == {
+            "$or": [
+                {"date": {"$lt": date}},
+                {"date": date, "_id": {"$lt": ObjectId(VALID_TX_ID)}},
+            ]
+        }
+
+    def test_get_transactions_page_invalid_cursor(self, transaction_controller):
+        controller = transaction_controller["controller"]
+
+        result = controller.get_transactions_page(cursor="not-a-cursor")
+
+        assert result["success"] is False
+        assert result["transactions"] == []
+
     def test_get_transactions_by_student_success(self, transaction_controller, mock_tx_obj):
         controller = transaction_controller["controller"]
         MockTransaction = transaction_controller["MockTransaction"]